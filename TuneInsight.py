@@ -1,15 +1,305 @@
 import os
+import re
+import sys
+import csv
+import json
+import asyncio
+import itertools
+import time
+import random
+import fnmatch
+import argparse
+import pickle
+import sqlite3
 import spotipy
+import requests
+import functools
+import contextlib
+import threading
 import webbrowser
+import numpy as np
 import pandas as pd
-from tqdm import tqdm
-from IPython.display import clear_output
-from dateutil.parser import parse
 from urllib.parse import urlparse
-from spotipy.oauth2 import SpotifyOAuth
+from operator import itemgetter
+from collections import OrderedDict, Counter, deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from spotipy.oauth2 import SpotifyOAuth, SpotifyClientCredentials
+from spotipy.cache_handler import CacheFileHandler
+from spotipy.exceptions import SpotifyException
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlparse, parse_qs
 from http.server import BaseHTTPRequestHandler, HTTPServer
-from sklearn.preprocessing import StandardScaler, MinMaxScaler, MaxAbsScaler, RobustScaler, QuantileTransformer, Normalizer
+
+AUDIO_FEATURES = ['danceability', 'energy', 'key', 'loudness', 'mode',
+                  'speechiness', 'acousticness', 'instrumentalness',
+                  'liveness', 'valence', 'tempo']
+
+def _clear_output():
+    """Clear the cell output when running in a notebook, without importing IPython otherwise."""
+    if 'IPython' not in sys.modules:
+        return
+    from IPython import get_ipython
+    if get_ipython() is not None:
+        from IPython.display import clear_output
+        clear_output(wait=True)
+
+class Observer:
+    """
+    Observer receives the progress and timing events of an extraction. Every hook is a no-op, so the base class is the
+    silent default; subclass it and override the hooks you need.
+
+    Stages are ``pagination``, ``store``, ``genres``, ``audio_features``, ``dates``, ``scaling`` and ``write``. A stage
+    may run several times per call, and concurrently when playlists are fetched in parallel. Streams such as
+    ``iter_playlist_chunks`` run every stage once, advancing it per page or chunk.
+    """
+
+    def start(self, stage, total=None):
+        """Called when a stage begins.
+
+        Parameters
+        ----------
+        stage : str
+            Stage name.
+        total : int, optional
+            Number of steps of the stage, when known in advance.
+        """
+
+    def advance(self, stage, steps=1):
+        """Called when steps of a running stage are done, e.g. a page or a batch.
+
+        Parameters
+        ----------
+        stage : str
+            Stage name.
+        steps : int, default=1
+            Number of steps done.
+        """
+
+    def end(self, stage, duration, **counts):
+        """Called when a stage is done.
+
+        Parameters
+        ----------
+        stage : str
+            Stage name.
+        duration : float
+            Wall time of the stage, in seconds.
+        **counts
+            Numbers describing the work done, such as ``items``, ``hits`` and
+            ``misses`` (cache lookups) or ``bytes`` (file written).
+        """
+
+    def request(self, method, duration, bytes=0, retries=0, throttled=0, failed=False):
+        """Called after every API call, once its retries are over.
+
+        Parameters
+        ----------
+        method : str
+            Name of the API method or endpoint path.
+        duration : float
+            Wall time of the call including retries, in seconds.
+        bytes : int, default=0
+            Size of the response bodies received.
+        retries : int, default=0
+            Number of retried attempts.
+        throttled : int, default=0
+            Number of attempts answered with 429 Too Many Requests.
+        failed : bool, default=False
+            Whether the call raised after its last attempt.
+        """
+
+class TqdmObserver(Observer):
+    """
+    TqdmObserver shows a tqdm progress bar per running stage. Requires tqdm.
+
+    Attributes:
+        leave (bool): Whether finished bars stay on screen.
+    """
+
+    def __init__(self, leave=True):
+        """Initialize TqdmObserver.
+
+        Parameters
+        ----------
+        leave : bool, default=True
+            Whether finished bars stay on screen.
+
+        Returns
+        -------
+        None
+
+        Examples
+        --------
+        >>> spa = TuneInsight(user="yourname", client_id=client_id, client_secret=client_secret, observer=TqdmObserver())
+        """
+        from tqdm import tqdm
+        self.__tqdm = tqdm
+        self.leave = leave
+        self.__bars = {}
+        self.__lock = threading.Lock()
+
+    def start(self, stage, total=None):
+        with self.__lock:
+            if stage in self.__bars:
+                # Concurrent runs of a stage share one bar.
+                bar, running = self.__bars[stage]
+                if total is not None and bar.total is not None:
+                    bar.total += total
+                    bar.refresh()
+                self.__bars[stage] = (bar, running + 1)
+            else:
+                self.__bars[stage] = (self.__tqdm(desc=stage, total=total, leave=self.leave), 1)
+
+    def advance(self, stage, steps=1):
+        with self.__lock:
+            if stage in self.__bars:
+                self.__bars[stage][0].update(steps)
+
+    def end(self, stage, duration, **counts):
+        with self.__lock:
+            bar, running = self.__bars.pop(stage, (None, 0))
+            if running > 1:
+                self.__bars[stage] = (bar, running - 1)
+            elif bar is not None:
+                bar.close()
+
+class StatsObserver(Observer):
+    """
+    StatsObserver aggregates stage timings and API call counters so they can be read or scraped after a run.
+
+    Attributes:
+        stages (dict): Per stage, the number of runs, the summed ``seconds`` and the summed counts.
+        requests (dict): API call totals: calls, seconds, bytes, retries, throttled and failed.
+        methods (dict): Number of calls per API method.
+    """
+
+    def __init__(self):
+        """Initialize StatsObserver.
+
+        Returns
+        -------
+        None
+
+        Examples
+        --------
+        >>> stats = StatsObserver()
+        >>> spa = TuneInsight(user="yourname", client_id=client_id, client_secret=client_secret, observer=stats)
+        >>> spa.get_top_tracks()
+        >>> stats.snapshot()
+        """
+        self.__lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clear every counter."""
+        with self.__lock:
+            self.stages = {}
+            self.requests = {'calls': 0, 'seconds': 0.0, 'bytes': 0, 'retries': 0, 'throttled': 0, 'failed': 0}
+            self.methods = {}
+
+    def end(self, stage, duration, **counts):
+        with self.__lock:
+            totals = self.stages.setdefault(stage, {'runs': 0, 'seconds': 0.0})
+            totals['runs'] += 1
+            totals['seconds'] += duration
+            for name, value in counts.items():
+                totals[name] = totals.get(name, 0) + value
+
+    def request(self, method, duration, bytes=0, retries=0, throttled=0, failed=False):
+        with self.__lock:
+            self.requests['calls'] += 1
+            self.requests['seconds'] += duration
+            self.requests['bytes'] += bytes
+            self.requests['retries'] += retries
+            self.requests['throttled'] += throttled
+            self.requests['failed'] += int(failed)
+            self.methods[method] = self.methods.get(method, 0) + 1
+
+    def snapshot(self):
+        """Return a copy of the counters, with the cache hit rate of every stage that reports hits and misses.
+
+        Returns
+        -------
+        dict
+            ``{'stages': {...}, 'requests': {...}, 'methods': {...}}``.
+        """
+        with self.__lock:
+            stages = {stage: dict(totals) for stage, totals in self.stages.items()}
+            snapshot = {'stages': stages, 'requests': dict(self.requests), 'methods': dict(self.methods)}
+        for totals in stages.values():
+            lookups = totals.get('hits', 0) + totals.get('misses', 0)
+            if lookups:
+                totals['hit_rate'] = totals.get('hits', 0) / lookups
+        return snapshot
+
+@contextlib.contextmanager
+def _stage(observer, stage, total=None):
+    """Time a stage and report it to ``observer``. The yielded dict collects the counts passed to ``Observer.end``."""
+    observer = observer if observer is not None else _SILENT
+    counts = {}
+    observer.start(stage, total)
+    started = time.perf_counter()
+    try:
+        yield counts
+    finally:
+        observer.end(stage, time.perf_counter() - started, **counts)
+
+_SILENT = Observer()
+
+class _StreamObserver(Observer):
+    """
+    _StreamObserver reports the stages that run once per chunk of a stream as a single run each.
+
+    The first run of such a stage starts it on the wrapped observer, every run
+    advances it by one step, and ``close`` ends it with the summed durations
+    and counts of its runs. Other stages and requests are passed through.
+
+    Attributes:
+        observer (Observer): Wrapped observer.
+        stages (tuple): Stages folded into a single run.
+    """
+
+    def __init__(self, observer, stages):
+        self.observer = observer if observer is not None else _SILENT
+        self.stages = stages
+        self.__runs = {}
+        self.__lock = threading.Lock()
+
+    def start(self, stage, total=None):
+        if stage not in self.stages:
+            self.observer.start(stage, total)
+            return
+        with self.__lock:
+            if stage in self.__runs:
+                return
+            self.__runs[stage] = [0.0, {}]
+        self.observer.start(stage)
+
+    def advance(self, stage, steps=1):
+        # Steps within a folded run (e.g. artist batches) are replaced by one step per run.
+        if stage not in self.stages:
+            self.observer.advance(stage, steps)
+
+    def end(self, stage, duration, **counts):
+        if stage not in self.stages:
+            self.observer.end(stage, duration, **counts)
+            return
+        with self.__lock:
+            run = self.__runs[stage]
+            run[0] += duration
+            for name, value in counts.items():
+                run[1][name] = run[1].get(name, 0) + value
+        self.observer.advance(stage)
+
+    def request(self, method, duration, bytes=0, retries=0, throttled=0, failed=False):
+        self.observer.request(method, duration, bytes=bytes, retries=retries, throttled=throttled, failed=failed)
+
+    def close(self):
+        """End every folded stage that ran."""
+        with self.__lock:
+            runs, self.__runs = self.__runs, {}
+        for stage, (duration, counts) in runs.items():
+            self.observer.end(stage, duration, **counts)
 
 class RedirectHandler(BaseHTTPRequestHandler):
     def do_GET(self):
@@ -21,585 +311,4028 @@ class RedirectHandler(BaseHTTPRequestHandler):
 
         Examples
         --------
-        >>>
+        >>>
+        """
+
+        query_components = parse_qs(urlparse(self.path).query)
+
+        authorization_code = query_components.get('code', [None])[0]
+
+        self.send_response(200)
+        self.send_header('Content-type', 'text/plain')
+        self.end_headers()
+
+        self.wfile.write(b'Authorization successful. You can close this window now.')
+
+        self.server.authorization_code = authorization_code
+
+def _remaining_offsets(page, limit):
+    """Return the offsets of the pages after ``page``, the first one, from the total it reports.
+
+    Every pager fetches these, then follows ``next`` from the offset after
+    the last of them, so items added after the total was reported are not lost.
+    """
+    if page['next'] is None or not page.get('total'):
+        return range(0)
+    return range(limit, page['total'], limit)
+
+def paginate(fetch, limit, max_workers=4, project=None, observer=None):
+    """Retrieve every item of a paged endpoint.
+
+    The first page reports the total number of items. The remaining offsets
+    are then fetched concurrently and the pages are put back in order.
+    With ``project``, each page is projected as soon as it arrives so the raw
+    JSON of a page is released before the next ones are collected.
+
+    Parameters
+    ----------
+    fetch : callable
+        Called as ``fetch(offset=offset, limit=limit)``, returns a paging object.
+    limit : int
+        Number of items per page.
+    max_workers : int, default=4
+        Maximum number of pages fetched at the same time.
+    project : callable, optional
+        Applied to every item of a page, e.g. ``TrackRecord.from_item``.
+    observer : Observer, optional
+        Receives a ``pagination`` stage with a step per page.
+
+    Returns
+    -------
+    list
+        Items of every page, projected if ``project`` is given, in order.
+
+    Examples
+    --------
+    >>> paginate(functools.partial(spa.sp.playlist_tracks, playlist_id), limit=100, project=TrackRecord.from_item)
+    """
+    observer = observer if observer is not None else _SILENT
+
+    def get(offset):
+        page = fetch(offset=offset, limit=limit)
+        if project is not None:
+            page['items'] = [project(item) for item in page['items']]
+        observer.advance('pagination')
+        return page
+
+    with _stage(observer, 'pagination') as counts:
+        page = get(0)
+        items = list(page['items'])
+        offsets = _remaining_offsets(page, limit)
+        offset = limit * (len(offsets) + 1)
+
+        if offsets:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(offsets)))) as executor:
+                for page in executor.map(get, offsets):
+                    items.extend(page['items'])
+
+        # Follow any items added after the total was reported.
+        while page['next'] is not None:
+            page = get(offset)
+            items.extend(page['items'])
+            offset += limit
+
+        counts['items'] = len(items)
+    return items
+
+def iter_pages(fetch, limit, project=None, observer=None, max_workers=1):
+    """Yield the pages of a paged endpoint in order, following ``next``.
+
+    Unlike ``paginate``, only a few pages are held at a time, so callers can
+    process and release each page while the next ones are requested. With
+    ``max_workers`` above one, up to that many of the following pages are
+    fetched ahead concurrently once the first page has reported the total.
+
+    Parameters
+    ----------
+    fetch : callable
+        Called as ``fetch(offset=offset, limit=limit)``, returns a paging object.
+    limit : int
+        Number of items per page.
+    project : callable, optional
+        Applied to every item of a page, e.g. ``TrackRecord.from_item``.
+    observer : Observer, optional
+        Receives one ``pagination`` stage spanning the iteration, with a step
+        per page.
+    max_workers : int, default=1
+        Maximum number of pages requested ahead. With 1, a page is only
+        requested once the previous one has been consumed.
+
+    Yields
+    ------
+    list
+        Items of a page, projected if ``project`` is given.
+    """
+    observer = observer if observer is not None else _SILENT
+
+    def get(offset):
+        page = fetch(offset=offset, limit=limit)
+        return page, page['items'] if project is None else [project(item) for item in page['items']]
+
+    def pages():
+        page, items = get(0)
+        yield items
+        offsets = _remaining_offsets(page, limit) if max_workers > 1 else range(0)
+        offset = limit * (len(offsets) + 1)
+
+        if offsets:
+            offsets = iter(offsets)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                pending = deque(executor.submit(get, offset) for offset in itertools.islice(offsets, max_workers))
+                while pending:
+                    page, items = pending.popleft().result()
+                    offset = next(offsets, None)
+                    if offset is not None:
+                        pending.append(executor.submit(get, offset))
+                    yield items
+
+        # Follow ``next`` one page at a time, including items added after the total was reported.
+        while page['next'] is not None:
+            page, items = get(offset)
+            yield items
+            offset += limit
+
+    with _stage(observer, 'pagination') as counts:
+        counts['items'] = 0
+        for items in pages():
+            observer.advance('pagination')
+            counts['items'] += len(items)
+            yield items
+
+def write_chunks(chunks, path, format=None, observer=None):
+    """Append DataFrame chunks to a CSV or Parquet file as they arrive.
+
+    Only one chunk is in memory at a time. Parquet output requires pyarrow.
+
+    Parameters
+    ----------
+    chunks : iterable of DataFrame
+        Chunks with the same columns, for example from ``iter_playlist_chunks``.
+    path : str
+        Destination file. It is overwritten.
+    format : {'csv', 'parquet'}, optional
+        Output format. Inferred from the extension of ``path`` by default,
+        CSV when it has none.
+    observer : Observer, optional
+        Receives one ``write`` stage with a step per chunk.
+
+    Returns
+    -------
+    int
+        Number of rows written.
+
+    Examples
+    --------
+    >>> write_chunks(spa.iter_playlist_chunks('your_playlist_id'), "playlist.parquet")
+    """
+    format = format or os.path.splitext(path)[1].lstrip('.') or 'csv'
+    if format not in ('csv', 'parquet'):
+        raise ValueError(f"Unsupported format '{format}'. Use 'csv' or 'parquet'.")
+    rows = 0
+    # Only the time spent writing is reported, not the time the chunks take to arrive.
+    observer = _StreamObserver(observer, ('write',))
+
+    if format == 'csv':
+        header = True
+        try:
+            with open(path, 'w', newline='', encoding='utf-8') as file:
+                for chunk in chunks:
+                    with _stage(observer, 'write') as counts:
+                        chunk.to_csv(file, header=header, index=False)
+                        counts['rows'] = len(chunk)
+                    header = False
+                    rows += len(chunk)
+        finally:
+            observer.close()
+        return rows
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in chunks:
+            with _stage(observer, 'write') as counts:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    # Columns that are empty in the first chunk (e.g. no genre yet) default to strings.
+                    schema = pa.schema([field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                                        for field in table.schema])
+                    writer = pq.ParquetWriter(path, schema)
+                writer.write_table(table.cast(writer.schema))
+                counts['rows'] = len(chunk)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+        observer.close()
+    return rows
+
+class GenreResolver:
+    """
+    GenreResolver maps artist IDs to genres through the multi-artist endpoint.
+
+    Artist IDs are deduplicated and fetched in batches, and the results are kept
+    in a least-recently-used cache that can be shared between methods and instances.
+
+    Attributes:
+        maxsize (int): Maximum number of artists kept in the cache.
+        batch_size (int): Maximum number of artist IDs sent per request.
+    """
+
+    batch_size = 50
+
+    def __init__(self, maxsize=50000):
+        """Initialize GenreResolver.
+
+        Parameters
+        ----------
+        maxsize : int, default=50000
+            Maximum number of artists kept in the cache. The least recently
+            used artists are evicted first.
+
+        Returns
+        -------
+        None
+
+        Examples
+        --------
+        >>> resolver = GenreResolver(maxsize=10000)
+        """
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._cache)
+
+    def __contains__(self, artist_id):
+        return artist_id in self._cache
+
+    def missing(self, artist_ids):
+        """Return the unique artist IDs that are not cached yet, in first-seen order.
+
+        Parameters
+        ----------
+        artist_ids : iterable of str
+            Artist IDs to check. ``None`` entries (local files) are skipped.
+
+        Returns
+        -------
+        list
+            Artist IDs that still have to be fetched.
+        """
+        with self._lock:
+            return [artist_id for artist_id in dict.fromkeys(artist_ids)
+                    if artist_id and artist_id not in self._cache]
+
+    def cached(self, artist_ids):
+        """Return the cached genres of artists and mark them as recently used.
+
+        Parameters
+        ----------
+        artist_ids : iterable of str
+            Artist IDs to look up. ``None`` entries (local files) are skipped.
+
+        Returns
+        -------
+        dict
+            Genres of the cached artists, keyed by artist ID.
+        """
+        with self._lock:
+            known = {}
+            for artist_id in artist_ids:
+                if artist_id and artist_id in self._cache:
+                    self._cache.move_to_end(artist_id)
+                    known[artist_id] = self._cache[artist_id]
+            return known
+
+    def lookup(self, tracks_artist_ids):
+        """Split the artists of tracks into cached ones and ones to fetch.
+
+        Parameters
+        ----------
+        tracks_artist_ids : iterable of list of str
+            Artist IDs of every track.
+
+        Returns
+        -------
+        tuple
+            The genres of the cached artists keyed by artist ID, to complete
+            with ``update`` and read with ``track_genre``, and the batches of
+            the other artist IDs to request from the multi-artist endpoint.
+        """
+        artist_ids = list(dict.fromkeys(artist_id for artist_ids in tracks_artist_ids for artist_id in artist_ids if artist_id))
+        known = self.cached(artist_ids)
+        return known, _batches([artist_id for artist_id in artist_ids if artist_id not in known], self.batch_size)
+
+    def update(self, artists):
+        """Add artist objects returned by the API to the cache.
+
+        Only the cache is bounded by ``maxsize``: the returned genres hold
+        every given artist, even those evicted right away.
+
+        Parameters
+        ----------
+        artists : list of dict
+            Artist objects, as returned in the ``artists`` field of the
+            multi-artist endpoint. ``None`` entries are ignored.
+
+        Returns
+        -------
+        dict
+            Genres of the given artists, keyed by artist ID.
+        """
+        genres = {artist['id']: artist.get('genres') or [] for artist in artists if artist}
+        with self._lock:
+            for artist_id, artist_genres in genres.items():
+                self._cache[artist_id] = artist_genres
+                self._cache.move_to_end(artist_id)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return genres
+
+    def genres(self, artist_id):
+        """Return the cached genres of an artist.
+
+        Parameters
+        ----------
+        artist_id : str
+            Artist ID.
+
+        Returns
+        -------
+        list
+            Genres of the artist, empty if unknown.
+        """
+        with self._lock:
+            if artist_id not in self._cache:
+                return []
+            self._cache.move_to_end(artist_id)
+            return self._cache[artist_id]
+
+    def track_genre(self, artist_ids, known=None):
+        """Return the genre of a track from the IDs of its artists.
+
+        The first genre of the first artist that has any genres is used.
+
+        Parameters
+        ----------
+        artist_ids : list of str
+            IDs of the track's artists, in credit order.
+        known : dict, optional
+            Genres keyed by artist ID to read instead of the cache, as
+            collected by ``resolve`` for the tracks of one call.
+
+        Returns
+        -------
+        str or None
+            Genre of the track, None if none of the artists has a genre.
+        """
+        lookup = self.genres if known is None else known.get
+        for artist_id in artist_ids:
+            genres = lookup(artist_id)
+            if genres:
+                return genres[0]
+        return None
+
+    def resolve(self, sp, tracks_artist_ids, observer=None):
+        """Fetch the uncached artists and return one genre per track.
+
+        The genres are read from the cache hits and the fetched artists of
+        this call, so a call with more artists than ``maxsize`` gets all of
+        them even though the cache only keeps the most recent ones.
+
+        Parameters
+        ----------
+        sp : spotipy.Spotify
+            Authenticated Spotify client.
+        tracks_artist_ids : list of list of str
+            Artist IDs of every track.
+        observer : Observer, optional
+            Receives a ``genres`` stage with a step per batch and the cache
+            ``hits`` and ``misses``.
+
+        Returns
+        -------
+        list
+            Genre of every track, None where no genre is known.
+
+        Examples
+        --------
+        >>> resolver.resolve(spa.sp, [['0OdUWJ0sBjDrqHygGUXeCF'], ['1dfeR4HaWDbWqFHLkxsg1d']])
+        """
+        observer = observer if observer is not None else _SILENT
+        known, batches = self.lookup(tracks_artist_ids)
+
+        with _stage(observer, 'genres', total=len(batches)) as counts:
+            counts.update(hits=len(known), misses=sum(map(len, batches)))
+            for batch in batches:
+                known.update(self.update(sp.artists(batch)['artists']))
+                observer.advance('genres')
+
+        return [self.track_genre(artist_ids, known) for artist_ids in tracks_artist_ids]
+
+class TrackStore:
+    """
+    TrackStore keeps extracted track metadata, genres and audio features in a SQLite database keyed by track ID.
+
+    Tracks older than the time-to-live are reported as missing, so callers only
+    go to the API for tracks that were never seen or whose entry is stale.
+
+    Attributes:
+        path (str): Location of the SQLite database.
+        ttl (float): Seconds after which a stored track is stale. None keeps tracks forever.
+        columns (list): Stored columns, besides the track ID.
+    """
+
+    columns = ['songs', 'genre', 'artist', 'album', 'release_date', 'is_local',
+               'explicit', 'popularity', 'duration_min'] + AUDIO_FEATURES
+    chunk_size = 500
+
+    def __init__(self, path, ttl=30*24*60*60):
+        """Initialize TrackStore.
+
+        Opens the database at ``path``, creating it if needed.
+
+        Parameters
+        ----------
+        path : str
+            Location of the SQLite database.
+        ttl : float, default=30 days
+            Seconds after which a stored track is stale. None keeps tracks forever.
+
+        Returns
+        -------
+        None
+
+        Examples
+        --------
+        >>> store = TrackStore(os.path.join(spa.spreadsheets_dir, "tracks.sqlite"), ttl=7*24*60*60)
+        """
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # WAL and a generous busy timeout let the worker processes of run_batch share one store.
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=60)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS tracks (id TEXT PRIMARY KEY, {', '.join(self.columns)}, fetched_at REAL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS playlists "
+                "(id TEXT PRIMARY KEY, name TEXT, snapshot_id TEXT, track_ids TEXT, synced_at REAL)"
+            )
+
+    def get(self, track_ids):
+        """Return the fresh stored entries of the given tracks.
+
+        Parameters
+        ----------
+        track_ids : iterable of str
+            Track IDs to look up. ``None`` entries (local files) are skipped.
+
+        Returns
+        -------
+        dict
+            Mapping of track ID to a dict of the stored columns. Tracks that are
+            missing or stale are left out.
+        """
+        track_ids = [track_id for track_id in dict.fromkeys(track_ids) if track_id]
+        oldest = time.time() - self.ttl if self.ttl is not None else float('-inf')
+        rows = {}
+
+        with self._lock:
+            for i in range(0, len(track_ids), self.chunk_size):
+                chunk = track_ids[i:i + self.chunk_size]
+                cursor = self._conn.execute(
+                    f"SELECT id, {', '.join(self.columns)} FROM tracks "
+                    f"WHERE fetched_at >= ? AND id IN ({', '.join('?' * len(chunk))})",
+                    [oldest, *chunk]
+                )
+                for row in cursor:
+                    record = dict(zip(self.columns, row[1:]))
+                    record['is_local'] = bool(record['is_local'])
+                    record['explicit'] = bool(record['explicit'])
+                    for feature in AUDIO_FEATURES:
+                        if record[feature] is None:
+                            record[feature] = float('nan')
+                    rows[row[0]] = record
+        return rows
+
+    def put(self, records):
+        """Insert or refresh stored tracks.
+
+        Parameters
+        ----------
+        records : DataFrame
+            Stored columns of the tracks, indexed by track ID.
+
+        Returns
+        -------
+        None
+        """
+        now = time.time()
+        values = records[self.columns].astype(object)
+        values = values.where(records[self.columns].notna(), None)
+        rows = [[track_id, *row, now] for track_id, *row in values.itertuples(name=None)]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO tracks VALUES ({', '.join('?' * (len(self.columns) + 2))})", rows
+            )
+
+    def get_playlist(self, playlist_id):
+        """Return the last recorded state of a playlist.
+
+        Parameters
+        ----------
+        playlist_id : str
+            Playlist ID.
+
+        Returns
+        -------
+        dict or None
+            Dict with the ``name``, ``snapshot_id`` and ordered ``track_ids`` of
+            the playlist, None if it was never recorded.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT name, snapshot_id, track_ids FROM playlists WHERE id = ?", [playlist_id]
+            ).fetchone()
+        if row is None:
+            return None
+        return {'name': row[0], 'snapshot_id': row[1], 'track_ids': json.loads(row[2])}
+
+    def put_playlist(self, playlist_id, name, snapshot_id, track_ids):
+        """Record the snapshot and the track membership of a playlist.
+
+        Parameters
+        ----------
+        playlist_id : str
+            Playlist ID.
+        name : str
+            Playlist name.
+        snapshot_id : str
+            Snapshot ID reported by the API for this version of the playlist.
+        track_ids : list of str
+            Track IDs of the playlist, in playlist order. Local files carry no
+            ID and are not recorded.
+
+        Returns
+        -------
+        None
+        """
+        track_ids = [track_id for track_id in track_ids if track_id]
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO playlists VALUES (?, ?, ?, ?, ?)",
+                [playlist_id, name, snapshot_id, json.dumps(track_ids), time.time()]
+            )
+
+    def playlist_df(self, playlist_id, playlist_info):
+        """Rebuild a playlist from the store when its snapshot has not changed.
+
+        Parameters
+        ----------
+        playlist_id : str
+            Playlist ID.
+        playlist_info : dict
+            Playlist object holding at least the ``name`` and ``snapshot_id``.
+
+        Returns
+        -------
+        DataFrame or None
+            DataFrame of the playlist's tracks, None if the playlist changed
+            since it was recorded or some of its tracks are missing or stale.
+        """
+        recorded = self.get_playlist(playlist_id)
+        if recorded is None or recorded['snapshot_id'] != playlist_info.get('snapshot_id'):
+            return None
+
+        stored = self.get(recorded['track_ids'])
+        if any(track_id not in stored for track_id in recorded['track_ids']):
+            return None
+
+        df = pd.DataFrame.from_records([stored[track_id] for track_id in recorded['track_ids']], columns=self.columns)
+        df.insert(0, 'id', recorded['track_ids'])
+        df.insert(2, 'playlist', playlist_info['name'])
+        return df
+
+    def audio_features(self):
+        """Return the audio features of every stored track, stale ones included.
+
+        Returns
+        -------
+        DataFrame
+            ``id`` and ``AUDIO_FEATURES`` columns, one row per stored track.
+        """
+        with self._lock:
+            return pd.read_sql_query(f"SELECT id, {', '.join(AUDIO_FEATURES)} FROM tracks", self._conn,
+                                     dtype={feature: 'float32' for feature in AUDIO_FEATURES})
+
+    def playlists(self):
+        """Return the recorded track membership of every playlist.
+
+        Returns
+        -------
+        dict
+            Ordered track IDs keyed by playlist ID.
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT id, track_ids FROM playlists").fetchall()
+        return {playlist_id: json.loads(track_ids) for playlist_id, track_ids in rows}
+
+    def close(self):
+        """Close the database connection."""
+        self._conn.close()
+
+class RateLimiter:
+    """
+    RateLimiter is a token bucket that spaces out API requests.
+
+    A single limiter is shared by every thread of a TuneInsight instance, so
+    concurrent fetches draw from one request budget. Without a rate, requests
+    are only held back while the limiter is paused after a throttled response.
+
+    Attributes:
+        rate (float): Requests allowed per second, None for no limit.
+        burst (int): Maximum number of requests sent back to back after an idle period.
+    """
+
+    def __init__(self, rate=None, burst=None):
+        """Initialize RateLimiter.
+
+        Parameters
+        ----------
+        rate : float, optional
+            Requests allowed per second. No limit by default: the adaptive
+            concurrency of the transport and the ``Retry-After`` pauses
+            already follow the API's own limit.
+        burst : int, optional
+            Maximum number of requests sent back to back after an idle period.
+            Defaults to ``rate``.
+
+        Returns
+        -------
+        None
+
+        Examples
+        --------
+        >>> limiter = RateLimiter(rate=5)
+        """
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate or 1))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0
+        self._lock = threading.Lock()
+
+    def pause(self, seconds):
+        """Hold back every request for the given number of seconds.
+
+        The bucket is emptied, so requests resume at the base rate instead of
+        bursting once the pause is over.
+
+        Parameters
+        ----------
+        seconds : float
+            Time to wait, usually the ``Retry-After`` of a throttled response.
+
+        Returns
+        -------
+        None
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._updated = max(self._updated, self._paused_until)
+            self._tokens = 0
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self.rate is None:
+                    return
+                else:
+                    self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+class AdaptiveConcurrency:
+    """
+    AdaptiveConcurrency caps the number of requests in flight and adapts the cap to throttling.
+
+    The cap grows by roughly one request per round of successful requests
+    (additive increase) and is halved when the API throttles (multiplicative
+    decrease), at most once per ``cooldown`` seconds so that a burst of
+    throttled responses from the same round only counts once. Requests that
+    fail for another reason leave the cap unchanged.
+
+    Attributes:
+        limit (float): Current cap on requests in flight.
+        minimum (int): Lowest cap.
+        maximum (int): Highest cap.
+        cooldown (float): Minimum number of seconds between two decreases.
+    """
+
+    def __init__(self, initial=4, minimum=1, maximum=32, cooldown=1.0):
+        """Initialize AdaptiveConcurrency.
+
+        Parameters
+        ----------
+        initial : int, default=4
+            Starting cap on requests in flight.
+        minimum : int, default=1
+            Lowest cap.
+        maximum : int, default=32
+            Highest cap.
+        cooldown : float, default=1.0
+            Minimum number of seconds between two decreases.
+
+        Returns
+        -------
+        None
+
+        Examples
+        --------
+        >>> concurrency = AdaptiveConcurrency(initial=4, maximum=16)
+        """
+        self.limit = float(min(max(initial, minimum), maximum))
+        self.minimum = minimum
+        self.maximum = maximum
+        self.cooldown = cooldown
+        self._in_flight = 0
+        self._last_decrease = 0
+        self._condition = threading.Condition()
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def acquire(self):
+        """Block until the number of requests in flight is below the cap."""
+        with self._condition:
+            while self._in_flight >= int(self.limit):
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self, throttled=False, failed=False):
+        """Mark a request as finished and adapt the cap.
+
+        Parameters
+        ----------
+        throttled : bool, default=False
+            Whether the API throttled the request.
+        failed : bool, default=False
+            Whether the request failed otherwise, e.g. with a server error or
+            a dropped connection. The cap is left as is.
+
+        Returns
+        -------
+        None
+        """
+        with self._condition:
+            self._in_flight -= 1
+            now = time.monotonic()
+            if throttled:
+                if now - self._last_decrease >= self.cooldown:
+                    self.limit = max(self.minimum, self.limit / 2)
+                    self._last_decrease = now
+            elif not failed:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+def _retry_delay(attempt, retry_after, backoff, max_backoff):
+    """Return the time to wait before retrying a request.
+
+    The ``Retry-After`` period is honoured when given, plus a little jitter so
+    that waiting requests do not all resume at once. Otherwise the delay is
+    drawn uniformly below an exponentially growing bound.
+
+    Parameters
+    ----------
+    attempt : int
+        Number of attempts already made, starting at 0.
+    retry_after : str or None
+        ``Retry-After`` header of the response, in seconds.
+    backoff : float
+        Base delay of the exponential backoff, in seconds.
+    max_backoff : float
+        Longest delay without a ``Retry-After``, in seconds.
+
+    Returns
+    -------
+    float
+        Delay in seconds.
+    """
+    if retry_after is not None:
+        try:
+            return float(retry_after) + random.uniform(0, backoff)
+        except ValueError:
+            pass
+    return random.uniform(0, min(max_backoff, backoff * 2 ** attempt))
+
+def _session_retries(session):
+    """Return whether a requests session retries on its own, like the default session of spotipy."""
+    return any(adapter.max_retries.total or adapter.max_retries.status_forcelist
+               for adapter in session.adapters.values() if isinstance(adapter, HTTPAdapter))
+
+class SpotifyTransport:
+    """
+    SpotifyTransport wraps a spotipy client so that every API call is paced, capped and retried.
+
+    Each call draws from a shared rate limiter and an adaptive cap on requests
+    in flight. Throttled (429) calls wait for the ``Retry-After`` period, which
+    also pauses every other call, and server errors and dropped connections are
+    retried with jittered exponential backoff. Only the failed call is retried,
+    so a throttled batch does not restart the playlist it belongs to.
+
+    Any attribute of the client is reachable through the transport, so it can be
+    used wherever a ``spotipy.Spotify`` object is expected. A client on
+    spotipy's default session, which retries 429 and 5xx responses inside
+    urllib3, is moved to a ``session()`` without retries so that every
+    attempt goes through the transport.
+
+    Attributes:
+        client (spotipy.Spotify): Wrapped Spotify client.
+        rate_limiter (RateLimiter): Request budget shared by all calls.
+        concurrency (AdaptiveConcurrency): Cap on requests in flight.
+        max_retries (int): Maximum number of retries of a single call.
+        backoff (float): Base delay of the exponential backoff, in seconds.
+        max_backoff (float): Longest delay between two attempts, in seconds.
+    """
+
+    retry_statuses = (429, 500, 502, 503, 504)
+
+    def __init__(self, client, rate_limiter=None, concurrency=None, max_retries=5, backoff=0.5, max_backoff=60, observer=None):
+        """Initialize SpotifyTransport.
+
+        Parameters
+        ----------
+        client : spotipy.Spotify
+            Authenticated Spotify client.
+        rate_limiter : RateLimiter, optional
+            Request budget to draw from. A new one is created by default.
+        concurrency : AdaptiveConcurrency, optional
+            Cap on requests in flight. A new one is created by default.
+        max_retries : int, default=5
+            Maximum number of retries of a single call.
+        backoff : float, default=0.5
+            Base delay of the exponential backoff, in seconds.
+        max_backoff : float, default=60
+            Longest delay between two attempts, in seconds.
+        observer : Observer, optional
+            Receives a ``request`` event per call. Silent by default.
+
+        Returns
+        -------
+        None
+
+        Examples
+        --------
+        >>> sp = SpotifyTransport(spotipy.Spotify(auth=token, requests_session=SpotifyTransport.session()))
+        """
+        self.client = client
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter()
+        self.concurrency = concurrency if concurrency is not None else AdaptiveConcurrency()
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.observer = observer if observer is not None else _SILENT
+
+        # Response sizes are counted per thread, since calls of several threads overlap.
+        self.__received = threading.local()
+        session = getattr(client, '_session', None)
+        if isinstance(session, requests.Session) and _session_retries(session):
+            session.close()
+            session = client._session = self.session(self.concurrency.maximum)
+        if isinstance(session, requests.Session):
+            session.hooks['response'].append(self.__count_bytes)
+
+    def __count_bytes(self, response, *args, **kwargs):
+        self.__received.bytes = getattr(self.__received, 'bytes', 0) + len(response.content)
+
+    @staticmethod
+    def session(pool_size=32):
+        """Create a requests session with a connection pool and no automatic retries.
+
+        Retries are left to the transport, which paces them against the
+        shared budget instead of sleeping inside the HTTP adapter.
+
+        Parameters
+        ----------
+        pool_size : int, default=32
+            Maximum number of pooled keep-alive connections.
+
+        Returns
+        -------
+        requests.Session
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def __getattr__(self, name):
+        attr = getattr(self.client, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def call(*args, **kwargs):
+            return self.call(attr, *args, **kwargs)
+
+        return call
+
+    def call(self, method, *args, **kwargs):
+        """Call a client method, retrying throttled and failed requests.
+
+        Parameters
+        ----------
+        method : callable
+            Bound method of the client.
+        *args, **kwargs
+            Arguments of the method.
+
+        Returns
+        -------
+        object
+            Return value of the method.
+        """
+        started = time.perf_counter()
+        self.__received.bytes = 0
+        throttled_attempts = 0
+        failed = True
+        try:
+            for attempt in range(self.max_retries + 1):
+                self.rate_limiter.acquire()
+                self.concurrency.acquire()
+                throttled = False
+                try:
+                    result = method(*args, **kwargs)
+                    failed = False
+                    return result
+                except SpotifyException as e:
+                    if e.http_status not in self.retry_statuses or attempt == self.max_retries:
+                        raise
+                    throttled = e.http_status == 429
+                    throttled_attempts += throttled
+                    delay = _retry_delay(attempt, e.headers.get('Retry-After') if e.headers else None, self.backoff, self.max_backoff)
+                    if throttled:
+                        self.rate_limiter.pause(delay)
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                    if attempt == self.max_retries:
+                        raise
+                    delay = _retry_delay(attempt, None, self.backoff, self.max_backoff)
+                finally:
+                    # Only successful calls raise the cap; failed attempts say nothing about spare capacity.
+                    self.concurrency.release(throttled=throttled, failed=failed)
+                time.sleep(delay)
+        finally:
+            self.observer.request(getattr(method, '__name__', str(method)), time.perf_counter() - started,
+                                  bytes=self.__received.bytes, retries=attempt, throttled=throttled_attempts, failed=failed)
+
+class TrackRecord:
+    """
+    Compact projection of a track object, keeping only the fields that are read.
+
+    Track objects from the API carry available markets, images, external URLs
+    and a full album object. Pages are projected onto TrackRecords as they
+    arrive so the raw JSON can be released right away.
+
+    Attributes:
+        id (str): Track ID, None for local files.
+        name (str): Track name.
+        artist (str): Name of the first artist.
+        artist_ids (tuple): IDs of every artist of the track.
+        album (str): Album name.
+        release_date (str): Album release date as returned by the API.
+        is_local (bool): Whether the track is a local file.
+        explicit (bool): Whether the track is explicit.
+        popularity (int): Popularity between 0 and 100.
+        duration_ms (int): Duration in milliseconds.
+    """
+    __slots__ = ('id', 'name', 'artist', 'artist_ids', 'album', 'release_date', 'is_local', 'explicit', 'popularity', 'duration_ms')
+
+    def __init__(self, id, name, artist, artist_ids, album, release_date, is_local, explicit, popularity, duration_ms):
+        self.id = id
+        self.name = name
+        self.artist = artist
+        self.artist_ids = artist_ids
+        self.album = album
+        self.release_date = release_date
+        self.is_local = is_local
+        self.explicit = explicit
+        self.popularity = popularity
+        self.duration_ms = duration_ms
+
+    def __repr__(self):
+        return f"TrackRecord(id={self.id!r}, name={self.name!r}, artist={self.artist!r})"
+
+    @classmethod
+    def from_track(cls, track):
+        """Project a track object.
+
+        Parameters
+        ----------
+        track : dict
+            Track object as returned by the API.
+
+        Returns
+        -------
+        TrackRecord
+
+        Examples
+        --------
+        >>> TrackRecord.from_track(spa.sp.track(track_id))
+        """
+        artists = track['artists']
+        album = track['album']
+        return cls(track['id'], track['name'], artists[0]['name'], tuple(artist['id'] for artist in artists),
+                   album['name'], album['release_date'], track['is_local'], track['explicit'],
+                   track['popularity'], track['duration_ms'])
+
+    @classmethod
+    def from_item(cls, item):
+        """Project a playlist item, i.e. a track object wrapped with its ``added_at`` metadata."""
+        return cls.from_track(item['track'])
+
+TRACK_FIELDS = ['id', 'songs', 'artist', 'album', 'release_date', 'is_local', 'explicit', 'popularity', 'duration_min']
+
+def tracks_to_frame(tracks):
+    """Project track records onto the metadata columns in a single pass.
+
+    Parameters
+    ----------
+    tracks : list of TrackRecord
+        Tracks projected with ``TrackRecord.from_track``.
+
+    Returns
+    -------
+    DataFrame
+        One row per track with the ``TRACK_FIELDS`` columns, in the order of ``tracks``.
+
+    Examples
+    --------
+    >>> tracks_to_frame(paginate(spa.sp.current_user_top_tracks, limit=50, project=TrackRecord.from_track))
+    """
+    df = pd.DataFrame.from_records(
+        [(track.id, track.name, track.artist, track.album, track.release_date, track.is_local,
+          track.explicit, track.popularity, track.duration_ms/60000) for track in tracks],
+        columns=TRACK_FIELDS
+    )
+    if df.empty:
+        df = df.astype({'is_local': bool, 'explicit': bool, 'duration_min': 'float64'})
+    return df
+
+_feature_values = itemgetter(*AUDIO_FEATURES)
+
+def features_to_frame(features):
+    """Turn audio-feature payloads into a DataFrame indexed by track ID.
+
+    Parameters
+    ----------
+    features : list of dict
+        Audio-feature objects as returned by the API. ``None`` entries, for
+        tracks without features, are skipped.
+
+    Returns
+    -------
+    DataFrame
+        The ``AUDIO_FEATURES`` columns as float64, indexed by track ID.
+
+    Examples
+    --------
+    >>> features_to_frame(spa.sp.audio_features(track_ids))
+    """
+    features = [track_features for track_features in features if track_features]
+    values = np.fromiter(
+        itertools.chain.from_iterable(map(_feature_values, features)), dtype='float64',
+        count=len(features) * len(AUDIO_FEATURES)
+    ).reshape(-1, len(AUDIO_FEATURES))
+
+    df = pd.DataFrame(values, index=pd.Index([track_features['id'] for track_features in features], name='id'), columns=AUDIO_FEATURES)
+    return df[~df.index.duplicated()]
+
+def _tracks_frame(tracks, details, playlist=None):
+    """Build the tracks DataFrame from track records and their genre and audio features.
+
+    Genres and audio features are joined on track ID, so tracks without an ID
+    (local files) or without features get NaN.
+
+    Parameters
+    ----------
+    tracks : list of TrackRecord
+        Projected tracks.
+    details : DataFrame
+        Genre and audio features indexed by track ID, as returned by
+        ``TuneInsight.__track_details``.
+    playlist : str, optional
+        Playlist name. Adds a ``playlist`` column when given.
+
+    Returns
+    -------
+    DataFrame
+        One row per track, in the order of ``tracks``.
+    """
+    df = tracks_to_frame(tracks)
+    enrichment = details[['genre'] + AUDIO_FEATURES].reindex(df['id'])
+
+    df.insert(2, 'genre', enrichment['genre'].to_numpy(dtype=object))
+    df[AUDIO_FEATURES] = enrichment[AUDIO_FEATURES].to_numpy(dtype='float64')
+    if playlist is not None:
+        df.insert(2, 'playlist', playlist)
+    return df
+
+TIME_RANGES = ['short_term', 'medium_term', 'long_term']
+
+def _time_ranges(time_range):
+    """Return the list of time ranges selected by a range, a list of ranges or "all"."""
+    ranges = TIME_RANGES if time_range == 'all' else [time_range] if isinstance(time_range, str) else list(time_range)
+    for name in ranges:
+        if name not in TIME_RANGES:
+            raise ValueError(f"Unknown time range '{name}'. Use one of {TIME_RANGES} or 'all'.")
+    return list(dict.fromkeys(ranges))
+
+def _ranked_frame(rankings, details):
+    """Build the long-format frame of several rankings of tracks.
+
+    Parameters
+    ----------
+    rankings : dict
+        Ranked TrackRecords keyed by time range.
+    details : DataFrame
+        Genre and audio features of the union of the tracks.
+
+    Returns
+    -------
+    DataFrame
+        The ``_tracks_frame`` columns preceded by ``time_range`` and the
+        1-based ``rank`` of the track within its range.
+    """
+    df = _tracks_frame([track for tracks in rankings.values() for track in tracks], details)
+    df.insert(0, 'time_range', np.repeat(list(rankings), [len(tracks) for tracks in rankings.values()]))
+    df.insert(1, 'rank', np.concatenate([np.arange(1, len(tracks) + 1) for tracks in rankings.values()]))
+    return df
+
+def _track_details_frame(tracks, genres, features):
+    """Build the stored columns of freshly fetched tracks.
+
+    Parameters
+    ----------
+    tracks : list of TrackRecord
+        Projected tracks, without duplicates.
+    genres : list
+        Genre of every track, in the order of ``tracks``.
+    features : list of dict
+        Audio-feature payloads of the tracks, joined on their ``id``.
+
+    Returns
+    -------
+    DataFrame
+        The ``TrackStore.columns`` of the tracks, indexed by track ID.
+    """
+    df = tracks_to_frame(tracks).set_index('id')
+    df['genre'] = genres
+    return df.join(features_to_frame(features))[TrackStore.columns]
+
+# Value of the ``playlist`` column of saved tracks.
+LIKED_SONGS = "Liked Songs"
+
+EPISODE_FIELDS = ['id', 'name', 'duration_min', 'language', 'release_date', 'show', 'publisher', 'explicit', 'added_at']
+
+def _episode_row(item):
+    """Project a saved-episode item onto the ``EPISODE_FIELDS`` in a single pass."""
+    episode = item['episode']
+    show = episode['show']
+    return (episode['id'], episode['name'], episode['duration_ms'] / 60000, episode['language'],
+            episode['release_date'], show['name'], show['publisher'], episode['explicit'], item['added_at'])
+
+def _exported_episodes(path):
+    """Return the episodes of an earlier export that can be extended, None if there is none."""
+    if not os.path.exists(path):
+        return None
+    df = load_frame(path)
+    if list(df.columns) != EPISODE_FIELDS or df.empty:
+        return None
+    if pd.api.types.is_datetime64_any_dtype(df['release_date']):
+        # Parquet and Feather exports store the dates as dates; extracted rows carry them as text.
+        df['release_date'] = df['release_date'].dt.strftime('%Y-%m-%d')
+    return df
+
+def _new_episodes(rows, exported):
+    """Keep the rows of a page saved after the newest exported episode.
+
+    Saved episodes come newest first, so the first older row ends the refresh.
+
+    Returns
+    -------
+    tuple
+        The rows to add and whether the rest of the library is already exported.
+    """
+    newest = exported['added_at'].max()
+    # Episodes saved in the same second as the newest exported one are told apart by ID.
+    known = set(exported['id'][exported['added_at'] == newest])
+    new = []
+    for row in rows:
+        if row[-1] < newest:
+            return new, True
+        if row[-1] > newest or row[0] not in known:
+            new.append(row)
+    return new, False
+
+def _write_episodes(eps_df, new_df, exported, path, format, summaries, observer):
+    """Write the saved episodes and fold them into ``summaries``.
+
+    A refreshed export only appends the new episodes to a CSV file and only
+    adds them to the summaries. The summaries are rebuilt from the whole
+    library on a first export, or when they have no episodes yet.
+    """
+    if exported is None or format != 'csv':
+        save_frame(eps_df, path, format=format, observer=observer)
+    else:
+        with _stage(observer, 'write') as counts:
+            new_df.to_csv(path, mode='a', header=False, index=False)
+            counts.update(rows=len(new_df), bytes=os.path.getsize(path))
+
+    if exported is None or summaries is None or ('saved_episodes', None) not in summaries.partitions:
+        _summarize(summaries, eps_df, 'saved_episodes', observer=observer)
+    elif not new_df.empty:
+        _summarize(summaries, new_df, 'saved_episodes', observer=observer, replace=False)
+
+def _batches(ids, size):
+    """Split IDs into consecutive batches of at most ``size``."""
+    return [ids[i:i + size] for i in range(0, len(ids), size)]
+
+# IDs per request to the audio-features endpoint, in both engines.
+AUDIO_FEATURES_BATCH_SIZE = 50
+
+def _stored_details(store, tracks, observer):
+    """Look tracks up in the store, as the ``store`` stage.
+
+    Returns
+    -------
+    tuple
+        The stored ``TrackStore.columns`` of the tracks indexed by track ID,
+        and the unique tracks that still have to be fetched.
+    """
+    with _stage(observer, 'store') as counts:
+        stored = store.get(track.id for track in tracks) if store is not None else {}
+        details = pd.DataFrame.from_dict(stored, orient='index', columns=TrackStore.columns)
+        new_tracks = list({track.id: track for track in tracks
+                           if track.id and track.id not in stored}.values())
+        counts.update(hits=len(stored), misses=len(new_tracks))
+    return details, new_tracks
+
+def _fetched_details(store, details, new_tracks, genres, features):
+    """Store freshly fetched tracks and return them with the stored ones. See ``_track_details_frame``."""
+    fetched = _track_details_frame(new_tracks, genres, features)
+    if store is not None:
+        store.put(fetched)
+    return pd.concat([details, fetched]) if len(details) else fetched
+
+def _playlist_entry(store, playlist_id, playlist_info, sync):
+    """Start the playlist dict filled by both engines.
+
+    With ``sync``, the ``df`` of a playlist whose snapshot is unchanged is
+    rebuilt from the store and its tracks need not be fetched.
+    """
+    playlist = {'id': playlist_id, 'name': playlist_info['name'],
+                'snapshot_id': playlist_info.get('snapshot_id'), 'tracks': None, 'df': None}
+    if sync and store is not None:
+        playlist['df'] = store.playlist_df(playlist_id, playlist_info)
+    return playlist
+
+def _playlist_error(e):
+    """Report a playlist that can't be retrieved, without stopping the other playlists."""
+    print(f"Error retrieving playlist data: {e}")
+    print("-------------------------------")
+    print("This playlist can't be retrieved")
+
+def _record_playlist(store, playlist):
+    """Record the snapshot and membership of a freshly fetched playlist in the store."""
+    if store is not None:
+        store.put_playlist(playlist['id'], playlist['name'], playlist['snapshot_id'],
+                           [track.id for track in playlist['tracks']])
+
+def _merge_playlists(store, playlists, details):
+    """Merge fetched and stored playlists into one frame, keeping the first row of every track.
+
+    Parameters
+    ----------
+    store : TrackStore or None
+        Store where the freshly fetched playlists are recorded.
+    playlists : list of dict
+        Playlists as returned by ``_playlist_entry`` and filled with their tracks.
+    details : DataFrame
+        Genre and audio features of the tracks of every fetched playlist.
+
+    Returns
+    -------
+    DataFrame
+        Tracks of every playlist, in playlist order. Local files are all kept.
+        Empty, with the usual columns, when there is no playlist to merge.
+    """
+    if not playlists:
+        # No playlist, or none could be retrieved: keep the columns so cleaning and export still work.
+        return _tracks_frame([], details, playlist='')
+
+    dfs = []
+    for playlist in playlists:
+        if playlist['df'] is not None:
+            dfs.append(playlist['df'])
+        else:
+            dfs.append(_tracks_frame(playlist['tracks'], details, playlist=playlist['name']))
+            _record_playlist(store, playlist)
+
+    df = pd.concat(dfs, ignore_index=True)
+    return df[df['id'].isna() | ~df['id'].duplicated()]
+
+def _episodes_frame(rows, exported):
+    """Return the frame of the new episode rows and the whole library, the exported episodes first."""
+    new_df = pd.DataFrame.from_records(rows, columns=EPISODE_FIELDS)
+    if exported is not None and new_df.empty:
+        return new_df, exported
+    return new_df, pd.concat([exported, new_df], ignore_index=True)
+
+# scikit-learn is only imported once a scaler is built, so extractions that never scale don't pay for it.
+SCALERS = {
+    'standard': 'StandardScaler', 'minmax': 'MinMaxScaler', 'maxabs': 'MaxAbsScaler',
+    'robust': 'RobustScaler', 'quantile': 'QuantileTransformer', 'normalizer': 'Normalizer'
+}
+
+def make_scaler(name):
+    """Build a new scikit-learn scaler from its name.
+
+    Parameters
+    ----------
+    name : str
+        One of ``SCALERS``.
+
+    Returns
+    -------
+    object
+        Unfitted scaler from ``sklearn.preprocessing``.
+
+    Examples
+    --------
+    >>> make_scaler('robust')
+    """
+    if name not in SCALERS:
+        raise ValueError(f"Unknown scaler '{name}'. Choose from {', '.join(SCALERS)}.")
+    import sklearn.preprocessing
+    return getattr(sklearn.preprocessing, SCALERS[name])()
+
+class AudioFeatureScaler:
+    """
+    AudioFeatureScaler scales the audio-feature matrix of a tracks DataFrame with one or several scikit-learn scalers.
+
+    The whole feature matrix goes through each scaler in a single call. Once
+    fitted, for example on a reference corpus, the same scaler transforms any
+    later DataFrame without refitting, and it can be saved and reloaded.
+
+    Attributes:
+        scalers (dict): Scaler objects keyed by name.
+        features (list): Columns that are scaled.
+        fitted (bool): Whether the scalers have been fitted.
+    """
+
+    def __init__(self, scalers='standard', features=None):
+        """Initialize AudioFeatureScaler.
+
+        Parameters
+        ----------
+        scalers : str, object or list, default='standard'
+            Scaler name (one of ``SCALERS``), scikit-learn scaler object, or a
+            list of them. With a single scaler the feature columns are replaced
+            by their scaled values. With several, one ``<feature>_<name>``
+            column is added per scaler and the raw features are kept.
+        features : list, optional
+            Columns to scale. Defaults to ``AUDIO_FEATURES``.
+
+        Returns
+        -------
+        None
+
+        Examples
+        --------
+        >>> scaler = AudioFeatureScaler(['standard', 'quantile']).fit(reference_df)
+        >>> scaler.save(os.path.join(spa.spreadsheets_dir, "reference_scaler.pkl"))
+        """
+        if isinstance(scalers, str) or hasattr(scalers, 'fit_transform'):
+            scalers = [scalers]
+
+        self.scalers = {}
+        for scaler in scalers:
+            if isinstance(scaler, str):
+                self.scalers[scaler] = make_scaler(scaler)
+            else:
+                name = next((name for name, cls in SCALERS.items() if type(scaler).__name__ == cls), type(scaler).__name__.lower())
+                self.scalers[name] = scaler
+        self.features = list(features) if features is not None else list(AUDIO_FEATURES)
+        self.fitted = False
+
+    def __complete_rows(self, df):
+        """Return the mask of rows whose features are all known, and their feature matrix."""
+        values = df[self.features].to_numpy(dtype='float64')
+        mask = ~np.isnan(values).any(axis=1)
+        return mask, values[mask]
+
+    def fit(self, df):
+        """Fit every scaler on the feature matrix of a DataFrame.
+
+        Rows with missing features are ignored. Without any complete row, for
+        example in an empty DataFrame, the scalers are left unfitted.
+
+        Parameters
+        ----------
+        df : DataFrame
+            DataFrame holding the feature columns.
+
+        Returns
+        -------
+        AudioFeatureScaler
+            The fitted scaler.
+        """
+        _, values = self.__complete_rows(df)
+        if not len(values):
+            return self
+        for scaler in self.scalers.values():
+            scaler.fit(values)
+        self.fitted = True
+        return self
+
+    def transform(self, df):
+        """Scale the feature matrix of a DataFrame with the fitted scalers.
+
+        Rows with missing features are left as NaN, so a DataFrame without
+        complete rows needs no fitted scaler.
+
+        Parameters
+        ----------
+        df : DataFrame
+            DataFrame holding the feature columns.
+
+        Returns
+        -------
+        DataFrame
+            Copy of ``df`` with scaled features.
+        """
+        mask, values = self.__complete_rows(df)
+        if not self.fitted and len(values):
+            raise ValueError("AudioFeatureScaler is not fitted yet. Call fit or fit_transform first.")
+
+        df = df.copy()
+
+        for name, scaler in self.scalers.items():
+            scaled = np.full((len(df), len(self.features)), np.nan)
+            if len(values):
+                scaled[mask] = scaler.transform(values)
+            columns = self.features if len(self.scalers) == 1 else [f"{feature}_{name}" for feature in self.features]
+            df[columns] = scaled
+        return df
+
+    def fit_transform(self, df):
+        """Fit the scalers on a DataFrame and scale it.
+
+        Parameters
+        ----------
+        df : DataFrame
+            DataFrame holding the feature columns.
+
+        Returns
+        -------
+        DataFrame
+            Copy of ``df`` with scaled features.
+        """
+        return self.fit(df).transform(df)
+
+    def save(self, path):
+        """Save the scaler to a file.
+
+        Parameters
+        ----------
+        path : str
+            Destination file.
+
+        Returns
+        -------
+        None
+        """
+        with open(path, 'wb') as file:
+            pickle.dump(self, file)
+
+    @classmethod
+    def load(cls, path):
+        """Load a scaler saved with ``save``.
+
+        Parameters
+        ----------
+        path : str
+            File written by ``save``.
+
+        Returns
+        -------
+        AudioFeatureScaler
+
+        Examples
+        --------
+        >>> scaler = AudioFeatureScaler.load("reference_scaler.pkl")
+        >>> spa.playlist_df(playlist_id='your_playlist_id', scale=scaler)
+        """
+        with open(path, 'rb') as file:
+            return pickle.load(file)
+
+def _resolve_scaler(scale, configured):
+    """Turn the ``scale`` argument of the extractors into an AudioFeatureScaler.
+
+    Parameters
+    ----------
+    scale : bool, int, str, list or AudioFeatureScaler
+        False for no scaling, True for the first configured scaler, an index
+        into ``configured``, a scaler name, a list of indexes and names, or a
+        ready AudioFeatureScaler.
+    configured : list
+        Scaler names or scaler objects configured on the instance.
+
+    Returns
+    -------
+    AudioFeatureScaler or None
+    """
+    if scale is None or scale is False:
+        return None
+    if isinstance(scale, AudioFeatureScaler):
+        return scale
+    if scale is True:
+        scale = 0
+    if not isinstance(scale, (list, tuple)):
+        scale = [scale]
+    scalers = [configured[item] if isinstance(item, int) else item for item in scale]
+    if any(not isinstance(scaler, str) for scaler in scalers):
+        from sklearn.base import clone
+        scalers = [scaler if isinstance(scaler, str) else clone(scaler) for scaler in scalers]
+    return AudioFeatureScaler(scalers)
+
+def parse_release_dates(dates):
+    """Parse release dates of year, month or day precision in bulk.
+
+    Spotify reports release dates as "YYYY", "YYYY-MM" or "YYYY-MM-DD".
+    Missing parts default to the first month or day. Dates that do not parse,
+    such as "0000", become NaT.
+
+    Parameters
+    ----------
+    dates : Series
+        Release dates as strings.
+
+    Returns
+    -------
+    tuple of Series
+        The parsed dates as ``datetime64`` and their precision ("year",
+        "month" or "day"), None where the date is invalid.
+
+    Examples
+    --------
+    >>> release_date, precision = parse_release_dates(df['release_date'])
+    """
+    parsed = pd.to_datetime(dates, format='ISO8601', errors='coerce')
+    # Missing dates of a 'string' Series have a missing length, which np.select does not take.
+    lengths = dates.str.len().astype('float64')
+    precision = pd.Series(
+        np.select([lengths == 4, lengths == 7, lengths == 10], ['year', 'month', 'day'], default=None),
+        index=dates.index, dtype=object
+    ).where(parsed.notna(), None)
+    return parsed, precision
+
+def _clean_tracks_df(df, dropna, parse_date, date_precision=False, scaler=None, observer=None):
+    """Drop incomplete rows, parse release dates and scale audio features of a tracks DataFrame.
+
+    Parameters
+    ----------
+    df : DataFrame
+        DataFrame of tracks.
+    dropna : bool
+        Whether to drop null values.
+    parse_date : bool
+        Whether to parse dates.
+    date_precision : bool, default=False
+        Whether to add a ``release_date_precision`` column.
+    scaler : AudioFeatureScaler, optional
+        Scaler applied to the audio features. It is fitted on ``df`` first
+        unless it is already fitted or ``df`` has no complete feature rows.
+        Features are left unscaled if None.
+    observer : Observer, optional
+        Receives the ``dates`` and ``scaling`` stages.
+
+    Returns
+    -------
+    DataFrame
+        Cleaned DataFrame.
+    """
+    with _stage(observer, 'dates') as counts:
+        release_date, precision = parse_release_dates(df['release_date'])
+        if parse_date:
+            df['release_date'] = release_date
+        if date_precision:
+            df.insert(df.columns.get_loc('release_date') + 1, 'release_date_precision', precision)
+        counts['items'] = len(df)
+    if dropna:
+        # Rows with an unparseable release date ("0000" and the like) are dropped as well.
+        df = df[df.notna().all(axis=1) & release_date.notna()]
+        df = df.reset_index(drop=True)
+    return _scale_tracks(df, scaler, observer)
+
+def _scale_tracks(df, scaler, observer=None):
+    """Scale the audio features of a cleaned tracks DataFrame. Without a scaler, ``df`` is returned as is."""
+    if scaler is None:
+        return df
+    with _stage(observer, 'scaling') as counts:
+        df = scaler.transform(df) if scaler.fitted else scaler.fit_transform(df)
+        counts['items'] = len(df)
+    return df
+
+OUTPUT_FORMATS = {'csv': '.csv', 'parquet': '.parquet', 'feather': '.feather'}
+CATEGORICAL_COLUMNS = ['genre', 'artist', 'album', 'playlist', 'release_date_precision', 'show', 'publisher', 'language']
+INTEGER_COLUMNS = ['key', 'mode', 'popularity']
+
+def compact_dtypes(df):
+    """Return a copy of a tracks or episodes DataFrame with compact dtypes.
+
+    Repeated labels (``CATEGORICAL_COLUMNS``) become categoricals, ``key``,
+    ``mode`` and ``popularity`` become int8 when their values are whole
+    numbers (nullable Int8 if some are missing), other float64 columns become
+    float32 and day-precision release date strings are parsed.
+
+    Parameters
+    ----------
+    df : DataFrame
+        DataFrame as returned by ``playlist_df``, ``get_top_tracks``,
+        ``get_user_playlists`` or ``get_user_episodes``.
+
+    Returns
+    -------
+    DataFrame
+        The same data with compact dtypes.
+
+    Examples
+    --------
+    >>> compact_dtypes(spa.playlist_df(playlist_id='your_playlist_id')).memory_usage(deep=True).sum()
+    """
+    df = df.copy()
+    for column in df.columns:
+        values = df[column]
+        if column in CATEGORICAL_COLUMNS:
+            df[column] = values.astype('category')
+        elif column in INTEGER_COLUMNS and pd.api.types.is_numeric_dtype(values) and (values.dropna() % 1 == 0).all():
+            df[column] = values.astype('Int8' if values.isna().any() else 'int8')
+        elif values.dtype == 'float64':
+            df[column] = values.astype('float32')
+        elif column == 'release_date' and values.dtype == object:
+            parsed, precision = parse_release_dates(values.astype('string'))
+            # Only a lossless parse is kept, year or month precision would read back as a made-up day.
+            if (precision[values.notna()] == 'day').all():
+                df[column] = parsed
+    return df
+
+def save_frame(df, path, format=None, observer=None):
+    """Write a DataFrame as CSV, or as Parquet or Feather with compact dtypes.
+
+    Parquet and Feather files keep categoricals, int8 and float32 columns and
+    store release dates as dates. They require pyarrow. Feather files are
+    written uncompressed so ``load_frame`` can memory-map them without copying.
+
+    Parameters
+    ----------
+    df : DataFrame
+        DataFrame to write.
+    path : str
+        Destination file.
+    format : {'csv', 'parquet', 'feather'}, optional
+        Output format. Inferred from the extension of ``path`` by default.
+    observer : Observer, optional
+        Receives a ``write`` stage with the ``rows`` and ``bytes`` written.
+
+    Examples
+    --------
+    >>> save_frame(df, "playlist.parquet")
+    """
+    format = format or os.path.splitext(path)[1].lstrip('.') or 'csv'
+    if format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported format '{format}'. Use one of {list(OUTPUT_FORMATS)}.")
+
+    with _stage(observer, 'write') as counts:
+        _write_frame(df, path, format)
+        counts.update(rows=len(df), bytes=os.path.getsize(path))
+
+def _write_frame(df, path, format):
+    if format == 'csv':
+        df.to_csv(path, index=False)
+        return
+
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(compact_dtypes(df), preserve_index=False)
+    if 'release_date' in table.column_names and pa.types.is_timestamp(table.schema.field('release_date').type):
+        index = table.column_names.index('release_date')
+        table = table.set_column(index, 'release_date', table.column('release_date').cast(pa.date32()))
+
+    if format == 'parquet':
+        import pyarrow.parquet as pq
+        pq.write_table(table, path, compression='zstd')
+    else:
+        import pyarrow.feather as feather
+        feather.write_feather(table, path, compression='uncompressed')
+
+def load_frame(path, columns=None, memory_map=True):
+    """Read a DataFrame written by ``save_frame``.
+
+    Parquet and Feather files are memory-mapped and keep their compact dtypes;
+    release dates come back as ``datetime64``.
+
+    Parameters
+    ----------
+    path : str
+        CSV, Parquet or Feather file.
+    columns : list of str, optional
+        Columns to read. All by default.
+    memory_map : bool, default=True
+        Whether to memory-map Parquet and Feather files instead of reading them into memory.
+
+    Returns
+    -------
+    DataFrame
+
+    Examples
+    --------
+    >>> df = load_frame(os.path.join(spa.spreadsheets_dir, "username's_top_tracks.parquet"))
+    """
+    extension = os.path.splitext(path)[1]
+    if extension == '.parquet':
+        import pyarrow.parquet as pq
+        table = pq.read_table(path, columns=columns, memory_map=memory_map)
+    elif extension == '.feather':
+        import pyarrow.feather as feather
+        table = feather.read_table(path, columns=columns, memory_map=memory_map)
+    else:
+        return pd.read_csv(path, usecols=columns)
+    return table.to_pandas(date_as_object=False, coerce_temporal_nanoseconds=True)
+
+def _output_path(directory, name, format):
+    if format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported format '{format}'. Use one of {list(OUTPUT_FORMATS)}.")
+    return os.path.join(directory, name + OUTPUT_FORMATS[format])
+
+_PLAYLIST_ID = re.compile(r'^[0-9A-Za-z]{22}$')
+_PLAYLIST_REF = re.compile(r'playlist[/:]([0-9A-Za-z]{22})')
+
+def _playlist_id(selector):
+    """Return the playlist ID of an ID, URL or URI selector, or None for anything else."""
+    if _PLAYLIST_ID.match(selector):
+        return selector
+    match = _PLAYLIST_REF.search(selector)
+    return match.group(1) if match else None
+
+def _user_id(user):
+    """Return the username of a username, profile URL or ``spotify:user:`` URI."""
+    if user.startswith('spotify:user:'):
+        return user.split(':')[2]
+    if '://' in user:
+        return urlparse(user).path.rstrip('/').split('/')[-1]
+    return user
+
+def _smallest(values, k, group=1024):
+    """Return the positions of the ``k`` smallest values, smallest first.
+
+    The k-th smallest of the minima of fixed-size groups bounds the answer, so
+    only the few values under that bound are sorted instead of partitioning the
+    whole array.
+    """
+    k = min(k, len(values))
+    groups = len(values) // group
+    if 0 < k <= groups:
+        bound = np.partition(values[:groups * group].reshape(groups, group).min(axis=1), k - 1)[k - 1]
+        candidates = np.flatnonzero(values <= bound)
+    else:
+        candidates = np.arange(len(values))
+    return candidates[np.argsort(values[candidates], kind='stable')[:k]]
+
+class SimilarityIndex:
+    """
+    SimilarityIndex finds the tracks whose audio features are closest to a track or to a playlist.
+
+    The feature vectors are kept in a float32 matrix and compared by brute
+    force, one block of tracks at a time, so results are exact and a query over
+    a million tracks takes milliseconds. Every feature is standardized over the
+    indexed tracks, so tempo and loudness do not outweigh the features bounded
+    by 0 and 1. Tracks can be added at any time, and the index can be saved
+    and loaded.
+
+    Attributes:
+        features (list): Feature columns compared.
+        block_size (int): Number of tracks compared at once.
+        ids (list): Indexed track IDs, in matrix order.
+        playlists (dict): Indexed track IDs of every playlist, keyed by playlist ID or name.
+    """
+
+    def __init__(self, features=None, block_size=1 << 16):
+        """Initialize an empty SimilarityIndex.
+
+        Parameters
+        ----------
+        features : list, optional
+            Columns to compare. Defaults to ``AUDIO_FEATURES``.
+        block_size : int, default=65536
+            Number of tracks compared at once. Bounds the memory the
+            matrix product of a query touches at a time.
+
+        Returns
+        -------
+        None
+
+        Examples
+        --------
+        >>> index = SimilarityIndex.from_store(spa.store)
+        >>> index.add(spa.get_top_tracks(), playlist="top tracks")
+        >>> index.similar_tracks("4uLU6hMCjMI75M1A2tKUQC", k=10)
+        """
+        self.features = list(features) if features is not None else list(AUDIO_FEATURES)
+        self.block_size = block_size
+        self.ids = []
+        self.playlists = {}
+        self.__positions = {}
+        self.__matrix = np.empty((0, len(self.features)), dtype='float32')
+        self.__pending = []
+        self.__scaled = None
+
+    @classmethod
+    def from_store(cls, store, features=None):
+        """Build an index of every track and playlist recorded in a TrackStore.
+
+        Parameters
+        ----------
+        store : TrackStore
+            Store to read, e.g. ``spa.store``.
+        features : list, optional
+            Columns to compare. Defaults to ``AUDIO_FEATURES``.
+
+        Returns
+        -------
+        SimilarityIndex
+
+        Examples
+        --------
+        >>> index = SimilarityIndex.from_store(spa.store)
+        """
+        index = cls(features=features).add(store.audio_features())
+        for playlist_id, track_ids in store.playlists().items():
+            index.playlists[playlist_id] = [track_id for track_id in track_ids if track_id in index.__positions]
+        return index
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, df, playlist=None):
+        """Add tracks to the index, or refresh the features of indexed ones.
+
+        Rows without an ID or with a missing feature are skipped.
+
+        Parameters
+        ----------
+        df : DataFrame
+            Tracks with an ``id`` column and the feature columns, e.g. the
+            output of ``playlist_df`` or ``get_top_tracks`` (unscaled).
+        playlist : str, optional
+            Playlist ID or name the tracks are added to for
+            ``similar_to_playlist``, so a playlist can be added chunk by chunk.
+            By default, the ``playlist`` column of ``df`` is used when present.
+
+        Returns
+        -------
+        SimilarityIndex
+            The index itself.
+
+        Examples
+        --------
+        >>> index.add(spa.playlist_df(playlist_id=playlist_id), playlist=playlist_id)
+        """
+        values = df[self.features].to_numpy(dtype='float32')
+        mask = df['id'].notna().to_numpy() & ~np.isnan(values).any(axis=1)
+        ids = df['id'].to_numpy()[mask]
+        values = values[mask]
+
+        if playlist is not None:
+            self.playlists[playlist] = list(dict.fromkeys([*self.playlists.get(playlist, []), *ids]))
+        elif 'playlist' in df.columns:
+            for name, members in pd.Series(ids, index=df['playlist'].to_numpy()[mask]).groupby(level=0, sort=False):
+                self.playlists[name] = list(dict.fromkeys([*self.playlists.get(name, []), *members]))
+
+        # New rows are appended as a chunk; only refreshed rows need the matrix consolidated.
+        indexed = len(self.ids)
+        new, updates = {}, {}
+        for track_id, row in zip(ids, values):
+            position = self.__positions.get(track_id)
+            if position is None:
+                position = self.__positions[track_id] = len(self.ids)
+                self.ids.append(track_id)
+            if position >= indexed:
+                new[position] = row
+            else:
+                updates[position] = row
+        if new:
+            self.__pending.append(np.asarray(list(new.values()), dtype='float32'))
+        if updates:
+            self.__consolidate()
+            self.__matrix[list(updates)] = np.asarray(list(updates.values()), dtype='float32')
+        self.__scaled = None
+        return self
+
+    def __consolidate(self):
+        """Append the pending chunks to the matrix."""
+        if self.__pending:
+            self.__matrix = np.concatenate([self.__matrix, *self.__pending])
+            self.__pending = []
+
+    def __scaled_matrix(self):
+        """Return the standardized matrix, one column per track, and the squared norms of the tracks."""
+        self.__consolidate()
+        if self.__scaled is None:
+            mean = self.__matrix.mean(axis=0, dtype='float64')
+            std = self.__matrix.std(axis=0, dtype='float64')
+            std[std == 0] = 1
+            # Feature-major layout: a query reads each feature as one contiguous run.
+            scaled = np.ascontiguousarray(((self.__matrix - mean) / std).astype('float32').T)
+            self.__scaled = (scaled, np.einsum('ij,ij->j', scaled, scaled))
+        return self.__scaled
+
+    def __nearest(self, query, k, exclude):
+        """Return the ``k`` nearest tracks to a standardized query vector, ignoring the ``exclude`` positions."""
+        scaled, norms = self.__scaled_matrix()
+        distances = np.empty(len(norms), dtype='float32')
+        for start in range(0, len(norms), self.block_size):
+            block = distances[start:start + self.block_size]
+            np.matmul(query, scaled[:, start:start + self.block_size], out=block)
+            # ||x - q||^2 = ||x||^2 - 2 x.q + ||q||^2, the constant ||q||^2 is added to the k results only.
+            block *= -2
+            block += norms[start:start + self.block_size]
+        distances[list(exclude)] = np.inf
+
+        positions = _smallest(distances, k)
+        positions = positions[np.isfinite(distances[positions])]
+        return pd.DataFrame({'id': [self.ids[position] for position in positions],
+                             'distance': np.sqrt(np.maximum(distances[positions] + query @ query, 0))})
+
+    def similar_tracks(self, track_id, k=10):
+        """Return the indexed tracks that sound most like a track.
+
+        Parameters
+        ----------
+        track_id : str
+            ID of an indexed track.
+        k : int, default=10
+            Number of tracks to return.
+
+        Returns
+        -------
+        DataFrame
+            ``id`` and ``distance`` (Euclidean, over standardized features) of
+            the ``k`` closest tracks, closest first. The track itself is left
+            out.
+
+        Examples
+        --------
+        >>> index.similar_tracks("4uLU6hMCjMI75M1A2tKUQC", k=5).merge(df, on="id")
+        """
+        if track_id not in self.__positions:
+            raise KeyError(f"Track '{track_id}' is not indexed.")
+        scaled, _ = self.__scaled_matrix()
+        position = self.__positions[track_id]
+        return self.__nearest(scaled[:, position], k, [position])
+
+    def similar_to_playlist(self, playlist_id, k=10):
+        """Return the indexed tracks closest to the average sound of a playlist.
+
+        Parameters
+        ----------
+        playlist_id : str
+            Playlist ID or name the playlist was indexed under.
+        k : int, default=10
+            Number of tracks to return.
+
+        Returns
+        -------
+        DataFrame
+            ``id`` and ``distance`` of the ``k`` tracks closest to the centroid
+            of the playlist, closest first. Tracks of the playlist are left out.
+
+        Examples
+        --------
+        >>> index.similar_to_playlist(playlist_id, k=20)
+        """
+        if not self.playlists.get(playlist_id):
+            raise KeyError(f"Playlist '{playlist_id}' is not indexed.")
+        scaled, _ = self.__scaled_matrix()
+        members = [self.__positions[track_id] for track_id in self.playlists[playlist_id]]
+        centroid = scaled[:, members].mean(axis=1, dtype='float64').astype('float32')
+        return self.__nearest(centroid, k, members)
+
+    def __getstate__(self):
+        self.__consolidate()
+        state = self.__dict__.copy()
+        # The standardized copy is rebuilt on the first query after loading.
+        state['_SimilarityIndex__scaled'] = None
+        return state
+
+    def save(self, path):
+        """Save the index to a file.
+
+        Parameters
+        ----------
+        path : str
+            Destination file.
+
+        Returns
+        -------
+        None
+        """
+        with open(path, 'wb') as file:
+            pickle.dump(self, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        """Load an index saved with ``save``.
+
+        Parameters
+        ----------
+        path : str
+            File written by ``save``.
+
+        Returns
+        -------
+        SimilarityIndex
+        """
+        with open(path, 'rb') as file:
+            return pickle.load(file)
+
+SUMMARY_DIMENSIONS = ['genre', 'artist', 'album', 'playlist', 'release_year', 'explicit', 'show', 'publisher', 'language']
+# Histogram range and bin count of every summarized feature. Values outside the range land in the edge bins.
+SUMMARY_BINS = {feature: (0.0, 1.0, 50) for feature in AUDIO_FEATURES}
+SUMMARY_BINS.update(key=(0, 12, 12), mode=(0, 2, 2), loudness=(-60.0, 0.0, 60), tempo=(0.0, 250.0, 50),
+                    popularity=(0, 100, 20), duration_min=(0.0, 120.0, 240))
+SUMMARY_PERCENTILES = [5, 25, 50, 75, 95]
+
+class SummaryTables:
+    """
+    SummaryTables keeps compact, pre-aggregated summaries of extracted tracks and episodes for the Tableau dashboard.
+
+    Every update aggregates only the rows it is given: counts per genre,
+    artist, album, playlist, release year and so on, and the count, sum, sum
+    of squares and fixed-bin histogram of every feature. These aggregates can
+    be added and subtracted, so a playlist extracted again replaces its earlier
+    contribution without touching the rest, and the means, standard deviations
+    and percentiles are derived from them instead of from the rows.
+
+    Attributes:
+        directory (str): Directory of the summary CSV files and of the saved state.
+        counts (dict): Counter of ``(source, value)`` pairs per dimension.
+        features (dict): ``[count, sum, sum of squares]`` and histogram per ``(source, feature)``.
+        partitions (dict): Aggregates of every ``(source, partition)``, kept to replace them later.
+    """
+
+    state_file = "summaries.pkl"
+
+    def __init__(self, directory):
+        """Initialize SummaryTables.
+
+        Loads the state saved in ``directory`` by an earlier run, if any.
+
+        Parameters
+        ----------
+        directory : str
+            Directory of the summary CSV files and of the saved state.
+
+        Returns
+        -------
+        None
+
+        Examples
+        --------
+        >>> summaries = SummaryTables(os.path.join(spa.spreadsheets_dir, "summaries"))
+        >>> summaries.update(load_frame(os.path.join(spa.spreadsheets_dir, "username's_top_tracks.csv")), "top_tracks")
+        >>> summaries.write()
+        """
+        self.directory = directory
+        self.counts = {dimension: Counter() for dimension in SUMMARY_DIMENSIONS}
+        self.features = {}
+        self.partitions = {}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+        path = os.path.join(directory, self.state_file)
+        if os.path.exists(path):
+            with open(path, 'rb') as file:
+                state = pickle.load(file)
+            self.counts, self.features, self.partitions = state['counts'], state['features'], state['partitions']
+
+    @staticmethod
+    def __aggregate(df):
+        """Return the counts and feature aggregates of a DataFrame."""
+        columns = {}
+        for dimension in SUMMARY_DIMENSIONS:
+            if dimension == 'release_year' and 'release_date' in df.columns:
+                columns[dimension] = pd.to_numeric(df['release_date'].astype(str).str[:4], errors='coerce').astype('Int64')
+            elif dimension in df.columns:
+                columns[dimension] = df[dimension]
+        counts = {dimension: Counter(column.dropna().value_counts(sort=False).to_dict())
+                  for dimension, column in columns.items()}
+
+        features = {}
+        for feature, (low, high, bins) in SUMMARY_BINS.items():
+            if feature not in df.columns:
+                continue
+            values = pd.to_numeric(df[feature], errors='coerce').to_numpy(dtype='float64')
+            values = values[np.isfinite(values)]
+            positions = np.clip(((values - low) / (high - low) * bins).astype('int64'), 0, bins - 1)
+            features[feature] = (np.array([len(values), values.sum(), np.square(values).sum()]),
+                                 np.bincount(positions, minlength=bins))
+        return counts, features
+
+    def __apply(self, source, aggregate, sign):
+        """Add (``sign=1``) or subtract (``sign=-1``) an aggregate to the totals of ``source``."""
+        counts, features = aggregate
+        for dimension, counter in counts.items():
+            keyed = Counter({(source, value): count for value, count in counter.items()})
+            total = self.counts[dimension]
+            if sign > 0:
+                total.update(keyed)
+            else:
+                total.subtract(keyed)
+                for key in keyed:
+                    if total[key] <= 0:
+                        del total[key]
+        for feature, (moments, histogram) in features.items():
+            total = self.features.setdefault((source, feature), [np.zeros(3), np.zeros(len(histogram), dtype='int64')])
+            total[0] = total[0] + sign * moments
+            total[1] = total[1] + sign * histogram
+
+    def update(self, df, source, partition=None, replace=True):
+        """Fold new rows into the summaries.
+
+        Parameters
+        ----------
+        df : DataFrame
+            Rows to add, e.g. the output of ``playlist_df``, ``get_top_tracks``
+            or ``get_user_episodes``. Histograms assume unscaled features.
+        source : str
+            Dataset the rows belong to, e.g. "playlists", "top_tracks" or
+            "saved_episodes". Kept in the ``source`` column of every table.
+        partition : str, optional
+            Part of the source the rows make up. By default every playlist of
+            a ``playlist`` column is its own partition, and the rows of frames
+            without one form a single partition of the whole source.
+        replace : bool, default=True
+            Whether the rows replace the earlier contribution of their
+            partitions, as when a playlist is extracted again. False adds them
+            to it, as when a playlist arrives in chunks.
+
+        Returns
+        -------
+        int
+            Number of rows added.
+
+        Examples
+        --------
+        >>> summaries.update(spa.playlist_df(playlist_id=playlist_id), "playlists")
+        >>> for chunk in spa.iter_playlist_chunks(playlist_id=playlist_id):
+        >>>     summaries.update(chunk, "playlists", replace=False)
+        """
+        if partition is not None or 'playlist' not in df.columns:
+            groups = [(partition, df)]
+        else:
+            groups = df.groupby('playlist', sort=False, observed=True)
+
+        with self._lock:
+            for name, rows in groups:
+                key = (source, name)
+                aggregate = self.__aggregate(rows)
+                previous = self.partitions.get(key)
+                if previous is not None and replace:
+                    self.__apply(source, previous, -1)
+                self.partitions[key] = aggregate if previous is None or replace else self.__merge(previous, aggregate)
+                self.__apply(source, aggregate, 1)
+        return len(df)
+
+    @staticmethod
+    def __merge(first, second):
+        """Return the sum of two aggregates."""
+        counts = {dimension: first[0].get(dimension, Counter()) + second[0].get(dimension, Counter())
+                  for dimension in set(first[0]) | set(second[0])}
+        features = dict(first[1])
+        for feature, (moments, histogram) in second[1].items():
+            if feature in features:
+                features[feature] = (features[feature][0] + moments, features[feature][1] + histogram)
+            else:
+                features[feature] = (moments, histogram)
+        return counts, features
+
+    def remove(self, source, partition=None):
+        """Drop the contribution of a partition, or of a whole source.
+
+        Parameters
+        ----------
+        source : str
+            Dataset to drop from.
+        partition : str, optional
+            Partition to drop, e.g. a playlist that was deleted. The whole
+            source by default.
+
+        Returns
+        -------
+        None
+        """
+        with self._lock:
+            for key in [key for key in self.partitions if key[0] == source and (partition is None or key[1] == partition)]:
+                self.__apply(source, self.partitions.pop(key), -1)
+
+    def tables(self):
+        """Return the summary tables.
+
+        Returns
+        -------
+        dict of DataFrame
+            ``<dimension>_counts`` tables with ``source``, the dimension and
+            ``count``; ``feature_stats`` with the count, mean, standard
+            deviation and percentiles (interpolated within histogram bins) of
+            every feature; ``feature_histograms`` with the bin bounds and counts.
+        """
+        tables = {}
+        with self._lock:
+            for dimension, counter in self.counts.items():
+                rows = [(source, value, count) for (source, value), count in counter.items() if count > 0]
+                tables[f"{dimension}_counts"] = pd.DataFrame(rows, columns=['source', dimension, 'count']) \
+                    .sort_values(['source', 'count'], ascending=[True, False], ignore_index=True)
+
+            stats, histograms = [], []
+            for (source, feature), (moments, histogram) in sorted(self.features.items()):
+                count, total, squares = moments
+                if count <= 0:
+                    continue
+                low, high, bins = SUMMARY_BINS[feature]
+                edges = np.linspace(low, high, bins + 1)
+                mean = total / count
+                std = np.sqrt(max(squares / count - mean ** 2, 0))
+                stats.append([source, feature, int(count), mean, std, *_histogram_percentiles(histogram, edges, SUMMARY_PERCENTILES)])
+                histograms.extend([source, feature, edges[i], edges[i + 1], int(histogram[i])]
+                                  for i in range(bins) if histogram[i] > 0)
+
+        percentiles = [f"p{percentile:02d}" for percentile in SUMMARY_PERCENTILES]
+        tables['feature_stats'] = pd.DataFrame(stats, columns=['source', 'feature', 'count', 'mean', 'std', *percentiles])
+        tables['feature_histograms'] = pd.DataFrame(histograms, columns=['source', 'feature', 'bin_start', 'bin_end', 'count'])
+        return tables
+
+    def write(self):
+        """Write every summary table as CSV to ``directory`` and save the state for the next run.
+
+        Returns
+        -------
+        dict
+            Path of every written table, keyed by table name.
+        """
+        paths = {}
+        for name, table in self.tables().items():
+            paths[name] = os.path.join(self.directory, f"{name}.csv")
+            table.to_csv(paths[name], index=False)
+        with self._lock:
+            state = {'counts': self.counts, 'features': self.features, 'partitions': self.partitions}
+            with open(os.path.join(self.directory, self.state_file), 'wb') as file:
+                pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+        return paths
+
+def _histogram_percentiles(histogram, edges, percentiles):
+    """Estimate percentiles from a histogram, interpolating linearly within the bin that holds each of them."""
+    cumulative = np.cumsum(histogram)
+    values = []
+    for percentile in percentiles:
+        target = percentile / 100 * cumulative[-1]
+        i = min(int(np.searchsorted(cumulative, target)), len(histogram) - 1)
+        before = cumulative[i - 1] if i else 0
+        fraction = (target - before) / histogram[i] if histogram[i] else 0
+        values.append(edges[i] + fraction * (edges[i + 1] - edges[i]))
+    return values
+
+def _summarize(summaries, df, source, observer=None, replace=True):
+    """Fold a freshly written DataFrame into ``summaries`` and rewrite the tables. Does nothing without summaries."""
+    if summaries is None or df is None:
+        return
+    with _stage(observer, 'summaries') as counts:
+        counts['rows'] = summaries.update(df, source, replace=replace)
+        summaries.write()
+
+def _export_tracks(engine, df, name, source, format, unscaled=None):
+    """Write a tracks frame of ``engine`` (a TuneInsight or AsyncTuneInsight) to ``spreadsheets_dir`` and summarize it.
+
+    The summaries are built from ``unscaled``, the frame before its features were scaled, when given, so their
+    feature statistics stay in the units of the API whatever scaling the export used.
+    """
+    save_frame(df, _output_path(engine.spreadsheets_dir, name, format), observer=engine.observer)
+    _summarize(engine.summaries, unscaled if unscaled is not None else df, source, observer=engine.observer)
+
+def _export_ranked(engine, df, ranges, format, unscaled=None):
+    """Write the long-format top tracks of ``engine`` as one file and one summary source per time range.
+
+    Every requested range gets its file, empty when ``dropna`` left none of its tracks, so no stale export of an
+    earlier run remains. The summary tables are rewritten once, after every range is folded in.
+    """
+    unscaled = unscaled if unscaled is not None else df
+    for time_range in ranges:
+        save_frame(df[df['time_range'] == time_range],
+                   _output_path(engine.spreadsheets_dir, f"{engine.user}'s_top_tracks_{time_range}", format),
+                   observer=engine.observer)
+    if engine.summaries is not None:
+        with _stage(engine.observer, 'summaries') as counts:
+            counts['rows'] = sum(engine.summaries.update(unscaled[unscaled['time_range'] == time_range],
+                                                         f"top_tracks_{time_range}") for time_range in ranges)
+            engine.summaries.write()
+
+class TuneInsight:
+    """
+    TuneInsight class provides methods to analyze Spotify playlists and extract audio features of tracks.
+
+    Attributes:
+        client_id (str): Client ID for accessing Spotify API.
+        client_secret (str): Client secret for accessing Spotify API.
+        redirect_uri (str): Redirect URI for authentication.
+        scope (list): Scopes requested by the authorization code flow.
+        auth_manager (object): Spotipy auth manager that caches and refreshes the token, None if a bare client was given.
+        token (str): Access token for Spotify API authentication.
+        project_dir (str): Directory holding ``Spreadsheets`` and the token cache.
+        scalers (list): Scalers picked by index with ``scale``, as names (see ``SCALERS``) or scikit-learn scaler objects.
+        genre_resolver (GenreResolver): Cache of artist genres shared by all track extractors.
+        store (TrackStore): On-disk store of already extracted tracks, None when disabled.
+        summaries (SummaryTables): Dashboard summaries updated by every export, None when disabled.
+        rate_limiter (RateLimiter): Request budget shared by every API call of the instance.
+        concurrency (AdaptiveConcurrency): Adaptive cap on requests in flight.
+        max_workers (int): Maximum number of playlists fetched concurrently.
+        page_workers (int): Maximum number of pages of a listing fetched concurrently.
+        observer (Observer): Receiver of stage and request events, silent by default.
+    """
+
+    scope = [
+        "user-follow-read", "user-follow-modify", "user-library-read",
+        "user-top-read", "playlist-read-private", "playlist-read-collaborative"
+    ]
+
+    def __init__(self, user : str, client_id=None, client_secret : str = None, genre_resolver=None, store=True, store_ttl=30*24*60*60,
+                 rate_limit=None, max_workers=8, page_workers=4, max_in_flight=32, max_retries=5, auth='oauth', cache_path=None,
+                 auth_manager=None, sp=None, project_dir=None, observer=None, summaries=False):
+        """Initialize TuneInsight.
+
+        Initializes TuneInsight with necessary attributes and obtains access token.
+        The token is cached on disk and refreshed with its refresh token, so the
+        browser is only opened the first time.
+
+        Parameters
+        ----------
+        user : str
+            The username of the Spotify account.
+        client_id : str, optional
+            Client ID for accessing Spotify API. Defaults to the
+            ``SPOTIPY_CLIENT_ID`` environment variable.
+        client_secret : str, optional
+            Client secret for accessing Spotify API. Defaults to the
+            ``SPOTIPY_CLIENT_SECRET`` environment variable.
+        genre_resolver : GenreResolver, optional
+            Genre cache to use. Pass the same resolver to several instances
+            to share the cached artists between them.
+        store : bool, default=True
+            Whether to keep extracted tracks in ``Spreadsheets/tracks.sqlite``
+            and only fetch tracks that are not stored yet.
+        store_ttl : float, default=30 days
+            Seconds after which a stored track is fetched again. None keeps
+            stored tracks forever.
+        rate_limit : float, optional
+            Maximum number of API requests per second, shared by all threads.
+            No limit by default: the number of requests in flight already
+            adapts to throttling, and a fixed rate would cap throughput well
+            below what the API allows.
+        max_workers : int, default=8
+            Maximum number of playlists fetched concurrently.
+        page_workers : int, default=4
+            Maximum number of pages of a playlist or listing fetched
+            concurrently once the first page has reported the total.
+        max_in_flight : int, default=32
+            Highest number of requests in flight. The actual cap adapts to
+            throttling, and the connection pool is sized to match.
+        max_retries : int, default=5
+            Maximum number of retries of a throttled or failed request.
+        auth : {'oauth', 'client_credentials'}, default='oauth'
+            Authorization flow. 'client_credentials' needs no user and no
+            browser but can only read public data such as public playlists.
+        cache_path : str, optional
+            Token cache file. Defaults to ``.cache-<user>`` in ``project_dir``.
+        auth_manager : object, optional
+            Spotipy auth manager (``SpotifyOAuth``, ``SpotifyClientCredentials``)
+            to use instead of building one. Instances given the same manager
+            share one token and its refreshes.
+        sp : spotipy.Spotify or SpotifyTransport, optional
+            Already authenticated client. A SpotifyTransport is shared as is,
+            with its rate limiter and concurrency cap. A spotipy client is
+            wrapped in a new SpotifyTransport, which replaces spotipy's
+            default session so that retries happen once, in the transport.
+        project_dir : str, optional
+            Directory where ``Spreadsheets`` is created. Defaults to the parent
+            of the working directory, which is left unchanged.
+        observer : Observer, optional
+            Receives the stage and request events of every extraction, e.g. a
+            TqdmObserver for progress bars or a StatsObserver for metrics.
+            Silent by default. A shared SpotifyTransport keeps reporting its
+            requests to its own observer.
+        summaries : bool or SummaryTables, default=False
+            Whether every file written with ``to_csv`` also updates the
+            dashboard summary tables in ``Spreadsheets/summaries``. A
+            SummaryTables instance is used as is.
+
+        Returns
+        -------
+        None
+
+        Examples
+        --------
+        >>> ti = TuneInsight(
+        >>>     user="yourname",
+        >>>     client_id=client_id,
+        >>>     client_secret=client_secret
+        >>> )
+        >>> public = TuneInsight(user="yourname", client_id=client_id, client_secret=client_secret, auth='client_credentials')
+        >>> worker = TuneInsight(user="yourname", sp=ti.sp, store=False)
+        """
+        self.user = user
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.redirect_uri = "http://localhost:8888/callback"
+        self.token = None
+        self.scalers = list(SCALERS)
+        self.sp = None  
+        self.genre_resolver = genre_resolver if genre_resolver is not None else GenreResolver()
+        self.rate_limiter = RateLimiter(rate=rate_limit)
+        self.concurrency = AdaptiveConcurrency(maximum=max_in_flight)
+        self.max_retries = max_retries
+        self.max_workers = max_workers
+        self.page_workers = page_workers
+        self.observer = observer if observer is not None else Observer()
+
+        self.project_dir = project_dir or os.path.dirname(os.getcwd())
+        self.spreadsheets_dir = os.path.join(self.project_dir, "Spreadsheets")
+        if not os.path.exists(self.spreadsheets_dir):
+            os.makedirs(self.spreadsheets_dir)
+        self.store = TrackStore(os.path.join(self.spreadsheets_dir, "tracks.sqlite"), ttl=store_ttl) if store else None
+        if summaries is True:
+            summaries = SummaryTables(os.path.join(self.spreadsheets_dir, "summaries"))
+        self.summaries = summaries or None
+
+        if sp is not None:
+            if not isinstance(sp, SpotifyTransport):
+                sp = SpotifyTransport(sp, self.rate_limiter, self.concurrency, max_retries=max_retries, observer=self.observer)
+            self.sp = sp
+            self.rate_limiter = sp.rate_limiter
+            self.concurrency = sp.concurrency
+            self.auth_manager = getattr(sp.client, 'auth_manager', None)
+            self.token = self.auth_manager.get_access_token(as_dict=False) if self.auth_manager is not None else getattr(sp.client, '_auth', None)
+            return
+
+        cache_handler = CacheFileHandler(cache_path=cache_path or os.path.join(self.project_dir, f".cache-{user}"))
+        if auth_manager is not None:
+            self.auth_manager = auth_manager
+        elif auth == 'client_credentials':
+            self.auth_manager = SpotifyClientCredentials(client_id=self.client_id, client_secret=self.client_secret,
+                                                         cache_handler=cache_handler)
+        elif auth == 'oauth':
+            self.auth_manager = SpotifyOAuth(client_id=self.client_id, client_secret=self.client_secret,
+                                             redirect_uri=self.redirect_uri, scope=self.scope,
+                                             cache_handler=cache_handler, open_browser=False)
+        else:
+            raise ValueError(f"Unknown auth '{auth}'. Use 'oauth' or 'client_credentials'.")
+
+        try:
+            self.token = self.__access_token()
+
+            if self.token:
+                # The client asks the auth manager for the token on every call, so it is refreshed when it expires.
+                client = spotipy.Spotify(auth_manager=self.auth_manager, requests_session=SpotifyTransport.session(max_in_flight))
+                self.sp = SpotifyTransport(client, self.rate_limiter, self.concurrency, max_retries=max_retries, observer=self.observer)
+            else:
+                print("Failed to authenticate. Please check your credentials and try again.")
+
+        except Exception as e:
+            print("Error during authentication:", e)
+
+    def __access_token(self):
+        """Return a valid access token, from the cache when possible.
+
+        A cached token that expired is refreshed with its refresh token. The
+        browser and the local redirect server on port 8888 are only used when
+        the authorization code flow has no cached token at all.
+        """
+        if not isinstance(self.auth_manager, SpotifyOAuth):
+            return self.auth_manager.get_access_token(as_dict=False)
+
+        token_info = self.auth_manager.validate_token(self.auth_manager.cache_handler.get_cached_token())
+        if token_info is not None:
+            return token_info['access_token']
+
+        auth_url = self.auth_manager.get_authorize_url()
+
+        server_address = ('', 8888)
+        httpd = HTTPServer(server_address, RedirectHandler)
+
+        try:
+
+            webbrowser.open(auth_url)
+
+            httpd.handle_request()
+
+            authorization_code = httpd.authorization_code
+
+            token_info = self.auth_manager.get_access_token(authorization_code, check_cache=False)
+
+            if token_info:
+                print("Authentication successful.")
+                return token_info['access_token']
+            return None
+
+        finally:
+            httpd.server_close()
+
+    def get_user_playlists(self, scale=False, username=False, to_csv=False, dropna=True, parse_date=True, date_precision=False, sync=False, max_workers=None, format='csv', selection=None):
+        """Retrieve audio features of tracks in a user's playlists.
+
+        Parameters
+        ----------
+        scale : bool, int, str, list or AudioFeatureScaler, default=False
+            Whether and how to scale the audio features. True uses the first
+            of ``scalers``; an index or a name (see ``SCALERS``), or a list of
+            them, picks the scalers. A fitted AudioFeatureScaler is reused
+            without refitting.
+        username : bool or str, default=False
+            Spotify username or profile URL whose public playlists are listed.
+            True prompts for the profile URL; False lists the current user's
+            playlists.
+        to_csv : bool, default=False
+            Whether to save the DataFrame to a CSV file.
+        format : {'csv', 'parquet', 'feather'}, default='csv'
+            File format used with ``to_csv``. Parquet and Feather keep compact
+            dtypes (see ``compact_dtypes``) and require pyarrow.
+        dropna : bool, default=True
+            Whether to drop null values.
+        parse_date : bool, default=True
+            Whether to parse dates.
+        date_precision : bool, default=False
+            Whether to add a ``release_date_precision`` column ("year",
+            "month" or "day").
+        sync : bool, default=False
+            Whether to reuse the stored tracks of playlists whose snapshot has
+            not changed since the last fetch. See ``playlist_df``.
+        max_workers : int, optional
+            Maximum number of playlists fetched concurrently when "All" is
+            selected. Defaults to the instance's ``max_workers``.
+        selection : int or str, optional
+            Index of the playlist to retrieve, or "All" for every playlist. The
+            user is prompted if not given.
+
+        Returns
+        -------
+        DataFrame
+            DataFrame containing audio features of tracks in the playlist.
+
+        Examples
+        --------
+        >>> spa.get_user_playlists(scale=True, to_csv=True)
+        >>> spa.get_user_playlists(username="spotify", selection="All", to_csv=True)
+        """
+        if username is True:
+            username = input("Enter Spotify Profile URL")
+        user_playlists = self.__user_playlists(_user_id(username) if username else None)
+
+        if selection is None:
+            for i, playlist in enumerate(user_playlists):
+                print(f"{i}. {playlist['name']}")
+            print(f"{len(user_playlists)}. All")
+
+            selection = input("Enter the number of the playlist you want to retrieve songs from: ")
+            _clear_output()
+
+        selected_playlist_index = len(user_playlists) if str(selection).lower() == "all" else int(selection)
+        if 0 <= selected_playlist_index < len(user_playlists):
+            selected_playlist_id = user_playlists[selected_playlist_index]['id']
+            try:
+                return self.playlist_df(playlist_id=selected_playlist_id, scale=scale, to_csv=to_csv, dropna=dropna, parse_date=parse_date, date_precision=date_precision, sync=sync, format=format)
+            except Exception as e:
+                print(e)
+                print("-------------------------------")
+                print("This playlist can't be retrieved")
+
+        elif selected_playlist_index == len(user_playlists):
+            fetch = functools.partial(self.__playlist_tracks, sync=sync)
+
+            # map() keeps playlist order, so the merged frame does not depend on completion order.
+            with ThreadPoolExecutor(max_workers=max_workers or self.max_workers) as executor:
+                playlists = [playlist for playlist in executor.map(fetch, [playlist['id'] for playlist in user_playlists])
+                             if playlist is not None]
+
+            # Tracks shared by several playlists are enriched once.
+            details = self.__track_details([track for playlist in playlists if playlist['df'] is None
+                                            for track in playlist['tracks']])
+
+            df_main = _merge_playlists(self.store, playlists, details)
+            unscaled = _clean_tracks_df(df_main, dropna=dropna, parse_date=parse_date, date_precision=date_precision, observer=self.observer)
+            df_main = _scale_tracks(unscaled, _resolve_scaler(scale, self.scalers), observer=self.observer)
+            
+            if to_csv:
+                _export_tracks(self, df_main, f"{self.user}'s_all_playlists", 'playlists', format, unscaled=unscaled)
+                self.playlistdf = df_main
+            return df_main
+        else:
+            print("Invalid playlist number. Please choose a valid playlist.")
+
+
+    def __user_playlists(self, username=None):
+        """Retrieve every playlist of a user, following pagination.
+
+        Parameters
+        ----------
+        username : str, optional
+            Spotify username. Defaults to the current user.
+
+        Returns
+        -------
+        list
+            Simplified playlist objects.
+        """
+        if username:
+            fetch = functools.partial(self.sp.user_playlists, username)
+        else:
+            fetch = self.sp.current_user_playlists
+
+        return paginate(fetch, limit=50, max_workers=self.page_workers, observer=self.observer)
+
+    def get_top_tracks(self, scale=False, dropna=True, to_csv=False, parse_date=True, date_precision=False, format='csv', time_range=None):
+        """Retrieve audio features of a user's top tracks.
+
+            Parameters
+            ----------
+            scale : bool, int, str, list or AudioFeatureScaler, default=False
+                Whether and how to scale the audio features. True uses the first
+                of ``scalers``; an index or a name (see ``SCALERS``), or a list of
+                them, picks the scalers. A fitted AudioFeatureScaler is reused
+                without refitting.
+            dropna : bool, default=True
+                Whether to drop null values.
+            to_csv : bool, default=False
+                Whether to save the DataFrame to a CSV file. With ``time_range``,
+                one file is written per range.
+            format : {'csv', 'parquet', 'feather'}, default='csv'
+                File format used with ``to_csv``. Parquet and Feather keep compact
+                dtypes (see ``compact_dtypes``) and require pyarrow.
+            parse_date : bool, default=True
+                Whether to parse dates.
+            date_precision : bool, default=False
+                Whether to add a ``release_date_precision`` column ("year",
+                "month" or "day").
+            time_range : str or list of str, optional
+                Ranking period: "short_term", "medium_term", "long_term", a list
+                of them, or "all". The rankings are fetched concurrently and the
+                tracks they share are enriched once. By default the API's default
+                ranking is returned without ``time_range`` and ``rank`` columns.
+
+            Returns
+            -------
+            DataFrame
+                DataFrame of user's top tracks data. With ``time_range``, one row
+                per track and range, with ``time_range`` and ``rank`` columns.
+
+            Examples
+            --------
+            >>> spa.get_top_tracks(scale=True, to_csv=True)
+            >>> spa.get_top_tracks(time_range="all", to_csv=True)
+            """
+        if time_range is not None:
+            return self.__ranked_top_tracks(_time_ranges(time_range), scale, dropna, to_csv, parse_date, date_precision, format)
+
+        top_tracks = paginate(self.sp.current_user_top_tracks, limit=50, max_workers=self.page_workers, project=TrackRecord.from_track,
+                              observer=self.observer)
+        details = self.__track_details(top_tracks)
+
+        unscaled = _clean_tracks_df(_tracks_frame(top_tracks, details), dropna=dropna, parse_date=parse_date, date_precision=date_precision, observer=self.observer)
+        df = _scale_tracks(unscaled, _resolve_scaler(scale, self.scalers), observer=self.observer)
+        if to_csv:
+            _export_tracks(self, df, f"{self.user}'s_top_tracks", 'top_tracks', format, unscaled=unscaled)
+            self.toptracks_df = df
+        return df
+
+    def __ranked_top_tracks(self, ranges, scale, dropna, to_csv, parse_date, date_precision, format):
+        """Retrieve the top tracks of several time ranges as one long-format frame. See ``get_top_tracks``."""
+        def fetch(time_range):
+            return paginate(functools.partial(self.sp.current_user_top_tracks, time_range=time_range), limit=50,
+                            max_workers=self.page_workers, project=TrackRecord.from_track, observer=self.observer)
+
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            rankings = dict(zip(ranges, executor.map(fetch, ranges)))
+        # The rankings mostly overlap, so their union is enriched in one go.
+        details = self.__track_details([track for tracks in rankings.values() for track in tracks])
+
+        unscaled = _clean_tracks_df(_ranked_frame(rankings, details), dropna=dropna, parse_date=parse_date, date_precision=date_precision, observer=self.observer)
+        df = _scale_tracks(unscaled, _resolve_scaler(scale, self.scalers), observer=self.observer)
+        if to_csv:
+            _export_ranked(self, df, ranges, format, unscaled=unscaled)
+            self.toptracks_df = df
+        return df
+
+    def get_user_episodes(self, to_csv=False, format='csv', incremental=True):
+        """Retrieve episodes saved by the current user from Spotify.
+
+        The whole library is paged through, 50 episodes at a time. When an
+        earlier export exists, pages are only requested until the newest
+        episode it holds, and just the episodes saved since then are fetched
+        and appended to it.
+
+        Parameters
+        ----------
+        to_csv : bool, default=False
+            Whether to save the DataFrame to a CSV file.
+        format : {'csv', 'parquet', 'feather'}, default='csv'
+            File format used with ``to_csv``. Parquet and Feather keep compact
+            dtypes (see ``compact_dtypes``) and require pyarrow.
+        incremental : bool, default=True
+            Whether to extend the existing export of ``to_csv`` instead of
+            fetching the whole library again. CSV files are appended to,
+            Parquet and Feather files are rewritten.
+
+        Returns
+        -------
+        DataFrame
+            DataFrame containing information about saved episodes, one row per
+            episode with the ``added_at`` time it was saved. Episodes of an
+            earlier export come first, followed by the new ones.
+
+        Examples
+        --------
+        >>> spa.get_user_episodes(to_csv=True)
+        """
+        path = _output_path(self.spreadsheets_dir, f"{self.user}'s_saved_episodes", format)
+        exported = _exported_episodes(path) if to_csv and incremental else None
+
+        if exported is None:
+            rows = paginate(self.sp.current_user_saved_episodes, limit=50, max_workers=self.page_workers,
+                            project=_episode_row, observer=self.observer)
+        else:
+            rows = []
+            # Closing the stream on an early break ends its pagination stage right away.
+            with contextlib.closing(iter_pages(self.sp.current_user_saved_episodes, limit=50, project=_episode_row,
+                                               observer=self.observer)) as pages:
+                for page in pages:
+                    new, done = _new_episodes(page, exported)
+                    rows.extend(new)
+                    if done:
+                        break
+
+        new_df, eps_df = _episodes_frame(rows, exported)
+
+        if to_csv:
+            _write_episodes(eps_df, new_df, exported, path, format, self.summaries, self.observer)
+
+        self.epsdf = eps_df
+        return eps_df
+
+    def iter_playlist_chunks(self, playlist_id=None, url=None, chunk_size=1000, scale=False, dropna=True, parse_date=True,
+                             date_precision=False):
+        """Retrieve a playlist as a stream of fully enriched DataFrame chunks.
+
+        Pages are requested one after the other and every chunk is enriched
+        (genres, audio features, dates) and yielded as soon as its tracks have
+        arrived, so memory stays flat however large the playlist is.
+
+        Parameters
+        ----------
+        playlist_id : str, optional
+            Playlist ID.
+        url : str, optional
+            URL of the playlist.
+        chunk_size : int, default=1000
+            Number of tracks per chunk.
+        scale : bool, int, str, list or AudioFeatureScaler, default=False
+            Whether and how to scale the audio features. Unless an already
+            fitted AudioFeatureScaler is given, the scaler is fitted on the
+            first non-empty chunk and reused for the following ones.
+        dropna : bool, default=True
+            Whether to drop null values.
+        parse_date : bool, default=True
+            Whether to parse dates.
+        date_precision : bool, default=False
+            Whether to add a ``release_date_precision`` column.
+
+        Yields
+        ------
+        DataFrame
+            Chunk of the playlist with the same columns as ``playlist_df``.
+
+        Examples
+        --------
+        >>> for chunk in spa.iter_playlist_chunks(playlist_id='your_playlist_id', chunk_size=500):
+        >>>     process(chunk)
+        >>> write_chunks(spa.iter_playlist_chunks(playlist_id='your_playlist_id'), "playlist.csv")
+        """
+        if url:
+            playlist_id = urlparse(url).path.split('/')[2]
+
+        playlist_info = self.sp.playlist(playlist_id, fields='name,snapshot_id')
+        track_ids = []
+
+        pages = iter_pages(functools.partial(self.sp.playlist_tracks, playlist_id), limit=100, project=TrackRecord.from_item,
+                           observer=self.observer)
+        yield from self.__enriched_chunks(pages, chunk_size, playlist_info['name'], scale, dropna, parse_date,
+                                          date_precision, track_ids=track_ids)
+
+        if self.store is not None:
+            self.store.put_playlist(playlist_id, playlist_info['name'], playlist_info.get('snapshot_id'), track_ids)
+
+    def __enriched_chunks(self, pages, chunk_size, playlist, scale, dropna, parse_date, date_precision, track_ids=None):
+        """Regroup pages of TrackRecords into chunks of ``chunk_size`` and yield every chunk fully enriched.
+
+        The scaler is resolved once, so unless it was already fitted it is
+        fitted on the first chunk with complete features and reused for the
+        following ones. The IDs
+        of the yielded tracks are appended to ``track_ids`` when given. Every
+        enrichment stage is reported once, with a step per chunk.
+        """
+        scaler = _resolve_scaler(scale, self.scalers)
+        observer = _StreamObserver(self.observer, ('store', 'genres', 'audio_features', 'dates', 'scaling'))
+        tracks = []
+
+        def enrich(tracks):
+            if track_ids is not None:
+                track_ids.extend(track.id for track in tracks)
+            df = _tracks_frame(tracks, self.__track_details(tracks, observer=observer), playlist=playlist)
+            return _clean_tracks_df(df, dropna=dropna, parse_date=parse_date, date_precision=date_precision, scaler=scaler, observer=observer)
+
+        try:
+            for records in pages:
+                tracks.extend(records)
+                while len(tracks) >= chunk_size:
+                    chunk, tracks = tracks[:chunk_size], tracks[chunk_size:]
+                    yield enrich(chunk)
+
+            if tracks:
+                yield enrich(tracks)
+        finally:
+            observer.close()
+
+    def saved_tracks_df(self, scale=False, dropna=True, to_csv=False, parse_date=True, date_precision=False, format='csv'):
+        """Retrieve audio features of the current user's saved tracks (Liked Songs).
+
+        The library is paged through 50 tracks at a time with the pages
+        fetched concurrently, and the tracks go through the same enrichment
+        as ``playlist_df``. For very large libraries, ``iter_saved_track_chunks``
+        keeps memory flat.
+
+        Parameters
+        ----------
+        scale : bool, int, str, list or AudioFeatureScaler, default=False
+            Whether and how to scale the audio features. True uses the first
+            of ``scalers``; an index or a name (see ``SCALERS``), or a list of
+            them, picks the scalers. A fitted AudioFeatureScaler is reused
+            without refitting.
+        dropna : bool, default=True
+            Whether to drop null values.
+        to_csv : bool, default=False
+            Whether to save the DataFrame to a CSV file.
+        format : {'csv', 'parquet', 'feather'}, default='csv'
+            File format used with ``to_csv``. Parquet and Feather keep compact
+            dtypes (see ``compact_dtypes``) and require pyarrow.
+        parse_date : bool, default=True
+            Whether to parse dates.
+        date_precision : bool, default=False
+            Whether to add a ``release_date_precision`` column ("year",
+            "month" or "day").
+
+        Returns
+        -------
+        DataFrame
+            DataFrame of the saved tracks with the same columns as
+            ``playlist_df``, the ``playlist`` column reading "Liked Songs".
+
+        Examples
+        --------
+        >>> spa.saved_tracks_df(to_csv=True, format="parquet")
+        """
+        tracks = paginate(self.sp.current_user_saved_tracks, limit=50, max_workers=self.page_workers,
+                          project=TrackRecord.from_item, observer=self.observer)
+        df = _tracks_frame(tracks, self.__track_details(tracks), playlist=LIKED_SONGS)
+        unscaled = _clean_tracks_df(df, dropna=dropna, parse_date=parse_date, date_precision=date_precision, observer=self.observer)
+        df = _scale_tracks(unscaled, _resolve_scaler(scale, self.scalers), observer=self.observer)
+
+        if to_csv:
+            _export_tracks(self, df, f"{self.user}'s_saved_tracks", 'saved_tracks', format, unscaled=unscaled)
+            self.savedtracks_df = df
+        return df
+
+    def iter_saved_track_chunks(self, chunk_size=1000, scale=False, dropna=True, parse_date=True, date_precision=False):
+        """Retrieve the current user's saved tracks as a stream of fully enriched DataFrame chunks.
+
+        Up to ``page_workers`` pages are requested ahead concurrently, and
+        every chunk is enriched and yielded as soon as its tracks have arrived,
+        so memory stays bounded whatever the size of the library.
+
+        Parameters
+        ----------
+        chunk_size : int, default=1000
+            Number of tracks per chunk.
+        scale : bool, int, str, list or AudioFeatureScaler, default=False
+            Whether and how to scale the audio features. Unless an already
+            fitted AudioFeatureScaler is given, the scaler is fitted on the
+            first non-empty chunk and reused for the following ones.
+        dropna : bool, default=True
+            Whether to drop null values.
+        parse_date : bool, default=True
+            Whether to parse dates.
+        date_precision : bool, default=False
+            Whether to add a ``release_date_precision`` column.
+
+        Yields
+        ------
+        DataFrame
+            Chunk of the library with the same columns as ``saved_tracks_df``.
+
+        Examples
+        --------
+        >>> write_chunks(spa.iter_saved_track_chunks(), "liked_songs.parquet")
+        """
+        pages = iter_pages(self.sp.current_user_saved_tracks, limit=50, project=TrackRecord.from_item,
+                           observer=self.observer, max_workers=self.page_workers)
+        yield from self.__enriched_chunks(pages, chunk_size, LIKED_SONGS, scale, dropna, parse_date, date_precision)
+
+    def __playlist_tracks(self, playlist_id, sync=False):
+        """Retrieve the name, snapshot and track objects of a playlist.
+
+        Parameters
+        ----------
+        playlist_id : str
+            Playlist ID.
+        sync : bool, default=False
+            Whether to rebuild the playlist from the store if its snapshot has
+            not changed since the last fetch.
+
+        Returns
+        -------
+        dict or None
+            Dict with the playlist ``id``, ``name`` and ``snapshot_id``, and
+            either the ``tracks`` of the playlist or, when the snapshot is
+            unchanged, the stored ``df``. None if the playlist can't be retrieved.
+        """
+        try:
+            playlist = _playlist_entry(self.store, playlist_id, self.sp.playlist(playlist_id, fields='name,snapshot_id'), sync)
+            if playlist['df'] is None:
+                playlist['tracks'] = paginate(functools.partial(self.sp.playlist_tracks, playlist_id), limit=100,
+                                              max_workers=self.page_workers, project=TrackRecord.from_item, observer=self.observer)
+            return playlist
+
+        except Exception as e:
+            _playlist_error(e)
+            return None
+
+    def __track_details(self, tracks, observer=None):
+        """Return the genre and audio features of tracks, fetching only those missing from the store.
+
+        Parameters
+        ----------
+        tracks : list of TrackRecord
+            Projected tracks.
+        observer : Observer, optional
+            Receiver of the stages. Defaults to the instance's ``observer``.
+
+        Returns
+        -------
+        DataFrame
+            The ``TrackStore.columns`` of the tracks, indexed by track ID, with
+            NaN audio features where the API has none.
+        """
+        observer = observer if observer is not None else self.observer
+        details, new_tracks = _stored_details(self.store, tracks, observer)
+        if not new_tracks:
+            return details
+
+        genres = self.genre_resolver.resolve(
+            self.sp, [track.artist_ids for track in new_tracks], observer=observer
+        )
+
+        new_ids = [track.id for track in new_tracks]
+        batches = _batches(new_ids, AUDIO_FEATURES_BATCH_SIZE)
+
+        features = []
+        with _stage(observer, 'audio_features', total=len(batches)) as counts:
+            for batch in batches:
+                features.extend(self.sp.audio_features(batch))
+                observer.advance('audio_features')
+            counts['items'] = len(new_ids)
+
+        return _fetched_details(self.store, details, new_tracks, genres, features)
+
+    def playlist_df(self, playlist_id=None, url=None, scale=False, dropna=True, to_csv=False, parse_date = True, date_precision=False, sync=False, format='csv'):
+        """Retrieve audio features of tracks in a playlist.
+
+        Parameters
+        ----------
+        playlist_id : str, optional
+            Playlist ID.
+        url : str, optional
+            URL of the playlist.
+        scale : bool, int, str, list or AudioFeatureScaler, default=False
+            Whether and how to scale the audio features. True uses the first
+            of ``scalers``; an index or a name (see ``SCALERS``), or a list of
+            them, picks the scalers. A fitted AudioFeatureScaler is reused
+            without refitting.
+        dropna : bool, default=True
+            Whether to drop null values.
+        to_csv : bool, default=False
+            Whether to save the DataFrame to a CSV file.
+        format : {'csv', 'parquet', 'feather'}, default='csv'
+            File format used with ``to_csv``. Parquet and Feather keep compact
+            dtypes (see ``compact_dtypes``) and require pyarrow.
+        parse_date : bool, default=True
+            Whether to parse dates.
+        date_precision : bool, default=False
+            Whether to add a ``release_date_precision`` column ("year",
+            "month" or "day").
+        sync : bool, default=False
+            Whether to compare the playlist's ``snapshot_id`` with the one
+            recorded on the last fetch. If it has not changed, the tracks are
+            rebuilt from the store without paging through the playlist. If it
+            has, only the added tracks are fetched. Requires the track store.
+
+        Returns
+        -------
+        DataFrame
+            DataFrame containing audio features of tracks in the playlist.
+
+        Examples
+        --------
+        >>> spa.playlist_df(playlist_id='your_playlist_id', scale=True, to_csv=True)
+        >>> spa.playlist_df(playlist_id='your_playlist_id', sync=True)
+        """
+        if url:
+            playlist_id = urlparse(url).path.split('/')[2]
+
+        playlist = self.__playlist_tracks(playlist_id, sync=sync)
+        if playlist is None:
+            return None
+        playlist_name = playlist['name']
+
+        if playlist['df'] is not None:
+            df = playlist['df']
+        else:
+            tracks = playlist['tracks']
+            self.track_names = [track.name for track in tracks]
+            self.track_artists_ids = [track.artist_ids[0] for track in tracks]
+            self.track_artists = [track.artist for track in tracks]
+
+            df = _tracks_frame(tracks, self.__track_details(tracks), playlist=playlist_name)
+            _record_playlist(self.store, playlist)
+
+        unscaled = _clean_tracks_df(df, dropna=dropna, parse_date=parse_date, date_precision=date_precision, observer=self.observer)
+        df = _scale_tracks(unscaled, _resolve_scaler(scale, self.scalers), observer=self.observer)
+        if to_csv:
+            _export_tracks(self, df, f"{playlist_name}_playlist", 'playlists', format, unscaled=unscaled)
+            self.playlistdf = df
+        return df
+
+# Tokens are refreshed this many seconds before they expire, like spotipy does.
+TOKEN_REFRESH_MARGIN = 60
+# Lifetime of Spotify access tokens, assumed when the auth manager keeps no token cache.
+TOKEN_LIFETIME = 3600
+
+def _access_token(auth):
+    """Return the access token of an auth manager and the time it expires at.
+
+    The expiry is read from the auth manager's token cache. Blocking: the auth
+    manager may refresh the token over the network.
+    """
+    token = auth.get_access_token(as_dict=False)
+    cache_handler = getattr(auth, 'cache_handler', None)
+    token_info = cache_handler.get_cached_token() if cache_handler is not None else None
+    if token_info and token_info.get('access_token') == token and token_info.get('expires_at'):
+        return token, token_info['expires_at']
+    return token, time.time() + TOKEN_LIFETIME
+
+class AsyncTuneInsight:
+    """
+    AsyncTuneInsight is the asyncio counterpart of TuneInsight.
+
+    Requests go through a pooled ``httpx.AsyncClient`` that keeps connections
+    alive, with at most ``max_concurrency`` requests in flight. Pages, artist
+    batches and audio-feature batches are requested concurrently, and the
+    DataFrames have the same schema as the ones built by TuneInsight.
+    Throttled and failed requests are retried on their own, honouring
+    ``Retry-After`` like SpotifyTransport does for the blocking client.
+
+    Attributes:
+        user (str): The username of the Spotify account.
+        auth (str or object): Access token, or an auth manager with a ``get_access_token`` method.
+        spreadsheets_dir (str): Directory where CSV files are written.
+        max_concurrency (int): Maximum number of requests in flight.
+        max_retries (int): Maximum number of retries of a throttled or failed request.
+        scalers (list): Scalers picked by index with ``scale``, as names (see ``SCALERS``) or scikit-learn scaler objects.
+        genre_resolver (GenreResolver): Cache of artist genres.
+        store (TrackStore): On-disk store of already extracted tracks, None when disabled.
+        summaries (SummaryTables): Dashboard summaries updated by every export, None when disabled.
+        observer (Observer): Receiver of stage and request events, silent by default.
+    """
+
+    api_base = "https://api.spotify.com/v1/"
+
+    def __init__(self, user, auth, spreadsheets_dir=None, max_concurrency=16, genre_resolver=None, store=None,
+                 api_base=None, timeout=10, max_retries=5, observer=None, summaries=None):
+        """Initialize AsyncTuneInsight.
+
+        Parameters
+        ----------
+        user : str
+            The username of the Spotify account.
+        auth : str or object
+            Access token, or an auth manager (for example ``SpotifyOAuth``).
+            The token of an auth manager is kept until shortly before it
+            expires and refreshed in a worker thread, once for all requests.
+        spreadsheets_dir : str, optional
+            Directory where CSV files are written. Defaults to ``Spreadsheets``
+            in the current directory.
+        max_concurrency : int, default=16
+            Maximum number of requests in flight, which is also the size of the
+            connection pool.
+        genre_resolver : GenreResolver, optional
+            Genre cache to use, for example the one of a TuneInsight instance.
+        store : TrackStore, optional
+            Track store to read from and write to. No store is used by default.
+        api_base : str, optional
+            Base URL of the Web API.
+        timeout : float, default=10
+            Request timeout in seconds.
+        max_retries : int, default=5
+            Maximum number of retries of a throttled or failed request.
+        observer : Observer, optional
+            Receives the stage and request events. Silent by default.
+        summaries : SummaryTables, optional
+            Dashboard summaries updated by every file written with ``to_csv``.
+            None by default.
+
+        Returns
+        -------
+        None
+
+        Examples
+        --------
+        >>> ati = AsyncTuneInsight(user="yourname", auth=spa.token)
+        >>> df = await ati.playlist_df(playlist_id='your_playlist_id')
+        """
+        self.user = user
+        self.auth = auth
+        self.spreadsheets_dir = spreadsheets_dir or os.path.join(os.getcwd(), "Spreadsheets")
+        if not os.path.exists(self.spreadsheets_dir):
+            os.makedirs(self.spreadsheets_dir)
+        self.max_concurrency = max_concurrency
+        self.scalers = list(SCALERS)
+        self.genre_resolver = genre_resolver if genre_resolver is not None else GenreResolver()
+        self.store = store
+        self.api_base = api_base or self.api_base
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.observer = observer if observer is not None else Observer()
+        self.summaries = summaries
+        self._client = None
+        self._semaphore = None
+        self._token_lock = None
+        self._token = None
+        self._token_expires_at = 0.0
+
+    @classmethod
+    def from_sync(cls, ti, **kwargs):
+        """Create an AsyncTuneInsight sharing the auth manager, genre cache, store and summaries of a TuneInsight.
+
+        Parameters
+        ----------
+        ti : TuneInsight
+            Authenticated TuneInsight instance.
+        **kwargs
+            Passed to ``AsyncTuneInsight``.
+
+        Returns
+        -------
+        AsyncTuneInsight
+
+        Examples
+        --------
+        >>> ati = AsyncTuneInsight.from_sync(spa, max_concurrency=32)
         """
+        kwargs.setdefault('spreadsheets_dir', ti.spreadsheets_dir)
+        kwargs.setdefault('genre_resolver', ti.genre_resolver)
+        kwargs.setdefault('store', ti.store)
+        kwargs.setdefault('observer', ti.observer)
+        kwargs.setdefault('summaries', ti.summaries)
+        return cls(ti.user, ti.auth_manager if ti.auth_manager is not None else ti.token, **kwargs)
 
-        query_components = parse_qs(urlparse(self.path).query)
+    async def __aenter__(self):
+        return self
 
-        authorization_code = query_components.get('code', [None])[0]
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
 
-        self.send_response(200)
-        self.send_header('Content-type', 'text/plain')
-        self.end_headers()
+    async def aclose(self):
+        """Close the connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
-        self.wfile.write(b'Authorization successful. You can close this window now.')
+    def __token_expired(self):
+        return self._token is None or time.time() >= self._token_expires_at - TOKEN_REFRESH_MARGIN
 
-        self.server.authorization_code = authorization_code
+    async def __token(self):
+        """Return the access token, refreshing it in a worker thread shortly before it expires."""
+        if isinstance(self.auth, str):
+            return self.auth
+        if self.__token_expired():
+            async with self._token_lock:
+                # Requests waiting on the lock find the token another one just refreshed.
+                if self.__token_expired():
+                    self._token, self._token_expires_at = await asyncio.to_thread(_access_token, self.auth)
+        return self._token
 
-class TuneInsight:
-    """
-    TuneInsight class provides methods to analyze Spotify playlists and extract audio features of tracks.
+    async def _get(self, path, **params):
+        """Send a GET request to the Web API and return the decoded JSON body.
 
-    Attributes:
-        client_id (str): Client ID for accessing Spotify API.
-        client_secret (str): Client secret for accessing Spotify API.
-        redirect_uri (str): Redirect URI for authentication.
-        token (str): Access token for Spotify API authentication.
-        scalers (list): List of scaler objects for feature scaling.
-    """
+        Parameters
+        ----------
+        path : str
+            Endpoint path relative to ``api_base``.
+        **params
+            Query parameters.
 
-    def __init__(self, user : str, client_id, client_secret : str):
-        """Initialize TuneInsight.
+        Returns
+        -------
+        dict
+            Decoded response.
+        """
+        import httpx
 
-        Initializes TuneInsight with necessary attributes and obtains access token.
+        if self._client is None:
+            limits = httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency)
+            self._client = httpx.AsyncClient(base_url=self.api_base, limits=limits, timeout=self.timeout)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._token_lock = asyncio.Lock()
+
+        started = time.perf_counter()
+        received = throttled = 0
+        failed = True
+        try:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    headers = {'Authorization': f"Bearer {await self.__token()}"}
+                    async with self._semaphore:
+                        response = await self._client.get(path, params=params, headers=headers)
+                except httpx.TransportError:
+                    if attempt == self.max_retries:
+                        raise
+                    await asyncio.sleep(_retry_delay(attempt, None, 0.5, 60))
+                    continue
+
+                received += len(response.content)
+                if response.status_code == 401 and not isinstance(self.auth, str) and attempt < self.max_retries:
+                    # The token was revoked or expired early: fetch a new one and try again.
+                    self._token = None
+                    continue
+                if response.status_code not in SpotifyTransport.retry_statuses or attempt == self.max_retries:
+                    response.raise_for_status()
+                    result = response.json()
+                    failed = False
+                    return result
+                throttled += response.status_code == 429
+                await asyncio.sleep(_retry_delay(attempt, response.headers.get('Retry-After'), 0.5, 60))
+        finally:
+            self.observer.request(path, time.perf_counter() - started, bytes=received, retries=attempt,
+                                  throttled=throttled, failed=failed)
+
+    async def _paginate(self, path, limit, project=None, **params):
+        """Retrieve every item of a paged endpoint, fetching the pages after the first concurrently.
 
         Parameters
         ----------
-        user : str
-            The username of the Spotify account.
-        client_id : str
-            Client ID for accessing Spotify API.
-        client_secret : str
-            Client secret for accessing Spotify API.
+        path : str
+            Endpoint path relative to ``api_base``.
+        limit : int
+            Number of items per page.
+        project : callable, optional
+            Applied to every item of a page as soon as the page arrives.
+        **params
+            Extra query parameters.
 
         Returns
         -------
-        None
+        list
+            Items of every page, projected if ``project`` is given, in order.
+        """
+        async def get(offset):
+            page = await self._get(path, limit=limit, offset=offset, **params)
+            if project is not None:
+                page['items'] = [project(item) for item in page['items']]
+            self.observer.advance('pagination')
+            return page
 
-        Examples
-        --------
-        >>> ti = TuneInsight(
-        >>>     user="yourname",
-        >>>     client_id=client_id,
-        >>>     client_secret=client_secret
-        >>> )
+        with _stage(self.observer, 'pagination') as counts:
+            page = await get(0)
+            items = list(page['items'])
+            offsets = _remaining_offsets(page, limit)
+            offset = limit * (len(offsets) + 1)
+
+            if offsets:
+                for page in await asyncio.gather(*[get(offset) for offset in offsets]):
+                    items.extend(page['items'])
+
+            # Follow any items added after the total was reported.
+            while page['next'] is not None:
+                page = await get(offset)
+                items.extend(page['items'])
+                offset += limit
+
+            counts['items'] = len(items)
+        return items
+
+    async def _iter_pages(self, path, limit, project=None, **params):
+        """Yield the pages of a paged endpoint one after the other, following ``next``. See ``iter_pages``.
+
+        Parameters
+        ----------
+        path : str
+            Endpoint path relative to ``api_base``.
+        limit : int
+            Number of items per page.
+        project : callable, optional
+            Applied to every item of a page.
+        **params
+            Extra query parameters.
+
+        Yields
+        ------
+        list
+            Items of a page, projected if ``project`` is given.
         """
-        self.user = user
-        self.client_id = client_id
-        self.client_secret = client_secret
-        self.redirect_uri = "http://localhost:8888/callback"
-        self.token = None
-        self.scalers = [
-            StandardScaler(), MinMaxScaler(), MaxAbsScaler(),
-            RobustScaler(), QuantileTransformer(), Normalizer()
-        ]
-        self.sp = None  
+        with _stage(self.observer, 'pagination') as counts:
+            counts['items'] = offset = 0
+            while True:
+                page = await self._get(path, limit=limit, offset=offset, **params)
+                items = page['items'] if project is None else [project(item) for item in page['items']]
+                self.observer.advance('pagination')
+                counts['items'] += len(items)
+                yield items
+                if page['next'] is None:
+                    break
+                offset += limit
 
-        os.chdir("../")
-        self.project_dir = os.getcwd()
-        self.spreadsheets_dir = os.path.join(self.project_dir, "Spreadsheets")
-        if not os.path.exists(self.spreadsheets_dir):
-            os.makedirs(self.spreadsheets_dir)
+    async def _track_details(self, tracks):
+        """Return the genre and audio features of tracks, fetching only those missing from the store.
+
+        Artist batches and audio-feature batches are requested concurrently.
+
+        Parameters
+        ----------
+        tracks : list of TrackRecord
+            Projected tracks.
+
+        Returns
+        -------
+        DataFrame
+            The ``TrackStore.columns`` of the tracks, indexed by track ID.
+        """
+        details, new_tracks = _stored_details(self.store, tracks, self.observer)
+        if not new_tracks:
+            return details
 
-        sp_oauth = SpotifyOAuth(
-            client_id=self.client_id,
-            client_secret=self.client_secret,
-            redirect_uri=self.redirect_uri,
-            scope=[
-                "user-follow-read", "user-follow-modify", "user-library-read",
-                "user-top-read", "playlist-read-private", "playlist-read-collaborative"
-            ]
+        known, artist_batches = self.genre_resolver.lookup(track.artist_ids for track in new_tracks)
+        new_ids = [track.id for track in new_tracks]
+
+        artists, features = await asyncio.gather(
+            self.__batched('genres', "artists", 'artists', artist_batches,
+                           hits=len(known), misses=sum(map(len, artist_batches))),
+            self.__batched('audio_features', "audio-features", 'audio_features',
+                           _batches(new_ids, AUDIO_FEATURES_BATCH_SIZE), items=len(new_ids))
         )
+        known.update(self.genre_resolver.update(artists))
 
-        auth_url = sp_oauth.get_authorize_url()
+        genres = [self.genre_resolver.track_genre(track.artist_ids, known) for track in new_tracks]
+        return _fetched_details(self.store, details, new_tracks, genres, features)
 
-        server_address = ('', 8888)
-        httpd = HTTPServer(server_address, RedirectHandler)
+    async def __batched(self, stage, path, key, batches, **counts):
+        """Request ID batches of an endpoint concurrently as one stage and return the ``key`` objects of every response."""
+        async def get(batch):
+            response = await self._get(path, ids=','.join(batch))
+            self.observer.advance(stage)
+            return response[key]
+
+        with _stage(self.observer, stage, total=len(batches)) as stage_counts:
+            responses = await asyncio.gather(*[get(batch) for batch in batches])
+            stage_counts.update(counts)
+        return [item for response in responses for item in response]
+
+    async def _playlist_tracks(self, playlist_id, sync=False):
+        """Retrieve the name, snapshot and track objects of a playlist.
+
+        Parameters
+        ----------
+        playlist_id : str
+            Playlist ID.
+        sync : bool, default=False
+            Whether to rebuild the playlist from the store if its snapshot has
+            not changed since the last fetch.
 
+        Returns
+        -------
+        dict or None
+            Dict with the playlist ``id``, ``name``, ``snapshot_id`` and either
+            its ``tracks`` or the stored ``df``. None if the playlist can't be retrieved.
+        """
         try:
+            playlist = _playlist_entry(self.store, playlist_id, await self._get(f"playlists/{playlist_id}", fields='name,snapshot_id'), sync)
+            if playlist['df'] is None:
+                playlist['tracks'] = await self._paginate(f"playlists/{playlist_id}/tracks", limit=100, project=TrackRecord.from_item)
+            return playlist
 
-            webbrowser.open(auth_url)
+        except Exception as e:
+            _playlist_error(e)
+            return None
 
-            httpd.handle_request()
+    async def playlist_df(self, playlist_id=None, url=None, scale=False, dropna=True, to_csv=False, parse_date=True, date_precision=False, sync=False, format='csv'):
+        """Retrieve audio features of tracks in a playlist.
 
-            authorization_code = httpd.authorization_code
+        Parameters
+        ----------
+        playlist_id : str, optional
+            Playlist ID.
+        url : str, optional
+            URL of the playlist.
+        scale : bool, int, str, list or AudioFeatureScaler, default=False
+            Whether and how to scale the audio features. True uses the first
+            of ``scalers``; an index or a name (see ``SCALERS``), or a list of
+            them, picks the scalers. A fitted AudioFeatureScaler is reused
+            without refitting.
+        dropna : bool, default=True
+            Whether to drop null values.
+        to_csv : bool, default=False
+            Whether to save the DataFrame to a CSV file.
+        format : {'csv', 'parquet', 'feather'}, default='csv'
+            File format used with ``to_csv``. Parquet and Feather keep compact
+            dtypes (see ``compact_dtypes``) and require pyarrow.
+        parse_date : bool, default=True
+            Whether to parse dates.
+        date_precision : bool, default=False
+            Whether to add a ``release_date_precision`` column ("year",
+            "month" or "day").
+        sync : bool, default=False
+            Whether to reuse the stored tracks if the playlist's snapshot has
+            not changed. Requires a store.
 
-            token_info = sp_oauth.get_access_token(authorization_code)
+        Returns
+        -------
+        DataFrame
+            DataFrame containing audio features of tracks in the playlist.
 
-            self.token = token_info['access_token']
+        Examples
+        --------
+        >>> await ati.playlist_df(playlist_id='your_playlist_id', to_csv=True)
+        """
+        if url:
+            playlist_id = urlparse(url).path.split('/')[2]
 
-            if self.token:
-                print("Authentication successful.")
-                self.sp = spotipy.Spotify(auth=self.token)
-            else:
-                print("Failed to authenticate. Please check your credentials and try again.")
+        playlist = await self._playlist_tracks(playlist_id, sync=sync)
+        if playlist is None:
+            return None
 
-        except Exception as e:
-            print("Error during authentication:", e)
+        if playlist['df'] is not None:
+            df = playlist['df']
+        else:
+            details = await self._track_details(playlist['tracks'])
+            df = _tracks_frame(playlist['tracks'], details, playlist=playlist['name'])
+            _record_playlist(self.store, playlist)
 
-        finally:
-            httpd.server_close()
+        unscaled = _clean_tracks_df(df, dropna=dropna, parse_date=parse_date, date_precision=date_precision, observer=self.observer)
+        df = _scale_tracks(unscaled, _resolve_scaler(scale, self.scalers), observer=self.observer)
+        if to_csv:
+            _export_tracks(self, df, f"{playlist['name']}_playlist", 'playlists', format, unscaled=unscaled)
+            self.playlistdf = df
+        return df
 
-    def get_user_playlists(self, scale=False, username=False, to_csv=False, dropna=True, parse_date=True):
+    async def get_user_playlists(self, selection=None, scale=False, username=None, to_csv=False, dropna=True, parse_date=True, date_precision=False, sync=False, format='csv'):
         """Retrieve audio features of tracks in a user's playlists.
 
         Parameters
         ----------
-        scale : bool, default=False
-            Whether to scale the audio features.
-        username : bool, default=False
-            Whether to prompt for a username.
+        selection : int or str, optional
+            Index of the playlist to retrieve, or "All" for every playlist. The
+            user is prompted if not given.
+        scale : bool, int, str, list or AudioFeatureScaler, default=False
+            Whether and how to scale the audio features. True uses the first
+            of ``scalers``; an index or a name (see ``SCALERS``), or a list of
+            them, picks the scalers. A fitted AudioFeatureScaler is reused
+            without refitting.
+        username : str, optional
+            Spotify username or profile URL whose public playlists are listed.
+            Defaults to the current user.
         to_csv : bool, default=False
             Whether to save the DataFrame to a CSV file.
+        format : {'csv', 'parquet', 'feather'}, default='csv'
+            File format used with ``to_csv``. Parquet and Feather keep compact
+            dtypes (see ``compact_dtypes``) and require pyarrow.
         dropna : bool, default=True
             Whether to drop null values.
         parse_date : bool, default=True
             Whether to parse dates.
+        date_precision : bool, default=False
+            Whether to add a ``release_date_precision`` column ("year",
+            "month" or "day").
+        sync : bool, default=False
+            Whether to reuse the stored tracks of unchanged playlists.
 
         Returns
         -------
         DataFrame
-            DataFrame containing audio features of tracks in the playlist.
+            DataFrame containing audio features of tracks in the playlists.
 
         Examples
         --------
-        >>> spa.get_user_playlists(scale=True, to_csv=True)
+        >>> await ati.get_user_playlists(selection="All", to_csv=True)
         """
-        if username:
-            username = urlparse(input("Enter Spotify Profile URL")).path.split('/')[2]
-            user_playlists = self.sp.user_playlists(username)
-        else:    
-            user_playlists = self.sp.current_user_playlists()
-            
+        path = f"users/{_user_id(username)}/playlists" if username else "me/playlists"
+        user_playlists = await self._paginate(path, limit=50)
 
-        dfs = []
+        if selection is None:
+            for i, playlist in enumerate(user_playlists):
+                print(f"{i}. {playlist['name']}")
+            print(f"{len(user_playlists)}. All")
+            selection = await asyncio.to_thread(input, "Enter the number of the playlist you want to retrieve songs from: ")
 
-        for i, playlist in enumerate(user_playlists['items']):
-            print(f"{i}. {playlist['name']}")
-        print(f'{len(user_playlists['items'])}. All')
+        if str(selection).lower() == "all":
+            selection = len(user_playlists)
+        selection = int(selection)
 
-        selected_playlist_index = int(input("Enter the number of the playlist you want to retrieve songs from: "))
+        if 0 <= selection < len(user_playlists):
+            return await self.playlist_df(playlist_id=user_playlists[selection]['id'], scale=scale, to_csv=to_csv,
+                                          dropna=dropna, parse_date=parse_date, date_precision=date_precision, sync=sync,
+                                          format=format)
 
-        clear_output(wait=True)
-        if 0 <= selected_playlist_index < len(user_playlists['items']):
-            selected_playlist_id = user_playlists['items'][selected_playlist_index]['id']
-            try:
-                return self.playlist_df(playlist_id=selected_playlist_id, scale=scale, to_csv=to_csv, dropna=dropna, parse_date=parse_date)
-            except Exception as e:
-                print(e)
-                print("-------------------------------")
-                print("This playlist can't be retrieved")
+        elif selection == len(user_playlists):
+            playlists = await asyncio.gather(*[self._playlist_tracks(playlist['id'], sync=sync) for playlist in user_playlists])
+            playlists = [playlist for playlist in playlists if playlist is not None]
 
-        elif selected_playlist_index == len(user_playlists['items']):
-            for playlist in user_playlists['items']:
-                id = playlist['id']
-                dfs.append(self.playlist_df(playlist_id=id, scale=scale, to_csv=False, dropna=dropna, parse_date=parse_date))
+            details = await self._track_details([track for playlist in playlists if playlist['df'] is None
+                                                 for track in playlist['tracks']])
+
+            df_main = _merge_playlists(self.store, playlists, details)
+            unscaled = _clean_tracks_df(df_main, dropna=dropna, parse_date=parse_date, date_precision=date_precision, observer=self.observer)
+            df_main = _scale_tracks(unscaled, _resolve_scaler(scale, self.scalers), observer=self.observer)
 
-            df_main = pd.concat(dfs,ignore_index=True)
-            df_main.drop_duplicates(subset=['songs'],inplace=True)
-            
             if to_csv:
-                df_main.to_csv(os.path.join(self.spreadsheets_dir, f"{self.user}'s_all_playlists.csv"),index=False)
+                _export_tracks(self, df_main, f"{self.user}'s_all_playlists", 'playlists', format, unscaled=unscaled)
                 self.playlistdf = df_main
             return df_main
         else:
             print("Invalid playlist number. Please choose a valid playlist.")
 
-
-    def get_top_tracks(self, scale=False, dropna=True, to_csv=False, parse_date=True):
+    async def get_top_tracks(self, scale=False, dropna=True, to_csv=False, parse_date=True, date_precision=False, format='csv', time_range=None):
         """Retrieve audio features of a user's top tracks.
 
-            Parameters
-            ----------
-            scale : bool, default=False
-                Whether to scale the audio features.
-            dropna : bool, default=True
-                Whether to drop null values.
-            to_csv : bool, default=False
-                Whether to save the DataFrame to a CSV file.
-            parse_date : bool, default=True
-                Whether to parse dates.
-
-            Returns
-            -------
-            DataFrame
-                DataFrame of user's top tracks data.
-
-            Examples
-            --------
-            >>> spa.get_top_tracks(scale=True, to_csv=True)
-            """
-        top_tracks = []
-        offset = 0
-        limit = 50  # Maximum number of top_tracks per request
-
-        while True:
-            results = self.sp.current_user_top_tracks(offset=offset, limit=limit)
-            top_tracks.extend(results['items'])
-            offset += limit
-
-            if results['next'] is None:
-                break  # No more top_tracks available
-
-        track_ids = [track['id'] for track in top_tracks]
-
-        batch_size = 50
-        batches = [track_ids[i:i + batch_size] for i in range(0, len(track_ids), batch_size)]
+        Parameters
+        ----------
+        scale : bool, int, str, list or AudioFeatureScaler, default=False
+            Whether and how to scale the audio features. True uses the first
+            of ``scalers``; an index or a name (see ``SCALERS``), or a list of
+            them, picks the scalers. A fitted AudioFeatureScaler is reused
+            without refitting.
+        dropna : bool, default=True
+            Whether to drop null values.
+        to_csv : bool, default=False
+            Whether to save the DataFrame to a CSV file.
+        format : {'csv', 'parquet', 'feather'}, default='csv'
+            File format used with ``to_csv``. Parquet and Feather keep compact
+            dtypes (see ``compact_dtypes``) and require pyarrow.
+        parse_date : bool, default=True
+            Whether to parse dates.
+        date_precision : bool, default=False
+            Whether to add a ``release_date_precision`` column ("year",
+            "month" or "day").
+        time_range : str or list of str, optional
+            "short_term", "medium_term", "long_term", a list of them, or
+            "all". See ``TuneInsight.get_top_tracks``.
 
-        name = [track['name'] for track in top_tracks]
-        artist = [track['artists'][0]['name'] for track in top_tracks]
+        Returns
+        -------
+        DataFrame
+            DataFrame of user's top tracks data, with ``time_range`` and
+            ``rank`` columns when ``time_range`` is given.
 
-        artist_ids = [track['artists'][0]['id'] for track in top_tracks]
-        track_genres = []
+        Examples
+        --------
+        >>> await ati.get_top_tracks(to_csv=True)
+        >>> await ati.get_top_tracks(time_range="all")
+        """
+        if time_range is not None:
+            ranges = _time_ranges(time_range)
+            rankings = await asyncio.gather(*[self._paginate("me/top/tracks", limit=50, project=TrackRecord.from_track, time_range=name)
+                                              for name in ranges])
+            rankings = dict(zip(ranges, rankings))
+            details = await self._track_details([track for tracks in rankings.values() for track in tracks])
 
-        for track in tqdm(top_tracks, desc="Fetching Track Genres"):
-            artists = [artist['name'] for artist in track['artists']]
-            artist_genres = []
+            unscaled = _clean_tracks_df(_ranked_frame(rankings, details), dropna=dropna, parse_date=parse_date, date_precision=date_precision, observer=self.observer)
+            df = _scale_tracks(unscaled, _resolve_scaler(scale, self.scalers), observer=self.observer)
+            if to_csv:
+                _export_ranked(self, df, ranges, format, unscaled=unscaled)
+                self.toptracks_df = df
+            return df
 
-            for artist in artists:
-                artist_info = self.sp.search(q='artist:' + artist, type='artist')
-                if artist_info['artists']['items']:
-                    genres = artist_info['artists']['items'][0]['genres']
-                    artist_genres.extend(genres)
+        top_tracks = await self._paginate("me/top/tracks", limit=50, project=TrackRecord.from_track)
+        details = await self._track_details(top_tracks)
 
-            if artist_genres:
-                track_genres.append(artist_genres[0])
-            else:
-                track_genres.append(None)
-
-
-        album = [track['album']['name'] for track in top_tracks]
-        release_date = [track['album']['release_date'] for track in top_tracks]
-        is_local = [track['is_local'] for track in top_tracks]
-        explicit = [track['explicit'] for track in top_tracks]
-        popularity = [track['popularity'] for track in top_tracks]
-        duration_min = [track['duration_ms']/60000 for track in top_tracks]
-
-        track_features = []
-        for batch in tqdm(batches, desc="Retrieving Audio Features"):
-            batch_features = self.sp.audio_features(batch)
-            track_features.extend(batch_features)
-
-        audio_features = ['danceability', 'energy', 'key', 'loudness', 'mode', 
-                          'speechiness', 'acousticness', 'instrumentalness',
-                          'liveness', 'valence', 'tempo']
-
-        danceability = []
-        energy = []
-        key = []
-        loudness = []
-        mode = []
-        speechiness = []
-        acousticness = []
-        instrumentalness = []
-        liveness = []
-        valence = []
-        tempo = []
-
-        for data in tqdm(track_features, desc="Extracting Audio Features"):
-            if data:
-                danceability.append(data['danceability'])
-                energy.append(data['energy'])
-                key.append(data['key'])
-                loudness.append(data['loudness'])
-                mode.append(data['mode'])
-                speechiness.append(data['speechiness'])
-                acousticness.append(data['acousticness'])
-                instrumentalness.append(data['instrumentalness'])
-                liveness.append(data['liveness'])
-                valence.append(data['valence'])
-                tempo.append(data['tempo'])
-            else:
-                # Fill with NaN if data is None
-                danceability.append(float('nan'))
-                energy.append(float('nan'))
-                key.append(float('nan'))
-                loudness.append(float('nan'))
-                mode.append(float('nan'))
-                speechiness.append(float('nan'))
-                acousticness.append(float('nan'))
-                instrumentalness.append(float('nan'))
-                liveness.append(float('nan'))
-                valence.append(float('nan'))
-                tempo.append(float('nan'))
-
-        dic = {'songs': name,
-            'genre': track_genres,
-            'artist': artist,
-            'album': album,
-            'release_date': release_date,
-            'is_local': is_local,
-            'explicit': explicit,
-            'popularity': popularity,
-            'duration_min': duration_min,
-            'danceability': danceability,
-            'energy': energy,
-            'key': key,
-            'loudness': loudness,
-            'mode': mode,
-            'speechiness': speechiness,
-            'acousticness': acousticness,
-            'instrumentalness': instrumentalness,
-            'liveness': liveness,
-            'valence': valence,
-            'tempo': tempo}
-
-        df = pd.DataFrame.from_dict(dic)
-        if dropna:
-            df.dropna(inplace=True)
-            df = df[df['release_date']!='0000']
-            df.reset_index(inplace=True, drop=True)
-        if parse_date:
-            for i in tqdm(range(len(df)), desc="Parsing Dates"):
-                df.loc[i,'release_date']  = parse(df.loc[i,'release_date']).date()
-        if scale:
-            df = self.__scale_audio_features(df, audio_features)
+        unscaled = _clean_tracks_df(_tracks_frame(top_tracks, details), dropna=dropna, parse_date=parse_date, date_precision=date_precision, observer=self.observer)
+        df = _scale_tracks(unscaled, _resolve_scaler(scale, self.scalers), observer=self.observer)
         if to_csv:
-            df.to_csv(os.path.join(self.spreadsheets_dir, f"{self.user}'s_top_tracks.csv"),index=False)
+            _export_tracks(self, df, f"{self.user}'s_top_tracks", 'top_tracks', format, unscaled=unscaled)
             self.toptracks_df = df
         return df
-    def get_user_episodes(self, to_csv=False):
-        """Retrieve episodes saved by the current user from Spotify.
+
+    async def saved_tracks_df(self, scale=False, dropna=True, to_csv=False, parse_date=True, date_precision=False, format='csv'):
+        """Retrieve audio features of the current user's saved tracks (Liked Songs).
 
         Parameters
         ----------
+        scale : bool, int, str, list or AudioFeatureScaler, default=False
+            Whether and how to scale the audio features. True uses the first
+            of ``scalers``; an index or a name (see ``SCALERS``), or a list of
+            them, picks the scalers. A fitted AudioFeatureScaler is reused
+            without refitting.
+        dropna : bool, default=True
+            Whether to drop null values.
         to_csv : bool, default=False
             Whether to save the DataFrame to a CSV file.
+        format : {'csv', 'parquet', 'feather'}, default='csv'
+            File format used with ``to_csv``. Parquet and Feather keep compact
+            dtypes (see ``compact_dtypes``) and require pyarrow.
+        parse_date : bool, default=True
+            Whether to parse dates.
+        date_precision : bool, default=False
+            Whether to add a ``release_date_precision`` column ("year",
+            "month" or "day").
 
         Returns
         -------
         DataFrame
-            DataFrame containing information about saved episodes.
+            DataFrame of the saved tracks with the same columns as
+            ``playlist_df``.
 
         Examples
         --------
-        >>> spa.get_user_episodes(to_csv=True)
+        >>> await ati.saved_tracks_df(to_csv=True)
         """
-        eps = self.sp.current_user_saved_episodes()
-        ids = [episode['episode']['id'] for episode in eps['items']]
-        names = [episode['episode']['name'] for episode in eps['items']]
-        durations = [episode['episode']['duration_ms'] / 60000 for episode in eps['items']]
-        languages = [episode['episode']['language'] for episode in eps['items']]
-        dates = [episode['episode']['release_date'] for episode in eps['items']]
-        show_names = [episode['episode']['show']['name'] for episode in eps['items']]
-        publishers = [episode['episode']['show']['publisher'] for episode in eps['items']]
-        explicits = [episode['episode']['explicit'] for episode in eps['items']]
-
-        eps_df = pd.DataFrame({
-            "name": names,
-            "duration_min": durations,
-            "language": languages,
-            "release_date": dates,
-            "show": show_names,
-            "publisher": publishers,
-            "explicit": explicits}
-        )
+        tracks = await self._paginate("me/tracks", limit=50, project=TrackRecord.from_item)
+        details = await self._track_details(tracks)
 
+        unscaled = _clean_tracks_df(_tracks_frame(tracks, details, playlist=LIKED_SONGS), dropna=dropna, parse_date=parse_date, date_precision=date_precision, observer=self.observer)
+        df = _scale_tracks(unscaled, _resolve_scaler(scale, self.scalers), observer=self.observer)
         if to_csv:
-            eps_df.to_csv(os.path.join(self.spreadsheets_dir, f"{self.user}'s_saved_episodes.csv"),index=False)
-        
-        self.epsdf = eps_df
-        return eps_df
-
-    def __scale_audio_features(self, df, cols_to_scale):
-        """Scale the specified columns of the DataFrame.
-
-        Parameters
-        ----------
-        df : DataFrame
-            DataFrame containing the columns to be scaled.
-        cols_to_scale : list
-            List of column names to be scaled.
-        Returns
-        -------
-        DataFrame
-            DataFrame with scaled columns.
-        """
-        for col in tqdm(cols_to_scale, desc="Scaling Audio Features"):
-            df[col] = pd.DataFrame(self.scalers[0].fit_transform(pd.DataFrame(df[col])), columns=[col])
-        clear_output()
+            _export_tracks(self, df, f"{self.user}'s_saved_tracks", 'saved_tracks', format, unscaled=unscaled)
+            self.savedtracks_df = df
         return df
 
-    def playlist_df(self, playlist_id=None, url=None, scale=False, dropna=True, to_csv=False, parse_date = True):
-        """Retrieve audio features of tracks in a playlist.
+    async def get_user_episodes(self, to_csv=False, format='csv', incremental=True):
+        """Retrieve episodes saved by the current user.
+
+        Like ``TuneInsight.get_user_episodes``, the whole library is fetched,
+        its pages concurrently, unless an earlier export can be extended with
+        the episodes saved since.
 
         Parameters
         ----------
-        playlist_id : str, optional
-            Playlist ID.
-        url : str, optional
-            URL of the playlist.
-        scale : bool, default=False
-            Whether to scale the audio features.
-        dropna : bool, default=True
-            Whether to drop null values.
         to_csv : bool, default=False
             Whether to save the DataFrame to a CSV file.
-        parse_date : bool, default=True
-            Whether to parse dates.
+        format : {'csv', 'parquet', 'feather'}, default='csv'
+            File format used with ``to_csv``. Parquet and Feather keep compact
+            dtypes (see ``compact_dtypes``) and require pyarrow.
+        incremental : bool, default=True
+            Whether to extend the existing export of ``to_csv`` instead of
+            fetching the whole library again.
 
         Returns
         -------
         DataFrame
-            DataFrame containing audio features of tracks in the playlist.
+            DataFrame containing information about saved episodes.
 
         Examples
         --------
-        >>> spa.playlist_df(playlist_id='your_playlist_id', scale=True, to_csv=True)
+        >>> await ati.get_user_episodes(to_csv=True)
         """
-        if url:
-            playlist_id = urlparse(url).path.split('/')[2]
+        path = _output_path(self.spreadsheets_dir, f"{self.user}'s_saved_episodes", format)
+        exported = _exported_episodes(path) if to_csv and incremental else None
 
-        try:
-            playlist_info = self.sp.playlist(playlist_id)
-            playlist_name = playlist_info['name']
-            data = []
-            offset = 0
-            limit = 100 
+        if exported is None:
+            rows = await self._paginate("me/episodes", limit=50, project=_episode_row)
+        else:
+            rows = []
+            async with contextlib.aclosing(self._iter_pages("me/episodes", limit=50, project=_episode_row)) as pages:
+                async for page in pages:
+                    new, done = _new_episodes(page, exported)
+                    rows.extend(new)
+                    if done:
+                        break
 
-            while True:
-                results = self.sp.playlist_tracks(playlist_id, offset=offset, limit=limit)
-                data.extend(results['items'])
-                offset += limit
+        new_df, eps_df = _episodes_frame(rows, exported)
 
-                if results['next'] is None:
-                    break
+        if to_csv:
+            _write_episodes(eps_df, new_df, exported, path, format, self.summaries, self.observer)
 
-        except Exception as e:
-            print(f"Error retrieving playlist data: {e}")
-            print("-------------------------------")
-            print("This playlist can't be retrieved")
-            return None
+        self.epsdf = eps_df
+        return eps_df
 
-        songs = [track["track"]['name'] for track in tqdm(data, desc='Retrieving track names...')]
-        self.track_names = songs
-        clear_output(wait=True)
+def load_manifest(path):
+    """Read a batch manifest of users and playlist selectors.
 
-        track_artists_ids = [track['track']['artists'][0]['id'] for track in tqdm(data, desc='Retrieving track artists ids...')]
-        self.track_artists_ids = track_artists_ids
-        clear_output(wait=True)
+    A ``.json`` file holds a list of ``{"user": ..., "playlists": [...]}``
+    entries or a mapping of users to selector lists. A ``.jsonl`` file holds
+    one entry per line. A ``.csv`` file has ``user`` and ``playlists`` columns,
+    with selectors separated by ``;``. Entries without playlists select all of
+    them, and entries of the same user are merged.
 
-        track_genres = []
+    A selector is "all", a playlist ID, URL or URI, or a case-insensitive name
+    pattern such as ``Chill*`` (prefix it with ``name:`` to force a pattern).
 
-        for track in tqdm(data, desc="Retrieving Track Genres"):
-            artists = [artist['name'] for artist in track['track']['artists']]
-            artist_genres = []
+    Parameters
+    ----------
+    path : str
+        Manifest file.
 
-            for artist in artists:
-                artist_info = self.sp.search(q='artist:' + artist, type='artist')
-                if artist_info['artists']['items']:
-                    genres = artist_info['artists']['items'][0]['genres']
-                    artist_genres.extend(genres)
-            if artist_genres:
-                track_genres.append(artist_genres[0])
-            else:
-                track_genres.append(None)
-        clear_output(wait=True)
+    Returns
+    -------
+    list of tuple
+        ``(user, selectors)`` pairs in manifest order.
 
-        track_locality = [track['is_local'] for track in tqdm(data, desc='Retrieving track locality...')]
-        clear_output(wait=True)
+    Examples
+    --------
+    >>> load_manifest("manifest.json")
+    [('spotify', ['all']), ('someone', ['37i9dQZF1DXcBWIGoYBM5M', 'Road trip*'])]
+    """
+    extension = os.path.splitext(path)[1]
+    with open(path, newline='', encoding='utf-8') as file:
+        if extension == '.csv':
+            entries = [{'user': row['user'], 'playlists': (row.get('playlists') or '').split(';')}
+                       for row in csv.DictReader(file)]
+        elif extension == '.jsonl':
+            entries = [json.loads(line) for line in file if line.strip()]
+        else:
+            entries = json.load(file)
 
-        track_ids = [track['track']['id'] for track in tqdm(data, desc='Retrieving track ids...')]
-        clear_output(wait=True)
+    if isinstance(entries, dict):
+        entries = [{'user': user, 'playlists': selectors} for user, selectors in entries.items()]
 
-        track_artists = [track['track']['artists'][0]['name'] for track in tqdm(data, desc='Retrieving track artists...')]
-        clear_output(wait=True)
-        self.track_artists = track_artists
+    manifest = OrderedDict()
+    for entry in entries:
+        selectors = entry.get('playlists') or ['all']
+        if isinstance(selectors, str):
+            selectors = [selectors]
+        selectors = [selector.strip() for selector in selectors if selector.strip()] or ['all']
+        manifest.setdefault(_user_id(entry['user'].strip()), []).extend(selectors)
+    return list(manifest.items())
 
-        track_album = [track['track']['album']['name'] for track in tqdm(data, desc='Retrieving track album...')]
-        clear_output(wait=True)
+def select_playlists(playlists, selectors):
+    """Return the IDs of the playlists matched by ``selectors``.
 
-        track_date = [track['track']['album']['release_date'] for track in tqdm(data, desc='Retrieving track date...')]
-        clear_output(wait=True)
+    Parameters
+    ----------
+    playlists : list of dict
+        Playlists of the user, with ``id`` and ``name``. Only needed for the
+        "all" and name pattern selectors.
+    selectors : list of str
+        "all", playlist IDs, URLs or URIs, and name patterns.
 
-        tracks_popularity = [track['track']['popularity'] for track in tqdm(data, desc='Retrieving track popularity...')]
-        clear_output(wait=True)
+    Returns
+    -------
+    list of str
+        Unique playlist IDs, the listed playlists first in listing order.
 
-        tracks_duration = [track['track']['duration_ms']/60000 for track in tqdm(data, desc='Retrieving track duration...')]
-        clear_output(wait=True)
+    Examples
+    --------
+    >>> select_playlists(playlists, ['Road trip*', 'https://open.spotify.com/playlist/37i9dQZF1DXcBWIGoYBM5M'])
+    """
+    ids = []
+    patterns = []
+    for selector in selectors:
+        if selector.lower() == 'all':
+            patterns.append('*')
+        elif selector.startswith('name:'):
+            patterns.append(selector[len('name:'):].lower())
+        elif _playlist_id(selector):
+            ids.append(_playlist_id(selector))
+        else:
+            patterns.append(selector.lower())
 
-        track_explicit = [track['track']['explicit'] for track in tqdm(data, desc='Retrieving track explicity...')]
-        clear_output(wait=True)
+    selected = [playlist['id'] for playlist in playlists
+                if any(fnmatch.fnmatchcase((playlist['name'] or '').lower(), pattern) for pattern in patterns)]
+    return list(OrderedDict.fromkeys(selected + ids))
 
+_BATCH_CLIENT = None
 
+def _batch_init(options):
+    """Build the TuneInsight instance of a batch worker process."""
+    global _BATCH_CLIENT
+    options = dict(options)
+    token = options.pop('token')
+    api_prefix = options.pop('api_prefix')
+    if token is not None:
+        options['sp'] = spotipy.Spotify(auth=token, requests_session=SpotifyTransport.session())
+    _BATCH_CLIENT = TuneInsight(user='batch', **options)
+    if api_prefix is not None:
+        _BATCH_CLIENT.sp.client.prefix = api_prefix
 
-        batch_size = 50
-        batches = [track_ids[i:i + batch_size] for i in range(0, len(track_ids), batch_size)]
+def _batch_resolve(user, selectors):
+    """Resolve the selectors of one manifest user to playlist IDs, in a batch worker."""
+    try:
+        playlists = []
+        if any(not _playlist_id(selector) or selector.startswith('name:') for selector in selectors):
+            playlists = paginate(functools.partial(_BATCH_CLIENT.sp.user_playlists, user), limit=50,
+                                 max_workers=_BATCH_CLIENT.page_workers, project=itemgetter('id', 'name'))
+            playlists = [{'id': id, 'name': name} for id, name in playlists]
+        return user, select_playlists(playlists, selectors), None
+    except Exception as e:
+        return user, [], str(e)
 
-        song_data = []
-        for batch in tqdm(batches, desc="Retrieving audio features"):
-            batch_features = self.sp.audio_features(batch)
-            song_data.extend(batch_features)
+def _batch_export(user, playlist_id, path, format, options):
+    """Export one playlist to ``path`` in a batch worker.
 
-        clear_output(wait=True)
+    The file is written under a temporary name and renamed once complete, so
+    an existing output file always holds a finished playlist.
+    """
+    started = time.perf_counter()
+    try:
+        df = _BATCH_CLIENT.playlist_df(playlist_id=playlist_id, **options)
+        if df is None:
+            raise ValueError("This playlist can't be retrieved")
+        part = f"{path}.part"
+        save_frame(df, part, format=format)
+        os.replace(part, path)
+        return {'user': user, 'playlist_id': playlist_id, 'rows': len(df), 'seconds': time.perf_counter() - started}
+    except Exception as e:
+        return {'user': user, 'playlist_id': playlist_id, 'rows': 0, 'seconds': time.perf_counter() - started,
+                'error': str(e)}
 
-        audio_features = ['danceability', 'energy', 'key', 'loudness', 'mode',
-                        'speechiness', 'acousticness', 'instrumentalness',
-                        'liveness', 'valence', 'tempo']
-
-        danceability = []
-        energy = []
-        key = []
-        loudness = []
-        mode = []
-        speechiness = []
-        acousticness = []
-        instrumentalness = []
-        liveness = []
-        valence = []
-        tempo = []
-
-        for data in tqdm(song_data, desc="Extracting Audio Features"):
-            if data:
-                danceability.append(data['danceability'])
-                energy.append(data['energy'])
-                key.append(data['key'])
-                loudness.append(data['loudness'])
-                mode.append(data['mode'])
-                speechiness.append(data['speechiness'])
-                acousticness.append(data['acousticness'])
-                instrumentalness.append(data['instrumentalness'])
-                liveness.append(data['liveness'])
-                valence.append(data['valence'])
-                tempo.append(data['tempo'])
-            else:
-                # Fill with NaN if data is None
-                danceability.append(float('nan'))
-                energy.append(float('nan'))
-                key.append(float('nan'))
-                loudness.append(float('nan'))
-                mode.append(float('nan'))
-                speechiness.append(float('nan'))
-                acousticness.append(float('nan'))
-                instrumentalness.append(float('nan'))
-                liveness.append(float('nan'))
-                valence.append(float('nan'))
-                tempo.append(float('nan'))
-
-        dic = { 'songs': songs,
-                'playlist' : [playlist_name]*len(songs),
-                'genre': track_genres,
-                'artist': track_artists,
-                'album': track_album,
-                'release_date': track_date,
-                'is_local': track_locality,
-                'explicit': track_explicit,
-                'popularity': tracks_popularity,
-                'duration_min': tracks_duration,
-                'danceability': danceability,
-                'energy': energy,
-                'key': key,
-                'loudness': loudness,
-                'mode': mode,
-                'speechiness': speechiness,
-                'acousticness': acousticness,
-                'instrumentalness': instrumentalness,
-                'liveness': liveness,
-                'valence': valence,
-                'tempo': tempo}
-
-        df = pd.DataFrame.from_dict(dic)
-        if dropna:
-            df.dropna(inplace=True)
-            df = df[df['release_date']!='0000']
-            df.reset_index(inplace=True, drop=True)
-        if parse_date:
-            for i in tqdm(range(len(df)), desc="Parsing Date"):
-                df.loc[i,'release_date']  = parse(df.loc[i,'release_date']).date()
-            clear_output()
-        if scale:
-            df = self.__scale_audio_features(df, audio_features)
-        if to_csv:
-            df.to_csv(os.path.join(self.spreadsheets_dir, f"{playlist_name}_playlist.csv"),index=False)
-            self.playlistdf = df
-        return df
+def run_batch(manifest, output_dir, processes=None, format='csv', rate_limit=None, auth='client_credentials',
+              client_id=None, client_secret=None, cache_path=None, token=None, api_prefix=None, store=True,
+              scale=False, dropna=True, parse_date=True, date_precision=False, sync=False, observer=None):
+    """Export the playlists of many users without any prompt.
+
+    The manifest's selectors are resolved to playlists, then every playlist is
+    exported to ``<output_dir>/<user>/<playlist_id>.<format>`` by a pool of
+    worker processes. Output files are only created once a playlist is
+    complete, so they double as the checkpoint: running the same batch again
+    after a crash or an interruption skips the playlists already exported.
+
+    Parameters
+    ----------
+    manifest : str or list of tuple
+        Manifest file (see ``load_manifest``) or ``(user, selectors)`` pairs.
+    output_dir : str
+        Directory receiving the exports, the token cache and the track store.
+    processes : int, optional
+        Number of worker processes. Defaults to the number of CPUs.
+    format : {'csv', 'parquet', 'feather'}, default='csv'
+        File format of the exports.
+    rate_limit : float, optional
+        Maximum number of API requests per second of the whole batch. It is
+        split evenly between the worker processes. No limit by default.
+    auth : {'client_credentials', 'oauth'}, default='client_credentials'
+        Authorization flow. With 'oauth' the browser is opened at most once,
+        before the workers start, and the workers share the cached token.
+    client_id : str, optional
+        Client ID. Defaults to the ``SPOTIPY_CLIENT_ID`` environment variable.
+    client_secret : str, optional
+        Client secret. Defaults to the ``SPOTIPY_CLIENT_SECRET`` environment
+        variable.
+    cache_path : str, optional
+        Token cache file. Defaults to ``.cache-batch`` in ``output_dir``.
+    token : str, optional
+        Access token to use as is instead of ``auth``.
+    api_prefix : str, optional
+        Base URL of the Web API, e.g. a local fake server for benchmarks.
+    store : bool, default=True
+        Whether the workers share the track store in ``output_dir``, so tracks
+        found in several playlists are only enriched once.
+    scale, dropna, parse_date, date_precision, sync
+        Passed to ``TuneInsight.playlist_df`` for every playlist.
+    observer : Observer, optional
+        Receives a ``resolve`` stage with a step per user and an ``export``
+        stage with a step per playlist, e.g. a TqdmObserver.
+
+    Returns
+    -------
+    dict
+        ``playlists`` selected, ``exported``, ``skipped`` (already exported),
+        ``rows`` written, ``seconds`` and the ``failed`` users and playlists
+        with their errors.
+
+    Examples
+    --------
+    >>> run_batch("manifest.json", "exports", processes=8, format="parquet", rate_limit=20)
+    """
+    started = time.perf_counter()
+    observer = observer if observer is not None else _SILENT
+    entries = load_manifest(manifest) if isinstance(manifest, str) else [(_user_id(user), list(selectors)) for user, selectors in manifest]
+    processes = processes or os.cpu_count() or 1
+    os.makedirs(output_dir, exist_ok=True)
+
+    client_options = {'client_id': client_id, 'client_secret': client_secret, 'auth': auth, 'token': token,
+                      'cache_path': cache_path or os.path.join(output_dir, '.cache-batch'), 'api_prefix': api_prefix,
+                      'project_dir': output_dir, 'store': store, 'rate_limit': rate_limit / processes if rate_limit else None}
+    if token is None:
+        # Authorize once up front so the workers only read the cached token.
+        TuneInsight(user='batch', client_id=client_id, client_secret=client_secret, auth=auth,
+                    cache_path=client_options['cache_path'], project_dir=output_dir, store=False)
+    else:
+        client_options.update(client_id=None, client_secret=None, cache_path=None)
+    export_options = {'scale': scale, 'dropna': dropna, 'parse_date': parse_date, 'date_precision': date_precision,
+                      'sync': sync}
+
+    summary = {'playlists': 0, 'exported': 0, 'skipped': 0, 'rows': 0, 'failed': []}
+    with ProcessPoolExecutor(max_workers=processes, initializer=_batch_init, initargs=(client_options,)) as executor:
+        tasks = []
+        with _stage(observer, 'resolve', total=len(entries)) as counts:
+            futures = [executor.submit(_batch_resolve, user, selectors) for user, selectors in entries]
+            for future in futures:
+                user, playlist_ids, error = future.result()
+                observer.advance('resolve')
+                if error is not None:
+                    summary['failed'].append({'user': user, 'playlist_id': None, 'error': error})
+                    continue
+                user_dir = os.path.join(output_dir, re.sub(r'[^\w.-]', '_', user))
+                os.makedirs(user_dir, exist_ok=True)
+                for playlist_id in playlist_ids:
+                    path = os.path.join(user_dir, playlist_id + OUTPUT_FORMATS[format])
+                    if os.path.exists(path):
+                        summary['skipped'] += 1
+                    else:
+                        tasks.append((user, playlist_id, path))
+                summary['playlists'] += len(playlist_ids)
+            counts.update(users=len(entries), playlists=summary['playlists'], skipped=summary['skipped'])
+
+        with _stage(observer, 'export', total=len(tasks)) as counts:
+            futures = [executor.submit(_batch_export, user, playlist_id, path, format, export_options)
+                       for user, playlist_id, path in tasks]
+            for future in as_completed(futures):
+                result = future.result()
+                observer.advance('export')
+                if 'error' in result:
+                    summary['failed'].append({'user': result['user'], 'playlist_id': result['playlist_id'],
+                                              'error': result['error']})
+                else:
+                    summary['exported'] += 1
+                    summary['rows'] += result['rows']
+            counts.update(playlists=summary['exported'], rows=summary['rows'], failed=len(summary['failed']))
+
+    summary['seconds'] = time.perf_counter() - started
+    return summary
+
+def main(argv=None):
+    """Command line entry point of the batch runner. See ``run_batch``."""
+    parser = argparse.ArgumentParser(description="Export the playlists of the users listed in a manifest.")
+    parser.add_argument('manifest', help="JSON, JSON Lines or CSV manifest of users and playlist selectors")
+    parser.add_argument('-o', '--output', default="exports", help="output directory (default: exports)")
+    parser.add_argument('-p', '--processes', type=int, help="worker processes (default: number of CPUs)")
+    parser.add_argument('-f', '--format', choices=list(OUTPUT_FORMATS), default='csv')
+    parser.add_argument('--rate-limit', type=float, help="API requests per second of the whole batch (default: no limit)")
+    parser.add_argument('--auth', choices=['client_credentials', 'oauth'], default='client_credentials')
+    parser.add_argument('--client-id', help="defaults to SPOTIPY_CLIENT_ID")
+    parser.add_argument('--client-secret', help="defaults to SPOTIPY_CLIENT_SECRET")
+    parser.add_argument('--no-store', dest='store', action='store_false', help="do not share the track store")
+    parser.add_argument('--sync', action='store_true', help="reuse the stored tracks of unchanged playlists")
+    parser.add_argument('--quiet', action='store_true', help="hide the progress bars")
+    args = parser.parse_args(argv)
+
+    summary = run_batch(args.manifest, args.output, processes=args.processes, format=args.format,
+                        rate_limit=args.rate_limit, auth=args.auth, client_id=args.client_id,
+                        client_secret=args.client_secret, store=args.store, sync=args.sync,
+                        observer=None if args.quiet else TqdmObserver())
+
+    print(f"{summary['exported']} playlists exported ({summary['rows']} rows), {summary['skipped']} already done, "
+          f"{len(summary['failed'])} failed in {summary['seconds']:.1f}s")
+    for failure in summary['failed']:
+        print(f"  {failure['user']} {failure['playlist_id'] or ''}: {failure['error']}")
+    return 1 if summary['failed'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
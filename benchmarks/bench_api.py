@@ -0,0 +1,120 @@
+"""Benchmark the TuneInsight entry points end to end against the local fake Spotify API.
+
+Starts ``fake_spotify.FakeSpotify`` with one playlist per ``--sizes`` entry and
+runs ``playlist_df`` on each of them, then ``get_top_tracks`` for the default
+and for all time ranges, ``get_user_playlists`` over all playlists, and ``saved_tracks_df`` and a
+streamed ``iter_saved_track_chunks`` export over ``--saved-tracks`` liked
+songs, each in a fresh interpreter. For
+every run it reports the wall time, the number of HTTP requests the server
+answered (429s included), the peak memory and the rows per second. Runs
+entirely offline. Unix only.
+
+Usage
+-----
+    python benchmarks/bench_api.py --sizes 100,1000,10000 --latency 0.02 --throttle 0.02
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_spotify import FakeSpotify
+
+
+def child(args):
+    """Run one entry point and print its measurements as JSON."""
+    import time
+    import logging
+    import resource
+    import tempfile
+    import spotipy
+    from TuneInsight import TuneInsight, SpotifyTransport, StatsObserver, write_chunks
+
+    # spotipy logs every throttled response; the retries are counted by the observer instead.
+    logging.getLogger('spotipy').setLevel(logging.CRITICAL)
+
+    client = spotipy.Spotify(auth='offline', requests_session=SpotifyTransport.session())
+    client.prefix = args.prefix
+    stats = StatsObserver()
+    with tempfile.TemporaryDirectory() as directory:
+        ti = TuneInsight(user='bench', sp=client, project_dir=directory, store=args.store, rate_limit=args.rate_limit,
+                         observer=stats)
+        ti.sp.backoff = 0.05
+        baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+        start = time.perf_counter()
+        if args.child == 'playlist_df':
+            df = ti.playlist_df(playlist_id=args.playlist)
+        elif args.child == 'get_top_tracks':
+            df = ti.get_top_tracks()
+        elif args.child == 'get_top_tracks_all':
+            df = ti.get_top_tracks(time_range="all")
+        elif args.child == 'saved_tracks_df':
+            df = ti.saved_tracks_df()
+        elif args.child == 'iter_saved_track_chunks':
+            df = range(write_chunks(ti.iter_saved_track_chunks(), os.path.join(directory, "liked.parquet")))
+        else:
+            df = ti.get_user_playlists(selection="All")
+        wall = time.perf_counter() - start
+
+    print(json.dumps({'wall': wall, 'rows': len(df), 'baseline': baseline,
+                      'peak': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                      'retries': stats.requests['retries']}))
+
+
+def run(fake, args, entry, playlist=None):
+    fake.reset()
+    command = [sys.executable, os.path.abspath(__file__), '--child', entry, '--prefix', fake.prefix]
+    if args.rate_limit:
+        command += ['--rate-limit', str(args.rate_limit)]
+    if playlist is not None:
+        command += ['--playlist', playlist]
+    if args.store:
+        command.append('--store')
+    result = json.loads(subprocess.run(command, check=True, capture_output=True, text=True).stdout.splitlines()[-1])
+    result['calls'] = sum(fake.calls.values())
+    result['throttled'] = fake.throttled
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default="100,1000,10000", help="comma-separated playlist sizes, up to 100000")
+    parser.add_argument('--top-tracks', type=int, default=100)
+    parser.add_argument('--saved-tracks', type=int, default=10000)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument('--throttle', type=float, default=0.0, help="probability of a 429 response")
+    parser.add_argument('--retry-after', type=int, default=0, help="Retry-After of throttled responses, in seconds")
+    parser.add_argument('--rate-limit', type=float, help="client-side requests per second (default: no limit)")
+    parser.add_argument('--store', action='store_true', help="enable the track store (it starts empty)")
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--prefix', help=argparse.SUPPRESS)
+    parser.add_argument('--playlist', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args)
+        return
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    with FakeSpotify(playlists=sizes, top_tracks=args.top_tracks, saved_tracks=args.saved_tracks, latency=args.latency,
+                     throttle=args.throttle, retry_after=args.retry_after) as fake:
+        runs = [(f"playlist_df({size})", run(fake, args, 'playlist_df', fake.playlist_id(p)))
+                for p, size in enumerate(sizes)]
+        runs.append((f"get_top_tracks({args.top_tracks})", run(fake, args, 'get_top_tracks')))
+        runs.append((f"get_top_tracks(3x{args.top_tracks})", run(fake, args, 'get_top_tracks_all')))
+        runs.append((f"get_user_playlists({sum(sizes)})", run(fake, args, 'get_user_playlists')))
+        runs.append((f"saved_tracks_df({args.saved_tracks})", run(fake, args, 'saved_tracks_df')))
+        runs.append((f"saved_track_chunks({args.saved_tracks})", run(fake, args, 'iter_saved_track_chunks')))
+
+    print(f"{'entry point':<28} {'rows':>8} {'wall s':>8} {'requests':>9} {'429s':>6} {'peak MB':>8} {'rows/s':>10}")
+    for name, result in runs:
+        print(f"{name:<28} {result['rows']:>8} {result['wall']:>8.2f} {result['calls']:>9} {result['throttled']:>6} "
+              f"{result['peak']:>8.0f} {result['rows'] / result['wall']:>10,.0f}")
+
+
+if __name__ == '__main__':
+    main()
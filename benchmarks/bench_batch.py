@@ -0,0 +1,61 @@
+"""Benchmark how ``run_batch`` scales with the number of worker processes.
+
+Starts ``fake_spotify.FakeSpotify`` and exports every playlist of ``--users``
+users with 1, 2, 4, ... worker processes, each run into a fresh output
+directory, then runs the last configuration again to check that a resumed
+batch skips the finished playlists. The rate limit is the budget of the whole
+batch, so it caps the aggregate throughput whatever the process count. Runs
+entirely offline.
+
+Usage
+-----
+    python benchmarks/bench_batch.py --users 16 --sizes 200,500 --processes 1,2,4 --latency 0.02
+"""
+import os
+import sys
+import logging
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_spotify import FakeSpotify
+from TuneInsight import run_batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=16)
+    parser.add_argument('--sizes', default="200,500", help="comma-separated playlist sizes of every user")
+    parser.add_argument('--processes', default="1,2,4", help="comma-separated process counts")
+    parser.add_argument('--latency', type=float, default=0.02, help="seconds added to every response")
+    parser.add_argument('--throttle', type=float, default=0.0, help="probability of a 429 response")
+    parser.add_argument('--rate-limit', type=float, help="requests per second of the whole batch (default: no limit)")
+    parser.add_argument('--format', default='parquet')
+    args = parser.parse_args()
+
+    logging.getLogger('spotipy').setLevel(logging.CRITICAL)
+    sizes = [int(size) for size in args.sizes.split(',')]
+    manifest = [(f"user{u}", ['all']) for u in range(args.users)]
+
+    print(f"{'processes':>9} {'playlists':>10} {'rows':>8} {'wall s':>8} {'requests':>9} {'rows/s':>10}")
+    with FakeSpotify(playlists=sizes, latency=args.latency, throttle=args.throttle) as fake, \
+            tempfile.TemporaryDirectory() as directory:
+        for processes in [int(count) for count in args.processes.split(',')]:
+            output_dir = os.path.join(directory, str(processes))
+            fake.reset()
+            # Without the shared store every user's copy of a playlist is fetched and enriched in full.
+            summary = run_batch(manifest, output_dir, processes=processes, format=args.format,
+                                rate_limit=args.rate_limit, token='offline', api_prefix=fake.prefix, store=False)
+            print(f"{processes:>9} {summary['exported']:>10} {summary['rows']:>8} {summary['seconds']:>8.2f} "
+                  f"{sum(fake.calls.values()):>9} {summary['rows'] / summary['seconds']:>10,.0f}")
+
+        fake.reset()
+        summary = run_batch(manifest, output_dir, processes=processes, format=args.format,
+                            rate_limit=args.rate_limit, token='offline', api_prefix=fake.prefix, store=False)
+        print(f"resumed: {summary['skipped']} playlists skipped, {summary['exported']} exported, "
+              f"{sum(fake.calls.values())} requests in {summary['seconds']:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
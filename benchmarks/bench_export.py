@@ -0,0 +1,70 @@
+"""Benchmark the CSV export against compact Parquet and Feather files.
+
+Builds a synthetic tracks DataFrame shaped like ``get_user_playlists`` output
+and reports, for every format, the file size, the write time and the time to
+load it back with ``load_frame`` (CSV dates are re-parsed, as downstream jobs
+have to). Requires pyarrow. No network access is needed.
+
+Usage
+-----
+    python benchmarks/bench_export.py --tracks 100000
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_extraction import synthetic_payloads
+from TuneInsight import TrackRecord, _tracks_frame, _track_details_frame, _clean_tracks_df, save_frame, load_frame
+
+
+def synthetic_frame(n_tracks, n_playlists=20):
+    """Return a cleaned tracks DataFrame spread over ``n_playlists`` playlists."""
+    tracks, genres, features = synthetic_payloads(n_tracks)
+    records = [TrackRecord.from_track(track) for track in tracks]
+    details = _track_details_frame(records, genres, features)
+    size = -(-n_tracks // n_playlists)
+    df = pd.concat([_tracks_frame(records[i:i + size], details, playlist=f"Playlist {i // size}")
+                    for i in range(0, n_tracks, size)], ignore_index=True)
+    return _clean_tracks_df(df, dropna=True, parse_date=True)
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tracks', type=int, default=100000, help="number of synthetic tracks")
+    args = parser.parse_args()
+
+    df = synthetic_frame(args.tracks)
+    print(f"rows:      {len(df)}")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for format in ['csv', 'parquet', 'feather']:
+            path = os.path.join(directory, f"tracks.{format}")
+            _, write = timed(save_frame, df, path)
+            loaded, read = timed(load_frame, path)
+            if format == 'csv':
+                start = time.perf_counter()
+                loaded['release_date'] = pd.to_datetime(loaded['release_date'])
+                read += time.perf_counter() - start
+            results[format] = (os.path.getsize(path), write, read, loaded.memory_usage(deep=True).sum())
+
+    csv_size, _, csv_read, _ = results['csv']
+    for format, (size, write, read, memory) in results.items():
+        print(f"{format:<10} {size / 2**20:7.2f} MB on disk ({csv_size / size:4.1f}x smaller)  "
+              f"write {write:.3f} s  load {read:.3f} s ({csv_read / read:4.1f}x faster)  "
+              f"{memory / 2**20:7.2f} MB in memory")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""Benchmark the columnar track extraction against the per-field list building it replaced.
+
+Builds synthetic track and audio-feature payloads shaped like the Web API
+responses and times both ways of turning them into the tracks DataFrame. No
+network access is needed.
+
+Usage
+-----
+    python benchmarks/bench_extraction.py --tracks 100000
+"""
+import os
+import sys
+import time
+import argparse
+import pandas as pd
+from tqdm import tqdm
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from TuneInsight import AUDIO_FEATURES, TrackRecord, _tracks_frame, _track_details_frame
+
+
+def synthetic_payloads(n_tracks):
+    """Return ``n_tracks`` track objects, their genres and their audio features."""
+    tracks = []
+    features = []
+    for i in range(n_tracks):
+        tracks.append({
+            'id': f"track{i}",
+            'name': f"Song {i}",
+            'artists': [{'id': f"artist{i % 5000}", 'name': f"Artist {i % 5000}"}],
+            'album': {'name': f"Album {i % 20000}", 'release_date': f"{1960 + i % 60}-0{1 + i % 9}-1{i % 10}"},
+            'is_local': False,
+            'explicit': bool(i % 2),
+            'popularity': i % 100,
+            'duration_ms': 120000 + i % 240000,
+        })
+        features.append(None if i % 97 == 0 else {
+            'id': f"track{i}", 'danceability': (i % 100) / 100, 'energy': (i % 90) / 90, 'key': i % 12,
+            'loudness': -(i % 60), 'mode': i % 2, 'speechiness': (i % 50) / 50, 'acousticness': (i % 40) / 40,
+            'instrumentalness': (i % 30) / 30, 'liveness': (i % 20) / 20, 'valence': (i % 10) / 10,
+            'tempo': 60 + i % 140,
+        })
+    genres = [f"genre {i % 300}" for i in range(n_tracks)]
+    return tracks, genres, features
+
+
+def legacy_extract(tracks, genres, features, playlist):
+    """The extraction used before the columnar engine.
+
+    Builds a dict record per track, matches audio features by list position and
+    appends every field to its own list, as ``_track_record`` and the previous
+    ``_tracks_frame`` did. Progress bars are written to devnull.
+    """
+    with open(os.devnull, 'w') as devnull:
+        details = {}
+        for track, genre, track_features in zip(tracks, genres, features):
+            details[track['id']] = {
+                'songs': track['name'],
+                'genre': genre,
+                'artist': track['artists'][0]['name'],
+                'album': track['album']['name'],
+                'release_date': track['album']['release_date'],
+                'is_local': track['is_local'],
+                'explicit': track['explicit'],
+                'popularity': track['popularity'],
+                'duration_min': track['duration_ms']/60000,
+                **{feature: track_features[feature] if track_features else float('nan') for feature in AUDIO_FEATURES}
+            }
+
+        track_ids = [track['id'] for track in tracks]
+        track_features = [details.get(track_id) for track_id in track_ids]
+
+        columns = {feature: [] for feature in AUDIO_FEATURES}
+        for data in tqdm(track_features, desc="Extracting Audio Features", file=devnull):
+            for feature in AUDIO_FEATURES:
+                columns[feature].append(data[feature] if data else float('nan'))
+
+    dic = {'id': track_ids,
+           'songs': [track['name'] for track in tracks],
+           'playlist': [playlist]*len(tracks),
+           'genre': [data['genre'] if data else None for data in track_features],
+           'artist': [track['artists'][0]['name'] for track in tracks],
+           'album': [track['album']['name'] for track in tracks],
+           'release_date': [track['album']['release_date'] for track in tracks],
+           'is_local': [track['is_local'] for track in tracks],
+           'explicit': [track['explicit'] for track in tracks],
+           'popularity': [track['popularity'] for track in tracks],
+           'duration_min': [track['duration_ms']/60000 for track in tracks],
+           **columns}
+    return pd.DataFrame.from_dict(dic)
+
+
+def columnar_extract(tracks, genres, features, playlist):
+    """The current extraction: tracks projected onto records, features joined on track ID."""
+    records = [TrackRecord.from_track(track) for track in tracks]
+    return _tracks_frame(records, _track_details_frame(records, genres, features), playlist=playlist)
+
+
+def best_of(function, repeat, *args):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tracks', type=int, default=100000, help="number of synthetic tracks")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per implementation, the best is reported")
+    args = parser.parse_args()
+
+    tracks, genres, features = synthetic_payloads(args.tracks)
+
+    legacy = best_of(legacy_extract, args.repeat, tracks, genres, features, "bench")
+    columnar = best_of(columnar_extract, args.repeat, tracks, genres, features, "bench")
+
+    print(f"tracks:    {args.tracks}")
+    print(f"legacy:    {legacy:.3f} s ({args.tracks / legacy:,.0f} rows/s)")
+    print(f"columnar:  {columnar:.3f} s ({args.tracks / columnar:,.0f} rows/s)")
+    print(f"speedup:   {legacy / columnar:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark the import time of the TuneInsight module against a budget.
+
+Imports the module in fresh interpreters and reports the median wall time,
+the slowest imported packages (from ``-X importtime``) and whether the lazily
+loaded dependencies (scikit-learn, IPython, tqdm, httpx) were pulled in. Exits
+with status 1 when the median exceeds ``--budget`` or a lazy dependency is
+imported eagerly, so it can guard against regressions.
+
+Usage
+-----
+    python benchmarks/bench_import.py --budget 1.0
+"""
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAZY = ['sklearn', 'IPython', 'tqdm', 'httpx']
+
+PROBE = f"""
+import sys, time
+start = time.perf_counter()
+import TuneInsight
+elapsed = time.perf_counter() - start
+print(elapsed, ','.join(module for module in {LAZY!r} if module in sys.modules))
+"""
+
+
+def import_once():
+    output = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, check=True, capture_output=True, text=True).stdout.split()
+    return float(output[0]), output[1].split(',') if len(output) > 1 else []
+
+
+def slowest_imports(count):
+    """Return the ``count`` direct imports of TuneInsight with the largest cumulative import time, in seconds."""
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import TuneInsight'], cwd=ROOT,
+                            check=True, capture_output=True, text=True).stderr
+    packages = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        name = name[1:]
+        level = (len(name) - len(name.lstrip())) // 2
+        # Imports are listed children first, so the direct imports of TuneInsight precede it at level 1.
+        if level == 0:
+            if name.strip() == 'TuneInsight':
+                break
+            packages = {}
+        elif level == 1:
+            packages[name.strip()] = int(cumulative) / 1e6
+    return sorted(packages.items(), key=lambda item: item[1], reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help="number of fresh interpreters")
+    parser.add_argument('--budget', type=float, default=1.0, help="maximum median import time, in seconds")
+    args = parser.parse_args()
+
+    runs = [import_once() for _ in range(args.repeat)]
+    median = statistics.median(elapsed for elapsed, _ in runs)
+    eager = sorted(set(module for _, modules in runs for module in modules))
+
+    print(f"median:    {median:.3f} s (budget {args.budget:.3f} s)")
+    print("slowest:   " + ", ".join(f"{name} {seconds:.3f} s" for name, seconds in slowest_imports(5)))
+    print(f"eager:     {', '.join(eager) if eager else 'none of ' + ', '.join(LAZY)}")
+
+    if median > args.budget or eager:
+        print("FAILED")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""Benchmark peak memory of fetching a playlist with and without page projection.
+
+Serves synthetic playlist pages shaped like the Web API responses (available
+markets, images, external URLs, full album objects) and measures the peak RSS
+of collecting a playlist of ``--tracks`` tracks and building its metadata
+frame, once keeping the raw items and once projecting every page onto
+``TrackRecord`` as it arrives. Each mode runs in its own process so the peaks
+do not mask each other. No network access is needed. Unix only.
+
+Usage
+-----
+    python benchmarks/bench_memory.py --tracks 10000
+"""
+import os
+import sys
+import json
+import resource
+import argparse
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MARKETS = [a + b for a in "ABCDEFGHIJKLMNO" for b in "ABCDEFGHIJKL"][:185]
+
+
+def synthetic_item(i):
+    """Return a playlist item shaped like the ones of ``playlist_tracks``."""
+    artist = {'external_urls': {'spotify': f"https://open.spotify.com/artist/artist{i % 5000}"},
+              'href': f"https://api.spotify.com/v1/artists/artist{i % 5000}", 'id': f"artist{i % 5000}",
+              'name': f"Artist {i % 5000}", 'type': 'artist', 'uri': f"spotify:artist:artist{i % 5000}"}
+    album = {'album_type': 'album', 'artists': [artist], 'available_markets': list(MARKETS),
+             'external_urls': {'spotify': f"https://open.spotify.com/album/album{i}"},
+             'href': f"https://api.spotify.com/v1/albums/album{i}", 'id': f"album{i}",
+             'images': [{'height': size, 'width': size, 'url': f"https://i.scdn.co/image/{size}{i:032d}"}
+                        for size in (640, 300, 64)],
+             'name': f"Album {i}", 'release_date': f"{1960 + i % 60}-0{1 + i % 9}-1{i % 10}",
+             'release_date_precision': 'day', 'total_tracks': 12, 'type': 'album', 'uri': f"spotify:album:album{i}"}
+    track = {'album': album, 'artists': [artist], 'available_markets': list(MARKETS), 'disc_number': 1,
+             'duration_ms': 120000 + i % 240000, 'episode': False, 'explicit': bool(i % 2),
+             'external_ids': {'isrc': f"USRC1{i:07d}"},
+             'external_urls': {'spotify': f"https://open.spotify.com/track/track{i}"},
+             'href': f"https://api.spotify.com/v1/tracks/track{i}", 'id': f"track{i}", 'is_local': False,
+             'name': f"Song {i}", 'popularity': i % 100, 'preview_url': f"https://p.scdn.co/mp3-preview/{i:040d}",
+             'track': True, 'track_number': 1 + i % 12, 'type': 'track', 'uri': f"spotify:track:track{i}"}
+    return {'added_at': "2023-01-01T00:00:00Z",
+            'added_by': {'external_urls': {'spotify': "https://open.spotify.com/user/someone"},
+                         'href': "https://api.spotify.com/v1/users/someone", 'id': 'someone',
+                         'type': 'user', 'uri': "spotify:user:someone"},
+            'is_local': False, 'primary_color': None, 'track': track, 'video_thumbnail': {'url': None}}
+
+
+def fake_fetch(n_tracks):
+    """Return a ``fetch(offset, limit)`` that decodes a fresh JSON page on every call, like a real response."""
+    def fetch(offset, limit):
+        items = [synthetic_item(i) for i in range(offset, min(offset + limit, n_tracks))]
+        page = {'items': items, 'total': n_tracks, 'limit': limit, 'offset': offset,
+                'next': None if offset + limit >= n_tracks else f"?offset={offset + limit}"}
+        return json.loads(json.dumps(page))
+    return fetch
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(mode, n_tracks):
+    """Collect the playlist in one mode and print the RSS before and at peak, in MB."""
+    import pandas as pd
+    from TuneInsight import TRACK_FIELDS, TrackRecord, paginate, tracks_to_frame
+
+    fetch = fake_fetch(n_tracks)
+    baseline = peak_rss_mb()
+
+    if mode == 'raw':
+        # The items were kept whole until the frame was built.
+        data = paginate(fetch, limit=100)
+        tracks = [item['track'] for item in data]
+        df = pd.DataFrame.from_records(
+            [(track['id'], track['name'], track['artists'][0]['name'], track['album']['name'],
+              track['album']['release_date'], track['is_local'], track['explicit'], track['popularity'],
+              track['duration_ms']/60000) for track in tracks],
+            columns=TRACK_FIELDS
+        )
+    else:
+        tracks = paginate(fetch, limit=100, project=TrackRecord.from_item)
+        df = tracks_to_frame(tracks)
+
+    print(f"{baseline:.1f} {peak_rss_mb():.1f} {len(df)}")
+
+
+def measure(mode, n_tracks):
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), '--tracks', str(n_tracks), '--mode', mode],
+                            check=True, capture_output=True, text=True).stdout.split()
+    baseline, peak, rows = float(output[0]), float(output[1]), int(output[2])
+    return baseline, peak, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tracks', type=int, default=10000, help="number of synthetic tracks in the playlist")
+    parser.add_argument('--mode', choices=['raw', 'slim'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run(args.mode, args.tracks)
+        return
+
+    raw = measure('raw', args.tracks)
+    slim = measure('slim', args.tracks)
+
+    print(f"tracks:    {args.tracks}")
+    print(f"raw:       peak {raw[1]:.1f} MB (+{raw[1] - raw[0]:.1f} MB over imports)")
+    print(f"projected: peak {slim[1]:.1f} MB (+{slim[1] - slim[0]:.1f} MB over imports)")
+    print(f"reduction: {(raw[1] - raw[0]) / max(slim[1] - slim[0], 0.1):.1f}x less memory growth")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark SimilarityIndex queries against a brute-force pandas scan.
+
+Builds an index of ``--tracks`` synthetic tracks in chunks, as successive
+playlists would be added, then times ``similar_tracks`` and
+``similar_to_playlist`` and checks the neighbours against a pandas scan over
+the standardized feature columns.
+
+Usage
+-----
+    python benchmarks/bench_similarity.py --tracks 1000000 --queries 50
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from TuneInsight import AUDIO_FEATURES, SimilarityIndex
+
+
+def corpus(n, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.random((n, len(AUDIO_FEATURES)), dtype='float32'), columns=AUDIO_FEATURES)
+    df['key'] = rng.integers(0, 12, n)
+    df['mode'] = rng.integers(0, 2, n)
+    df['loudness'] = -60 * df['loudness']
+    df['tempo'] = 60 + 140 * df['tempo']
+    df.insert(0, 'id', [f"{i:022d}" for i in range(n)])
+    df['playlist'] = [f"playlist {i // 100}" for i in range(n)]
+    return df
+
+
+def timed(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return result, 1000 * float(np.median(times))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tracks', type=int, default=1_000_000)
+    parser.add_argument('--chunk', type=int, default=100_000, help="tracks added per call")
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--k', type=int, default=10)
+    args = parser.parse_args()
+
+    df = corpus(args.tracks)
+    index = SimilarityIndex()
+    start = time.perf_counter()
+    for offset in range(0, args.tracks, args.chunk):
+        index.add(df.iloc[offset:offset + args.chunk])
+    added = time.perf_counter() - start
+    _, first = timed(lambda: index.similar_tracks(df['id'].iat[0], k=args.k), 1)
+
+    rng = np.random.default_rng(1)
+    track_ids = df['id'].to_numpy()[rng.integers(0, args.tracks, args.queries)]
+    _, track_ms = timed(lambda: [index.similar_tracks(track_id, k=args.k) for track_id in track_ids], 1)
+    playlist_ids = [f"playlist {i}" for i in rng.integers(0, args.tracks // 100, args.queries)]
+    _, playlist_ms = timed(lambda: [index.similar_to_playlist(playlist_id, k=args.k) for playlist_id in playlist_ids], 1)
+
+    features = df.set_index('id')[AUDIO_FEATURES].astype('float64')
+    features = (features - features.mean()) / features.std(ddof=0)
+    expected, scan_ms = timed(lambda: np.sqrt(((features - features.loc[track_ids[0]]) ** 2).sum(axis=1))
+                              .drop(track_ids[0]).nsmallest(args.k), 3)
+    assert list(index.similar_tracks(track_ids[0], k=args.k)['id']) == list(expected.index), "neighbours differ"
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "index.pkl")
+        _, save_ms = timed(lambda: index.save(path), 1)
+        size = os.path.getsize(path) / 1e6
+        _, load_ms = timed(lambda: SimilarityIndex.load(path), 1)
+
+    print(f"tracks:                 {len(index):,} (added in {added:.2f}s, first query {first:.0f} ms)")
+    print(f"similar_tracks:         {track_ms / args.queries:.1f} ms per query")
+    print(f"similar_to_playlist:    {playlist_ms / args.queries:.1f} ms per query")
+    print(f"pandas scan:            {scan_ms:.0f} ms per query, same neighbours")
+    print(f"save / load:            {save_ms:.0f} ms / {load_ms:.0f} ms, {size:.0f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,282 @@
+"""A local stand-in for the Spotify Web API, for offline benchmarks.
+
+Serves synthetic playlists, tracks, artists, audio features, top tracks, saved
+tracks and saved episodes over HTTP, shaped like the real responses, with
+optional latency and 429 throttling. Everything is generated deterministically
+from indexes, so any size from a hundred to a hundred thousand tracks starts
+instantly.
+
+Point a spotipy client at it through its ``prefix``::
+
+    server = FakeSpotify(playlists=[100, 1000]).start()
+    client = spotipy.Spotify(auth='offline', requests_session=SpotifyTransport.session())
+    client.prefix = server.prefix
+
+Usage
+-----
+    python benchmarks/fake_spotify.py --playlists 1000,10000 --latency 0.02 --throttle 0.05
+"""
+import json
+import random
+import argparse
+import threading
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MARKETS = [a + b for a in "ABCDEFGHIJKLMNO" for b in "ABCDEFGHIJKL"][:185]
+TIME_RANGES = ['short_term', 'medium_term', 'long_term']
+GENRES = ["pop", "rock", "indie", "hip hop", "jazz", "techno", "folk", "soul", "metal", "classical"]
+
+
+def endpoint_name(path):
+    """Return the endpoint of a request path with its IDs replaced by ``{id}``, e.g. ``playlists/{id}/tracks``."""
+    parts = [part for part in path.split('/') if part][1:]
+    return '/'.join('{id}' if i and parts[i - 1] in ('playlists', 'users') else part for i, part in enumerate(parts))
+
+
+class FakeSpotify:
+    """
+    FakeSpotify generates the catalog and runs the HTTP server.
+
+    Attributes:
+        playlists (list): Number of tracks of every playlist.
+        top_tracks (int): Number of top tracks of the user.
+        saved_tracks (int): Number of saved tracks of the user.
+        episodes (int): Number of saved episodes of the user.
+        latency (float): Seconds added to every response.
+        throttle (float): Probability that a request is answered with 429.
+        throttle_next (int): Number of upcoming requests answered with 429 whatever ``throttle``.
+        retry_after (float): ``Retry-After`` of throttled responses, in seconds.
+        calls (dict): Number of requests per endpoint, throttled ones included.
+        throttled (int): Number of requests answered with 429.
+        prefix (str): Base URL to give to spotipy, once started.
+    """
+
+    def __init__(self, playlists=(100, 1000), top_tracks=100, saved_tracks=1000, episodes=50, latency=0.0,
+                 throttle=0.0, retry_after=0, seed=0):
+        self.playlists = list(playlists)
+        self.top_tracks = top_tracks
+        self.saved_tracks = saved_tracks
+        self.episodes = episodes
+        self.latency = latency
+        self.throttle = throttle
+        self.throttle_next = 0
+        self.retry_after = retry_after
+        self.calls = {}
+        self.throttled = 0
+        self.prefix = None
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        # Consecutive playlists share half of their tracks, so union and cache paths get exercised.
+        self._offsets = [sum(self.playlists[:i]) // 2 for i in range(len(self.playlists))]
+        self.catalog = max([offset + size for offset, size in zip(self._offsets, self.playlists)] +
+                           [self.top_tracks, self.saved_tracks, 1])
+        self.artists = max(10, self.catalog // 5)
+
+    def start(self, host='127.0.0.1', port=0):
+        """Start serving in a background thread and return self."""
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        self.prefix = f"http://{host}:{self._server.server_port}/v1/"
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def reset(self):
+        """Clear the request counters."""
+        with self._lock:
+            self.calls = {}
+            self.throttled = 0
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def playlist_id(self, p):
+        return f"p{p:021d}"
+
+    def track_id(self, i):
+        return f"{i:022d}"
+
+    def artist(self, a):
+        return {'external_urls': {'spotify': f"https://open.spotify.com/artist/a{a:021d}"},
+                'href': f"https://api.spotify.com/v1/artists/a{a:021d}", 'id': f"a{a:021d}",
+                'name': f"Artist {a}", 'type': 'artist', 'uri': f"spotify:artist:a{a:021d}"}
+
+    def track(self, i):
+        artist = self.artist(i % self.artists)
+        album = {'album_type': 'album', 'artists': [artist], 'available_markets': MARKETS,
+                 'external_urls': {'spotify': f"https://open.spotify.com/album/b{i:021d}"},
+                 'href': f"https://api.spotify.com/v1/albums/b{i:021d}", 'id': f"b{i:021d}",
+                 'images': [{'height': size, 'width': size, 'url': f"https://i.scdn.co/image/{size}{i:032d}"}
+                            for size in (640, 300, 64)],
+                 'name': f"Album {i // 10}",
+                 # Every precision the API reports, plus the occasional invalid date.
+                 'release_date': ["0000", f"{1960 + i % 60}", f"{1960 + i % 60}-0{1 + i % 9}"][i % 3] if i % 10 == 0
+                 else f"{1960 + i % 60}-0{1 + i % 9}-1{i % 10}",
+                 'release_date_precision': 'day', 'total_tracks': 10, 'type': 'album',
+                 'uri': f"spotify:album:b{i:021d}"}
+        return {'album': album, 'artists': [artist], 'available_markets': MARKETS, 'disc_number': 1,
+                'duration_ms': 120000 + i * 7919 % 240000, 'episode': False, 'explicit': bool(i % 2),
+                'external_ids': {'isrc': f"USRC1{i:07d}"},
+                'external_urls': {'spotify': f"https://open.spotify.com/track/{self.track_id(i)}"},
+                'href': f"https://api.spotify.com/v1/tracks/{self.track_id(i)}", 'id': self.track_id(i),
+                'is_local': False, 'name': f"Song {i}", 'popularity': i % 100,
+                'preview_url': f"https://p.scdn.co/mp3-preview/{i:040d}", 'track': True,
+                'track_number': 1 + i % 10, 'type': 'track', 'uri': f"spotify:track:{self.track_id(i)}"}
+
+    def audio_features(self, track_id):
+        i = int(track_id)
+        if i % 97 == 0:
+            return None
+        return {'danceability': (i % 100) / 100, 'energy': (i * 7 % 100) / 100, 'key': i % 12,
+                'loudness': -(i % 600) / 10, 'mode': i % 2, 'speechiness': (i % 50) / 50,
+                'acousticness': (i % 40) / 40, 'instrumentalness': (i % 30) / 30, 'liveness': (i % 20) / 20,
+                'valence': (i % 10) / 10, 'tempo': 60 + i % 140, 'type': 'audio_features', 'id': track_id,
+                'uri': f"spotify:track:{track_id}", 'track_href': f"https://api.spotify.com/v1/tracks/{track_id}",
+                'analysis_url': f"https://api.spotify.com/v1/audio-analysis/{track_id}",
+                'duration_ms': 120000 + i * 7919 % 240000, 'time_signature': 4}
+
+    def episode(self, i):
+        show = {'name': f"Show {i % 7}", 'publisher': f"Publisher {i % 3}", 'id': f"s{i % 7:021d}"}
+        return {'id': f"e{i:021d}", 'name': f"Episode {i}", 'duration_ms': 600000 + i * 1000,
+                'language': ['en', 'fr', 'de'][i % 3], 'release_date': f"2023-0{1 + i % 9}-1{i % 10}",
+                'explicit': bool(i % 5 == 0), 'show': show, 'description': "x" * 200}
+
+    def saved(self, offset, limit, total):
+        """Return the numbers of the saved items on a page, the n-th saved item being numbered n."""
+        return range(total - 1 - offset, max(total - offset - limit, 0) - 1, -1)
+
+    def saved_at(self, n):
+        """Return the ``added_at`` of the n-th saved item, one hour after the previous one."""
+        return (datetime(2023, 1, 1, tzinfo=timezone.utc) + timedelta(hours=n)).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+    def snapshot_id(self, p):
+        """Return the snapshot of a playlist, which changes whenever its size does."""
+        return f"snapshot{p}.{self.playlists[p]}"
+
+    def page(self, url, items, total, offset, limit):
+        more = offset + limit < total
+        return {'href': url, 'items': items, 'limit': limit, 'offset': offset, 'total': total, 'previous': None,
+                'next': f"{url.split('?')[0]}?offset={offset + limit}&limit={limit}" if more else None}
+
+    def playlist_tracks(self, p, offset, limit):
+        start, size = self._offsets[p], self.playlists[p]
+        return [{'added_at': f"2023-01-{1 + j % 28:02d}T00:00:00Z",
+                 'added_by': {'id': 'someone', 'type': 'user', 'uri': "spotify:user:someone"},
+                 'is_local': False, 'primary_color': None, 'track': self.track(start + j),
+                 'video_thumbnail': {'url': None}}
+                for j in range(offset, min(offset + limit, size))]
+
+    def respond(self, path, query, url):
+        """Return the status and body of a request."""
+        parts = [part for part in path.split('/') if part][1:]
+        offset = int(query.get('offset', ['0'])[0])
+        limit = int(query.get('limit', ['20'])[0])
+        ids = [i for i in query.get('ids', [''])[0].split(',') if i]
+
+        if parts == ['me', 'playlists'] or (len(parts) == 3 and parts[0] == 'users' and parts[2] == 'playlists'):
+            items = [{'id': self.playlist_id(p), 'name': f"Playlist {p}", 'snapshot_id': self.snapshot_id(p),
+                      'tracks': {'total': size}} for p, size in enumerate(self.playlists)][offset:offset + limit]
+            return 200, self.page(url, items, len(self.playlists), offset, limit)
+        if len(parts) == 2 and parts[0] == 'playlists':
+            p = int(parts[1][1:])
+            return 200, {'name': f"Playlist {p}", 'snapshot_id': self.snapshot_id(p)}
+        if len(parts) == 3 and parts[0] == 'playlists' and parts[2] == 'tracks':
+            p = int(parts[1][1:])
+            return 200, self.page(url, self.playlist_tracks(p, offset, limit), self.playlists[p], offset, limit)
+        if parts == ['me', 'top', 'tracks']:
+            # The rankings of the time ranges overlap but are shifted, like real listening histories.
+            shift = TIME_RANGES.index(query.get('time_range', ['medium_term'])[0]) * self.top_tracks // 4
+            items = [self.track(shift + i) for i in range(offset, min(offset + limit, self.top_tracks))]
+            return 200, self.page(url, items, self.top_tracks, offset, limit)
+        # Saved items come newest first, so raising saved_tracks or episodes saves new items on top of the library.
+        if parts == ['me', 'tracks']:
+            items = [{'added_at': self.saved_at(n), 'track': self.track(n)}
+                     for n in self.saved(offset, limit, self.saved_tracks)]
+            return 200, self.page(url, items, self.saved_tracks, offset, limit)
+        if parts == ['me', 'episodes']:
+            items = [{'added_at': self.saved_at(n), 'episode': self.episode(n)}
+                     for n in self.saved(offset, limit, self.episodes)]
+            return 200, self.page(url, items, self.episodes, offset, limit)
+        if parts == ['artists']:
+            return 200, {'artists': [dict(self.artist(int(a[1:])), genres=[GENRES[int(a[1:]) % len(GENRES)]],
+                                          popularity=50, followers={'total': 1000}) for a in ids]}
+        if parts == ['audio-features']:
+            return 200, {'audio_features': [self.audio_features(i) for i in ids]}
+        return 404, {'error': {'status': 404, 'message': "Not found"}}
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body are written separately; without this, delayed ACKs add ~40 ms per keep-alive request.
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                endpoint = endpoint_name(parsed.path)
+                with fake._lock:
+                    fake.calls[endpoint] = fake.calls.get(endpoint, 0) + 1
+                    throttled = fake.throttle_next > 0 or (fake.throttle and fake._random.random() < fake.throttle)
+                    fake.throttle_next = max(fake.throttle_next - 1, 0)
+                    fake.throttled += bool(throttled)
+                if fake.latency:
+                    threading.Event().wait(fake.latency)
+
+                if throttled:
+                    status, body, headers = 429, {'error': {'status': 429, 'message': "API rate limit exceeded"}}, {
+                        'Retry-After': str(fake.retry_after)}
+                else:
+                    status, body = fake.respond(parsed.path.rstrip('/'), parse_qs(parsed.query),
+                                                f"http://{self.headers['Host']}{self.path}")
+                    headers = {}
+
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--playlists', default="100,1000", help="comma-separated playlist sizes")
+    parser.add_argument('--top-tracks', type=int, default=100)
+    parser.add_argument('--saved-tracks', type=int, default=1000)
+    parser.add_argument('--episodes', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument('--throttle', type=float, default=0.0, help="probability of a 429 response")
+    parser.add_argument('--retry-after', type=int, default=0)
+    parser.add_argument('--port', type=int, default=8900)
+    args = parser.parse_args()
+
+    fake = FakeSpotify([int(size) for size in args.playlists.split(',')], args.top_tracks, args.saved_tracks,
+                       args.episodes, args.latency, args.throttle, args.retry_after)
+    fake.start(port=args.port)
+    print(f"Serving {fake.catalog} tracks on {fake.prefix}", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        fake.stop()
+
+
+if __name__ == '__main__':
+    main()
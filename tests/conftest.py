@@ -0,0 +1,36 @@
+"""Fixtures that run TuneInsight against the local fake Spotify API in ``benchmarks/fake_spotify.py``."""
+import os
+import sys
+
+import pytest
+import spotipy
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'benchmarks')]
+
+from fake_spotify import FakeSpotify
+from TuneInsight import SpotifyTransport, TuneInsight
+
+
+@pytest.fixture
+def fake(request):
+    """Run the fake API; indirect parametrization overrides its catalog, e.g. ``{'playlists': []}``."""
+    catalog = dict(playlists=[120, 300], top_tracks=130, saved_tracks=260, episodes=120)
+    catalog.update(getattr(request, 'param', {}))
+    with FakeSpotify(**catalog) as server:
+        yield server
+
+
+@pytest.fixture
+def client(fake):
+    client = spotipy.Spotify(auth='offline', requests_session=SpotifyTransport.session())
+    client.prefix = fake.prefix
+    return client
+
+
+@pytest.fixture
+def insight(client, tmp_path):
+    """Return a factory of TuneInsight instances of the user ``tester`` on the fake API, writing under ``tmp_path``."""
+    def insight(**kwargs):
+        return TuneInsight(user='tester', sp=client, project_dir=str(tmp_path), **kwargs)
+    return insight
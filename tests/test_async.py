@@ -0,0 +1,82 @@
+"""Tests of the asyncio engine."""
+import asyncio
+import time
+
+import pandas as pd
+
+from TuneInsight import AsyncTuneInsight, GenreResolver
+
+
+class CountingAuth:
+    """Auth manager handing out a new token on every call, cached like spotipy's with an expiry."""
+
+    def __init__(self, lifetime):
+        self.lifetime = lifetime
+        self.calls = 0
+        self.cache_handler = self
+
+    def get_access_token(self, as_dict=True):
+        self.calls += 1
+        time.sleep(0.05)
+        self.token_info = {'access_token': f"token-{self.calls}", 'expires_at': time.time() + self.lifetime}
+        return self.token_info['access_token']
+
+    def get_cached_token(self):
+        return self.token_info
+
+
+def fetch_top_tracks(fake, tmp_path, auth):
+    async def fetch():
+        async with AsyncTuneInsight('tester', auth, spreadsheets_dir=str(tmp_path), api_base=fake.prefix) as ati:
+            return await ati.get_top_tracks()
+    return asyncio.run(fetch())
+
+
+def test_token_is_fetched_once_while_valid(fake, tmp_path):
+    auth = CountingAuth(lifetime=3600)
+
+    df = fetch_top_tracks(fake, tmp_path, auth)
+
+    assert len(df) > 0 and sum(fake.calls.values()) > 5
+    assert auth.calls == 1
+
+
+def test_token_is_refreshed_when_expiring(fake, tmp_path):
+    # Tokens that expire within the refresh margin are refreshed before every request.
+    auth = CountingAuth(lifetime=30)
+
+    fetch_top_tracks(fake, tmp_path, auth)
+
+    assert auth.calls == sum(fake.calls.values())
+
+
+def test_async_matches_sync(fake, insight):
+    ti = insight(store=False)
+    expected = {
+        'playlist': ti.playlist_df(playlist_id=fake.playlist_id(1)),
+        'all': ti.get_user_playlists(selection="All"),
+        'top': ti.get_top_tracks(),
+        'ranked': ti.get_top_tracks(time_range="all"),
+        'saved': ti.saved_tracks_df(),
+        'episodes': ti.get_user_episodes(),
+    }
+    sync_calls = dict(fake.calls)
+
+    async def extract():
+        async with AsyncTuneInsight.from_sync(ti, api_base=fake.prefix, genre_resolver=GenreResolver()) as ati:
+            return {
+                'playlist': await ati.playlist_df(playlist_id=fake.playlist_id(1)),
+                'all': await ati.get_user_playlists(selection="All"),
+                'top': await ati.get_top_tracks(),
+                'ranked': await ati.get_top_tracks(time_range="all"),
+                'saved': await ati.saved_tracks_df(),
+                'episodes': await ati.get_user_episodes(),
+            }
+
+    fake.reset()
+    actual = asyncio.run(extract())
+
+    for name, df in expected.items():
+        pd.testing.assert_frame_equal(actual[name], df, obj=name)
+    # Both engines request the same pages and batches.
+    assert fake.calls == sync_calls
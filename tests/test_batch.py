@@ -0,0 +1,91 @@
+"""Tests of the non-interactive batch runner."""
+import json
+import os
+
+import pytest
+
+from TuneInsight import load_frame, load_manifest, run_batch, select_playlists
+
+ROAD_TRIP = "37i9dQZF1DXcBWIGoYBM5M"
+# A playlist name that looks like a playlist ID.
+ID_LIKE_NAME = "SummerHits2024Playlist"
+
+
+def write(path, text):
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def test_load_json_manifest(tmp_path):
+    path = write(tmp_path / "manifest.json", json.dumps([
+        {"user": "spotify", "playlists": ["all"]},
+        {"user": "https://open.spotify.com/user/someone", "playlists": [ROAD_TRIP, "Road trip*"]},
+        {"user": "spotify:user:other"},
+        {"user": "someone", "playlists": " Chill* "},
+    ]))
+
+    assert load_manifest(path) == [('spotify', ['all']), ('someone', [ROAD_TRIP, 'Road trip*', 'Chill*']),
+                                   ('other', ['all'])]
+
+
+def test_load_json_mapping_manifest(tmp_path):
+    path = write(tmp_path / "manifest.json", json.dumps({"spotify": [], "someone": ["Chill*"]}))
+
+    assert load_manifest(path) == [('spotify', ['all']), ('someone', ['Chill*'])]
+
+
+def test_load_json_lines_manifest(tmp_path):
+    path = write(tmp_path / "manifest.jsonl", '{"user": "spotify"}\n\n{"user": "someone", "playlists": ["Chill*"]}\n')
+
+    assert load_manifest(path) == [('spotify', ['all']), ('someone', ['Chill*'])]
+
+
+def test_load_csv_manifest(tmp_path):
+    path = write(tmp_path / "manifest.csv", f"user,playlists\nspotify,\nsomeone,{ROAD_TRIP}; Road trip*\nspotify,Chill*\n")
+
+    assert load_manifest(path) == [('spotify', ['all', 'Chill*']), ('someone', [ROAD_TRIP, 'Road trip*'])]
+
+
+PLAYLISTS = [{'id': "p" * 22, 'name': "Road trip 2023"}, {'id': "q" * 22, 'name': ID_LIKE_NAME},
+             {'id': "r" * 22, 'name': "chill vibes"}, {'id': "s" * 22, 'name': None}]
+
+
+@pytest.mark.parametrize('selectors, expected', [
+    (['all'], ["p" * 22, "q" * 22, "r" * 22, "s" * 22]),
+    ([ROAD_TRIP], [ROAD_TRIP]),
+    ([f"https://open.spotify.com/playlist/{ROAD_TRIP}?si=abc", f"spotify:playlist:{ROAD_TRIP}"], [ROAD_TRIP]),
+    (['road TRIP*'], ["p" * 22]),
+    (['Chill*', 'Road trip*', ROAD_TRIP], ["p" * 22, "r" * 22, ROAD_TRIP]),
+    # Without the prefix, a 22-character name is taken for a playlist ID.
+    ([ID_LIKE_NAME], [ID_LIKE_NAME]),
+    ([f"name:{ID_LIKE_NAME}"], ["q" * 22]),
+    (['No such playlist'], []),
+])
+def test_select_playlists(selectors, expected):
+    assert select_playlists(PLAYLISTS, selectors) == expected
+
+
+@pytest.mark.parametrize('fake', [{'playlists': [40, 60, 80]}], indirect=True)
+def test_run_batch_resumes(fake, tmp_path):
+    manifest = write(tmp_path / "manifest.json", json.dumps([
+        {"user": "alice", "playlists": ["all"]},
+        {"user": "bob", "playlists": ["name:Playlist 1", fake.playlist_id(2)]},
+    ]))
+    output_dir = tmp_path / "exports"
+    options = dict(processes=2, format='parquet', token='offline', api_prefix=fake.prefix, store=False, dropna=False)
+
+    first = run_batch(manifest, str(output_dir), **options)
+
+    assert first['playlists'] == first['exported'] == 5 and first['skipped'] == 0 and first['failed'] == []
+    assert first['rows'] == 40 + 60 + 80 + 60 + 80
+    assert sorted(os.listdir(output_dir / "bob")) == [f"{fake.playlist_id(p)}.parquet" for p in (1, 2)]
+    assert len(load_frame(str(output_dir / "alice" / f"{fake.playlist_id(2)}.parquet"))) == 80
+
+    # Only the playlist whose export is missing is fetched again.
+    os.remove(output_dir / "alice" / f"{fake.playlist_id(0)}.parquet")
+    fake.reset()
+    resumed = run_batch(manifest, str(output_dir), **options)
+
+    assert resumed['skipped'] == 4 and resumed['exported'] == 1 and resumed['rows'] == 40
+    assert fake.calls['playlists/{id}/tracks'] == 1 and fake.calls['users/{id}/playlists'] == 2
+    assert not any(name.endswith('.part') for name in os.listdir(output_dir / "alice"))
@@ -0,0 +1,47 @@
+"""Tests of the vectorized release-date parsing."""
+import pandas as pd
+import pytest
+
+from TuneInsight import parse_release_dates
+
+
+@pytest.mark.parametrize('date, expected, precision', [
+    ("1999", "1999-01-01", 'year'),
+    ("1999-07", "1999-07-01", 'month'),
+    ("1999-07-23", "1999-07-23", 'day'),
+    ("2024-02-29", "2024-02-29", 'day'),
+])
+def test_parse_release_dates_precisions(date, expected, precision):
+    parsed, precisions = parse_release_dates(pd.Series([date]))
+
+    assert parsed[0] == pd.Timestamp(expected)
+    assert precisions[0] == precision
+
+
+@pytest.mark.parametrize('date', ["0000", "1999-13", "2023-02-29", "", None])
+def test_parse_release_dates_invalid(date):
+    parsed, precisions = parse_release_dates(pd.Series([date], dtype=object))
+
+    assert pd.isna(parsed[0]) and precisions[0] is None
+
+
+def test_parse_release_dates_mixed_precisions():
+    dates = pd.Series(["1987", "1987-05", "1987-05-04", "0000", None], index=list("abcde"), dtype=object)
+
+    parsed, precisions = parse_release_dates(dates)
+
+    assert parsed.dtype == 'datetime64[ns]'
+    assert list(parsed.index) == list(precisions.index) == list("abcde")
+    assert list(parsed[:3]) == [pd.Timestamp("1987-01-01"), pd.Timestamp("1987-05-01"), pd.Timestamp("1987-05-04")]
+    assert parsed[3:].isna().all()
+    assert list(precisions) == ['year', 'month', 'day', None, None]
+
+
+def test_playlist_release_date_precision(fake, insight):
+    df = insight().playlist_df(playlist_id=fake.playlist_id(0), dropna=False, date_precision=True)
+
+    assert set(df['release_date_precision'].dropna()) == {'year', 'month', 'day'}
+    # "0000" dates of the fake catalog parse to NaT and carry no precision.
+    assert (df['release_date'].isna() == df['release_date_precision'].isna()).all()
+    assert df.columns.get_loc('release_date_precision') == df.columns.get_loc('release_date') + 1
+    assert df['release_date'].dtype == 'datetime64[ns]'
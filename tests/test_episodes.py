@@ -0,0 +1,40 @@
+"""Tests of the paginated, incremental saved-episodes export."""
+import os
+
+import pandas as pd
+
+from TuneInsight import StatsObserver, load_frame
+
+
+def test_episodes_are_refreshed_incrementally(fake, insight):
+    stats = StatsObserver()
+    ti = insight(observer=stats, summaries=True)
+    path = os.path.join(ti.spreadsheets_dir, "tester's_saved_episodes.csv")
+    first = ti.get_user_episodes(to_csv=True)
+
+    fake.episodes = 135
+    fake.reset()
+    stats.reset()
+    refreshed = ti.get_user_episodes(to_csv=True)
+
+    assert fake.calls == {'me/episodes': 1}
+    assert len(refreshed) == 135 and refreshed['id'].is_unique
+    pd.testing.assert_frame_equal(refreshed.iloc[:120], first)
+    assert list(refreshed['id'].iloc[120:]) == [f"e{n:021d}" for n in range(134, 119, -1)]
+    pd.testing.assert_frame_equal(load_frame(path), refreshed)
+    assert stats.stages['summaries']['rows'] == 15
+    stats_table = ti.summaries.tables()['feature_stats'].set_index(['source', 'feature'])
+    assert stats_table.loc[('saved_episodes', 'duration_min'), 'count'] == 135
+
+    fake.reset()
+    stats.reset()
+    assert len(ti.get_user_episodes(to_csv=True)) == 135
+    assert fake.calls == {'me/episodes': 1}
+    assert 'summaries' not in stats.stages
+
+
+def test_episodes_without_export_are_fetched_in_full(fake, insight):
+    df = insight().get_user_episodes()
+
+    assert len(df) == 120 and df['id'].is_unique
+    assert fake.calls == {'me/episodes': 3}
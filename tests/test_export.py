@@ -0,0 +1,77 @@
+"""Tests of the compact Parquet and Feather exports."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from TuneInsight import AUDIO_FEATURES, INTEGER_COLUMNS, compact_dtypes, load_frame, save_frame
+
+
+@pytest.fixture
+def tracks():
+    return pd.DataFrame({
+        'id': ["a", "b", "c", "d"],
+        'songs': ["Song a", "Song b", "Song c", "Song d"],
+        'playlist': ["Mix", "Mix", "Road trip", "Mix"],
+        'genre': ["pop", "rock", None, "pop"],
+        'release_date': ["1999-07-23", "2001-01-01", None, "1987-05-04"],
+        'explicit': [True, False, True, False],
+        'popularity': [10.0, 55.0, 0.0, 100.0],
+        'key': [1.0, np.nan, 11.0, 0.0],
+        'mode': [0.0, 1.0, 1.0, 0.0],
+        'duration_min': [3.5, 4.25, 2.0, 7.125],
+        'energy': [0.1, 0.25, np.nan, 0.9],
+    })
+
+
+def test_compact_dtypes(tracks):
+    df = compact_dtypes(tracks)
+
+    assert df['playlist'].dtype == 'category' and df['genre'].dtype == 'category'
+    assert df['popularity'].dtype == 'int8' and df['mode'].dtype == 'int8' and df['key'].dtype == 'Int8'
+    assert df['duration_min'].dtype == 'float32' and df['energy'].dtype == 'float32'
+    assert df['release_date'].dtype == 'datetime64[ns]' and df['id'].dtype == object and df['explicit'].dtype == bool
+    assert list(df['key']) == [1, pd.NA, 11, 0]
+    assert df['release_date'].iloc[0] == pd.Timestamp("1999-07-23") and pd.isna(df['release_date'].iloc[2])
+
+
+def test_compact_dtypes_keeps_partial_release_dates(tracks):
+    tracks.loc[1, 'release_date'] = "2001"
+
+    df = compact_dtypes(tracks)
+
+    assert df['release_date'].dtype == object and df['release_date'].iloc[1] == "2001"
+
+
+@pytest.mark.parametrize('format', ['parquet', 'feather'])
+@pytest.mark.parametrize('memory_map', [True, False])
+def test_round_trip_keeps_dtypes_and_values(tracks, tmp_path, format, memory_map):
+    path = str(tmp_path / f"tracks.{format}")
+
+    save_frame(tracks, path)
+    df = load_frame(path, memory_map=memory_map)
+
+    expected = compact_dtypes(tracks)
+    pd.testing.assert_frame_equal(df, expected)
+    assert dict(df.dtypes) == dict(expected.dtypes)
+    np.testing.assert_array_equal(df['energy'].to_numpy(), np.float32([0.1, 0.25, np.nan, 0.9]))
+
+
+@pytest.mark.parametrize('format', ['parquet', 'feather'])
+def test_exported_playlist_round_trip(fake, insight, format):
+    ti = insight(store=False)
+    df = ti.playlist_df(playlist_id=fake.playlist_id(1), to_csv=True, format=format, date_precision=True)
+
+    loaded = load_frame(f"{ti.spreadsheets_dir}/Playlist 1_playlist.{format}")
+
+    pd.testing.assert_frame_equal(loaded, compact_dtypes(df))
+    assert loaded['genre'].dtype == 'category' and (loaded[INTEGER_COLUMNS].dtypes == 'int8').all()
+    assert (loaded[[feature for feature in AUDIO_FEATURES if feature not in INTEGER_COLUMNS]].dtypes == 'float32').all()
+    np.testing.assert_allclose(loaded[AUDIO_FEATURES], df[AUDIO_FEATURES], rtol=1e-6)
+
+
+def test_load_frame_selects_columns(tracks, tmp_path):
+    save_frame(tracks, str(tmp_path / "tracks.parquet"))
+
+    df = load_frame(str(tmp_path / "tracks.parquet"), columns=['id', 'energy'])
+
+    assert list(df.columns) == ['id', 'energy'] and df['energy'].dtype == 'float32'
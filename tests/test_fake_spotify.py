@@ -0,0 +1,51 @@
+"""Tests of the fake Spotify API itself, which every other test relies on."""
+import pytest
+import requests
+
+from fake_spotify import endpoint_name
+
+
+def get(fake, path, **params):
+    return requests.get(fake.prefix + path, params=params, timeout=5)
+
+
+def test_endpoint_name():
+    assert endpoint_name("/v1/playlists/p000000000000000000000/tracks") == 'playlists/{id}/tracks'
+    assert endpoint_name("/v1/users/tester/playlists") == 'users/{id}/playlists'
+    assert endpoint_name("/v1/me/top/tracks") == 'me/top/tracks'
+
+
+def test_pages_cover_every_item_once(fake):
+    ids, path = [], f"playlists/{fake.playlist_id(1)}/tracks"
+    page = get(fake, path, limit=100).json()
+    while True:
+        ids += [item['track']['id'] for item in page['items']]
+        if not page['next']:
+            break
+        page = requests.get(page['next'], timeout=5).json()
+
+    assert page['total'] == 300
+    assert ids == [fake.track_id(i) for i in range(60, 360)]
+    assert fake.calls == {'playlists/{id}/tracks': 3}
+
+
+def test_saved_items_are_newest_first(fake):
+    first = get(fake, "me/episodes", limit=5).json()['items']
+    fake.episodes += 2
+    grown = get(fake, "me/episodes", limit=5).json()['items']
+
+    assert [item['episode']['id'] for item in grown[2:]] == [item['episode']['id'] for item in first[:3]]
+    assert grown[0]['added_at'] > first[0]['added_at']
+
+
+@pytest.mark.parametrize('path', ["me/tracks", "audio-features"])
+def test_throttle_next_answers_429_with_retry_after(fake, path):
+    fake.throttle_next, fake.retry_after = 2, 3
+
+    responses = [get(fake, path, ids=fake.track_id(0)) for _ in range(3)]
+
+    assert [response.status_code for response in responses] == [429, 429, 200]
+    assert responses[0].headers['Retry-After'] == "3"
+    assert fake.throttled == 2 and fake.calls[path] == 3
+    fake.reset()
+    assert fake.calls == {} and fake.throttled == 0
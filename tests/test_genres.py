@@ -0,0 +1,25 @@
+"""Tests of the batched artist-genre resolver."""
+from fake_spotify import GENRES
+from TuneInsight import GenreResolver
+
+
+def test_genre_resolver_more_artists_than_maxsize(fake, client):
+    resolver = GenreResolver(maxsize=100)
+    artists = [[fake.artist(a)['id']] for a in range(150)]
+
+    genres = resolver.resolve(client, artists)
+
+    assert genres == [GENRES[a % len(GENRES)] for a in range(150)]
+    assert len(resolver) == 100
+    assert fake.calls['artists'] == 3
+
+
+def test_genre_resolver_reuses_cached_artists(fake, client):
+    resolver = GenreResolver()
+    resolver.resolve(client, [[fake.artist(a)['id']] for a in range(60)])
+
+    fake.reset()
+    genres = resolver.resolve(client, [[fake.artist(a)['id']] for a in range(40, 80)])
+
+    assert genres == [GENRES[a % len(GENRES)] for a in range(40, 80)]
+    assert fake.calls == {'artists': 1}
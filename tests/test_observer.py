@@ -0,0 +1,42 @@
+"""Tests of the observer events reported by the extractions."""
+from collections import Counter
+
+from TuneInsight import Observer, StatsObserver, write_chunks
+
+
+class RecordingObserver(Observer):
+    def __init__(self):
+        self.starts, self.steps, self.running = Counter(), Counter(), Counter()
+
+    def start(self, stage, total=None):
+        self.starts[stage] += 1
+        self.running[stage] += 1
+
+    def advance(self, stage, steps=1):
+        self.steps[stage] += steps
+
+    def end(self, stage, duration, **counts):
+        self.running[stage] -= 1
+
+
+def test_streams_report_each_stage_once(fake, insight, tmp_path):
+    observer = RecordingObserver()
+    ti = insight(observer=observer)
+
+    chunks = ti.iter_playlist_chunks(playlist_id=fake.playlist_id(1), chunk_size=100)
+    rows = write_chunks(chunks, str(tmp_path / "playlist.csv"), observer=observer)
+
+    assert rows > 0
+    assert set(observer.starts.values()) == {1}
+    assert {'pagination', 'store', 'genres', 'audio_features', 'dates', 'write'} <= set(observer.starts)
+    assert observer.steps['pagination'] == 3 and observer.steps['store'] == 3 and observer.steps['write'] == 3
+    assert not any(observer.running.values())
+
+
+def test_stats_observer_counts_requests(fake, insight):
+    stats = StatsObserver()
+
+    insight(observer=stats, store=False).playlist_df(playlist_id=fake.playlist_id(1))
+
+    assert stats.requests['calls'] == sum(fake.calls.values())
+    assert stats.requests['bytes'] > 0 and stats.requests['failed'] == 0
@@ -0,0 +1,39 @@
+"""Tests of the "All" mode of get_user_playlists."""
+import os
+
+import pytest
+import spotipy
+
+
+@pytest.mark.parametrize('fake', [{'playlists': []}], indirect=True)
+def test_no_playlists_give_an_empty_frame(insight):
+    ti = insight()
+
+    df = ti.get_user_playlists(selection="All", to_csv=True)
+
+    assert df.empty and {'id', 'playlist', 'genre', 'energy'} <= set(df.columns)
+    assert os.path.exists(os.path.join(ti.spreadsheets_dir, "tester's_all_playlists.csv"))
+
+
+def test_failed_playlists_give_an_empty_frame(fake, client, insight, monkeypatch, capsys):
+    def unavailable(*args, **kwargs):
+        raise spotipy.SpotifyException(404, -1, "Not found")
+    monkeypatch.setattr(client, 'playlist', unavailable)
+    monkeypatch.setattr(client, 'playlist_tracks', unavailable)
+
+    df = insight(store=False).get_user_playlists(selection="All", dropna=False)
+
+    assert df.empty and 'energy' in df.columns
+    assert capsys.readouterr().out.count("This playlist can't be retrieved") == 2
+
+
+def test_all_playlists_are_deduplicated_and_enriched_once(fake, insight):
+    ti = insight(store=False)
+
+    df = ti.get_user_playlists(selection="All", dropna=False)
+
+    # The second playlist starts halfway through the first one.
+    assert len(df) == 360 and df['id'].is_unique
+    assert list(df['id']) == [fake.track_id(i) for i in range(360)]
+    assert (df['playlist'].iloc[:120] == "Playlist 0").all() and (df['playlist'].iloc[120:] == "Playlist 1").all()
+    assert fake.calls['audio-features'] == 8
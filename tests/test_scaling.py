@@ -0,0 +1,69 @@
+"""Tests of AudioFeatureScaler and its fit-once, transform-many reuse."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from TuneInsight import AUDIO_FEATURES, AudioFeatureScaler
+
+
+def test_unfitted_scaler_skips_empty_frames():
+    scaler = AudioFeatureScaler(['standard', 'minmax'])
+    empty = pd.DataFrame(columns=['id'] + AUDIO_FEATURES, dtype='float64')
+
+    scaled = scaler.fit_transform(empty)
+
+    assert scaled.empty and not scaler.fitted
+    assert {'energy_standard', 'energy_minmax'} <= set(scaled.columns)
+    with pytest.raises(ValueError):
+        scaler.transform(pd.DataFrame({feature: [0.5] for feature in AUDIO_FEATURES}))
+
+
+@pytest.mark.parametrize('fake', [{'playlists': []}], indirect=True)
+def test_scaling_without_playlists(insight):
+    df = insight().get_user_playlists(selection="All", scale=[0, 1])
+
+    assert df.empty and {'energy', 'energy_standard', 'energy_minmax'} <= set(df.columns)
+
+
+@pytest.mark.parametrize('fake', [{'playlists': [12]}], indirect=True)
+def test_stream_fits_on_the_first_non_empty_chunk(fake, insight):
+    scaler = AudioFeatureScaler('minmax')
+    raw = insight(store=False).playlist_df(playlist_id=fake.playlist_id(0))
+
+    # The first track of the fake catalog has an invalid release date and no features: dropna empties the first chunk.
+    chunks = insight(store=False).iter_playlist_chunks(playlist_id=fake.playlist_id(0), chunk_size=1, scale=scaler)
+    chunks = list(chunks)
+
+    assert chunks[0].empty and scaler.fitted
+    assert raw['id'].iloc[0] == chunks[1]['id'].iloc[0]
+    first = raw[raw['id'].isin(chunks[1]['id'])][AUDIO_FEATURES]
+    np.testing.assert_allclose(scaler.scalers['minmax'].data_min_, first.min())
+    assert len(pd.concat(chunks)) == len(raw)
+
+
+def test_scaler_save_and_load(fake, insight, tmp_path):
+    reference = insight().playlist_df(playlist_id=fake.playlist_id(1))
+    scaler = AudioFeatureScaler(['standard', 'quantile']).fit(reference)
+    path = str(tmp_path / "reference_scaler.pkl")
+
+    scaler.save(path)
+    loaded = AudioFeatureScaler.load(path)
+
+    assert loaded.fitted and list(loaded.scalers) == ['standard', 'quantile'] and loaded.features == AUDIO_FEATURES
+    pd.testing.assert_frame_equal(loaded.transform(reference), scaler.transform(reference))
+
+
+def test_fitted_scaler_is_reused_on_new_data(fake, insight, tmp_path):
+    ti = insight()
+    reference = ti.playlist_df(playlist_id=fake.playlist_id(1))
+    AudioFeatureScaler('standard').fit(reference).save(str(tmp_path / "scaler.pkl"))
+    scaler = AudioFeatureScaler.load(str(tmp_path / "scaler.pkl"))
+
+    raw = ti.playlist_df(playlist_id=fake.playlist_id(0))
+    scaled = ti.playlist_df(playlist_id=fake.playlist_id(0), scale=scaler)
+
+    # The new playlist is scaled with the statistics of the reference one, not refitted.
+    expected = (raw[AUDIO_FEATURES] - reference[AUDIO_FEATURES].mean()) / reference[AUDIO_FEATURES].std(ddof=0)
+    np.testing.assert_allclose(scaled[AUDIO_FEATURES], expected, rtol=1e-6, atol=1e-9)
+    assert not np.allclose(scaled[AUDIO_FEATURES].mean(), 0)
+    pd.testing.assert_frame_equal(scaled.drop(columns=AUDIO_FEATURES), raw.drop(columns=AUDIO_FEATURES))
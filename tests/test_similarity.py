@@ -0,0 +1,110 @@
+"""Tests of the nearest-neighbour similarity index."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from TuneInsight import AUDIO_FEATURES, SimilarityIndex, _smallest
+
+
+def brute_force(df, query, k, exclude=()):
+    """Exact nearest neighbours of a standardized query, computed in float64."""
+    values = df[AUDIO_FEATURES].to_numpy(dtype='float32').astype('float64')
+    std = values.std(axis=0)
+    std[std == 0] = 1
+    scaled = (values - values.mean(axis=0)) / std
+    distances = np.sqrt(((scaled - query(scaled)) ** 2).sum(axis=1))
+    distances[list(exclude)] = np.inf
+    order = np.argsort(distances, kind='stable')[:k]
+    return list(df['id'].iloc[order]), distances[order]
+
+
+@pytest.fixture
+def tracks():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.random((500, len(AUDIO_FEATURES))), columns=AUDIO_FEATURES)
+    df['tempo'] *= 200
+    df['loudness'] = -60 * df['loudness']
+    df.insert(0, 'id', [f"t{i:04d}" for i in range(500)])
+    df['playlist'] = np.where(np.arange(500) < 40, "Chill", "Other")
+    return df
+
+
+@pytest.mark.parametrize('block_size', [64, 1 << 16])
+def test_similar_tracks(tracks, block_size):
+    index = SimilarityIndex(block_size=block_size).add(tracks)
+
+    result = index.similar_tracks("t0007", k=5)
+
+    ids, distances = brute_force(tracks, lambda scaled: scaled[7], 5, exclude=[7])
+    assert list(result.columns) == ['id', 'distance']
+    assert list(result['id']) == ids
+    np.testing.assert_allclose(result['distance'], distances, rtol=1e-4)
+
+
+def test_similar_to_playlist(tracks):
+    index = SimilarityIndex().add(tracks)
+
+    result = index.similar_to_playlist("Chill", k=10)
+
+    ids, distances = brute_force(tracks, lambda scaled: scaled[:40].mean(axis=0), 10, exclude=range(40))
+    assert list(result['id']) == ids
+    np.testing.assert_allclose(result['distance'], distances, rtol=1e-4)
+    assert not set(result['id']) & set(index.playlists["Chill"])
+
+
+def test_unknown_track_and_playlist(tracks):
+    index = SimilarityIndex().add(tracks)
+
+    with pytest.raises(KeyError):
+        index.similar_tracks("missing")
+    with pytest.raises(KeyError):
+        index.similar_to_playlist("missing")
+
+
+def test_add_skips_incomplete_rows_and_refreshes_tracks(tracks):
+    tracks.loc[3, 'energy'] = np.nan
+    tracks.loc[4, 'id'] = None
+    index = SimilarityIndex().add(tracks.iloc[:250]).add(tracks.iloc[250:])
+
+    moved = tracks.iloc[[10]].copy()
+    moved[AUDIO_FEATURES] = tracks.iloc[20][AUDIO_FEATURES].to_numpy()
+    index.add(moved)
+
+    assert len(index) == 498 and "t0003" not in index.ids
+    assert index.similar_tracks("t0010", k=1)['id'][0] == "t0020"
+
+
+def test_save_and_load(tracks, tmp_path):
+    index = SimilarityIndex().add(tracks.iloc[:300])
+    index.similar_tracks("t0001")
+    # Tracks added after a query are pending and must be saved as well.
+    index.add(tracks.iloc[300:], playlist="Late")
+    path = str(tmp_path / "index.pkl")
+
+    index.save(path)
+    loaded = SimilarityIndex.load(path)
+
+    assert loaded.ids == index.ids and loaded.playlists == index.playlists and len(loaded) == 500
+    pd.testing.assert_frame_equal(loaded.similar_tracks("t0450", k=10), index.similar_tracks("t0450", k=10))
+    pd.testing.assert_frame_equal(loaded.similar_to_playlist("Late"), index.similar_to_playlist("Late"))
+
+
+def test_from_store(fake, insight):
+    ti = insight()
+    ti.playlist_df(playlist_id=fake.playlist_id(0), dropna=False)
+    ti.playlist_df(playlist_id=fake.playlist_id(1), dropna=False)
+
+    index = SimilarityIndex.from_store(ti.store)
+
+    assert set(index.playlists) == {fake.playlist_id(0), fake.playlist_id(1)}
+    assert len(index.similar_to_playlist(fake.playlist_id(0), k=5)) == 5
+
+
+@pytest.mark.parametrize('size, k, group', [(10, 3, 1024), (5000, 10, 64), (5000, 200, 64), (100, 150, 8), (4096, 1, 1024)])
+def test_smallest(size, k, group):
+    values = np.random.default_rng(size).random(size).astype('float32')
+    values[::7] = values[0]
+
+    positions = _smallest(values, k, group=group)
+
+    np.testing.assert_array_equal(positions, np.argsort(values, kind='stable')[:k])
@@ -0,0 +1,75 @@
+"""Tests of the SQLite track store and its time-to-live."""
+import time
+
+import pandas as pd
+import pytest
+
+from TuneInsight import AUDIO_FEATURES, TrackStore
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(time, 'time', clock)
+    return clock
+
+
+def records(ids):
+    df = pd.DataFrame({column: [None] * len(ids) for column in TrackStore.columns}, index=pd.Index(ids, name='id'))
+    df['songs'], df['is_local'], df['explicit'] = [f"Song {i}" for i in ids], False, False
+    df[AUDIO_FEATURES] = 0.5
+    return df
+
+
+@pytest.mark.parametrize('age, fresh', [(0, True), (99, True), (100, True), (101, False), (10_000, False)])
+def test_store_ttl(tmp_path, clock, age, fresh):
+    store = TrackStore(str(tmp_path / "tracks.sqlite"), ttl=100)
+    store.put(records(["a", "b"]))
+
+    clock.now += age
+    stored = store.get(["a", "b", "c"])
+
+    assert sorted(stored) == (["a", "b"] if fresh else [])
+    # Stale entries stay in the store until they are refreshed.
+    assert len(store.audio_features()) == 2
+
+
+def test_store_refresh_restarts_ttl(tmp_path, clock):
+    store = TrackStore(str(tmp_path / "tracks.sqlite"), ttl=100)
+    store.put(records(["a", "b"]))
+    clock.now += 80
+    store.put(records(["b"]))
+
+    clock.now += 50
+
+    assert list(store.get(["a", "b"])) == ["b"]
+
+
+def test_store_without_ttl_keeps_tracks(tmp_path, clock):
+    store = TrackStore(str(tmp_path / "tracks.sqlite"), ttl=None)
+    store.put(records(["a"]))
+
+    clock.now += 10 ** 9
+
+    assert store.get(["a"])["a"]['songs'] == "Song a"
+
+
+@pytest.mark.parametrize('age, audio_feature_calls', [(3599, 0), (3601, 3)])
+def test_stale_tracks_are_fetched_again(fake, insight, clock, age, audio_feature_calls):
+    ti = insight(store_ttl=3600)
+    first = ti.playlist_df(playlist_id=fake.playlist_id(0), dropna=False)
+
+    clock.now += age
+    fake.reset()
+    again = ti.playlist_df(playlist_id=fake.playlist_id(0), dropna=False)
+
+    assert fake.calls.get('audio-features', 0) == audio_feature_calls
+    pd.testing.assert_frame_equal(again, first)
@@ -0,0 +1,33 @@
+"""Tests of the chunked playlist stream and its sinks."""
+import pandas as pd
+import pytest
+
+from TuneInsight import load_frame, write_chunks
+
+
+@pytest.mark.parametrize('name', ["chunks.feather", "chunks.pq"])
+def test_write_chunks_rejects_unknown_extension(tmp_path, name):
+    with pytest.raises(ValueError):
+        write_chunks(iter([pd.DataFrame({'id': ["a"]})]), str(tmp_path / name))
+    assert not (tmp_path / name).exists()
+
+
+def test_write_chunks_infers_format(tmp_path):
+    chunks = [pd.DataFrame({'id': ["a", "b"], 'energy': [0.1, 0.2]}), pd.DataFrame({'id': ["c"], 'energy': [0.3]})]
+    for name in ["chunks.csv", "chunks.parquet", "chunks"]:
+        assert write_chunks(iter(chunks), str(tmp_path / name)) == 3
+        assert list(load_frame(str(tmp_path / name), memory_map=False)['id']) == ["a", "b", "c"]
+
+
+@pytest.mark.parametrize('format', ['csv', 'parquet'])
+def test_streamed_playlist_matches_playlist_df(fake, insight, tmp_path, format):
+    ti = insight(store=False)
+    df = ti.playlist_df(playlist_id=fake.playlist_id(1))
+    path = str(tmp_path / f"playlist.{format}")
+
+    rows = write_chunks(ti.iter_playlist_chunks(playlist_id=fake.playlist_id(1), chunk_size=70), path)
+
+    assert rows == len(df)
+    # The IDs of the fake catalog are all digits, which CSV readers take for numbers.
+    written = pd.read_csv(path, dtype={'id': str}) if format == 'csv' else load_frame(path, memory_map=False)
+    assert list(written['id']) == list(df['id'])
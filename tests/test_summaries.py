@@ -0,0 +1,69 @@
+"""Tests of the dashboard summary tables kept up to date by the exports."""
+import os
+from collections import Counter
+
+import pandas as pd
+import pytest
+
+from TuneInsight import AUDIO_FEATURES, TIME_RANGES, Observer
+
+
+def feature_stats(ti):
+    return ti.summaries.tables()['feature_stats'].set_index(['source', 'feature']).sort_index()
+
+
+@pytest.mark.parametrize('time_range', [None, "all"])
+@pytest.mark.parametrize('scale', [True, 'quantile', [0, 1]])
+def test_summaries_of_scaled_exports_are_unscaled(fake, insight, tmp_path, time_range, scale):
+    raw = insight(summaries=True)
+    raw.get_top_tracks(to_csv=True, time_range=time_range)
+    raw.get_user_playlists(selection="All", to_csv=True)
+
+    (tmp_path / "Spreadsheets" / "summaries").rename(tmp_path / "raw_summaries")
+    scaled = insight(summaries=True)
+    df = scaled.get_top_tracks(to_csv=True, time_range=time_range, scale=scale)
+    scaled.get_user_playlists(selection="All", to_csv=True, scale=scale)
+
+    # The exported tempo is scaled (in its own column with several scalers), the summarized one is in BPM.
+    assert (df.filter(regex='^tempo').iloc[:, -1].abs() < 10).all()
+    assert feature_stats(scaled).loc[('playlists', 'tempo'), 'mean'] > 60
+    pd.testing.assert_frame_equal(feature_stats(scaled), feature_stats(raw))
+    assert feature_stats(raw).loc[('playlists', 'energy'), 'mean'] > 0
+    assert not any(feature.endswith('_standard') for feature in feature_stats(scaled).index.get_level_values(1))
+    assert set(AUDIO_FEATURES) <= set(feature_stats(scaled).index.get_level_values(1))
+
+
+class StageCounter(Observer):
+    def __init__(self):
+        self.starts = Counter()
+
+    def start(self, stage, total=None):
+        self.starts[stage] += 1
+
+
+def test_ranked_top_tracks_write_summaries_once(fake, insight):
+    observer = StageCounter()
+    ti = insight(summaries=True, observer=observer)
+
+    ti.get_top_tracks(time_range="all", to_csv=True)
+
+    assert observer.starts['summaries'] == 1 and observer.starts['write'] == 3
+    stats = feature_stats(ti)
+    assert {f"top_tracks_{time_range}" for time_range in TIME_RANGES} <= set(stats.index.get_level_values(0))
+
+
+def test_emptied_time_range_leaves_no_stale_export(fake, insight):
+    ti = insight(summaries=True)
+    ti.get_top_tracks(time_range="all", to_csv=True)
+
+    # The only top track left has an invalid release date, so dropna empties every range.
+    fake.top_tracks = 1
+    df = ti.get_top_tracks(time_range="all", to_csv=True, format='csv')
+
+    assert df.empty
+    for time_range in TIME_RANGES:
+        path = os.path.join(ti.spreadsheets_dir, f"tester's_top_tracks_{time_range}.csv")
+        written = pd.read_csv(path)
+        assert written.empty and list(written.columns) == list(df.columns)
+    # The earlier contribution of every range is gone from the summaries.
+    assert not any(source.startswith('top_tracks') for source in feature_stats(ti).index.get_level_values(0))
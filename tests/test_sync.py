@@ -0,0 +1,31 @@
+"""Tests of the snapshot-aware playlist sync."""
+import pandas as pd
+
+from TuneInsight import StatsObserver
+
+
+def test_snapshot_sync_skips_unchanged_playlists(fake, insight):
+    ti = insight()
+    first = ti.playlist_df(playlist_id=fake.playlist_id(0), sync=True, dropna=False)
+
+    fake.reset()
+    unchanged = ti.playlist_df(playlist_id=fake.playlist_id(0), sync=True, dropna=False)
+
+    assert fake.calls == {'playlists/{id}': 1}
+    pd.testing.assert_frame_equal(unchanged, first)
+
+
+def test_snapshot_sync_enriches_only_added_tracks(fake, insight):
+    stats = StatsObserver()
+    ti = insight(observer=stats)
+    ti.playlist_df(playlist_id=fake.playlist_id(0), sync=True, dropna=False)
+
+    fake.playlists[0] += 30
+    fake.reset()
+    stats.reset()
+    grown = ti.playlist_df(playlist_id=fake.playlist_id(0), sync=True, dropna=False)
+
+    assert len(grown) == 150
+    assert stats.stages['store']['hits'] == 120 and stats.stages['store']['misses'] == 30
+    assert fake.calls['audio-features'] == 1
+    assert ti.store.get_playlist(fake.playlist_id(0))['snapshot_id'] == fake.snapshot_id(0)
@@ -0,0 +1,120 @@
+"""Tests of the paced, retrying SpotifyTransport."""
+import time
+
+import pytest
+import spotipy
+
+from TuneInsight import AdaptiveConcurrency, RateLimiter, SpotifyTransport, StatsObserver, TuneInsight
+
+
+def test_rate_limiter_is_off_by_default():
+    limiter = RateLimiter()
+
+    started = time.perf_counter()
+    for _ in range(1000):
+        limiter.acquire()
+
+    assert limiter.rate is None and limiter.burst == 1
+    assert time.perf_counter() - started < 0.5
+
+
+@pytest.mark.parametrize('rate', [None, 1000])
+def test_rate_limiter_pause_holds_requests_back(rate):
+    limiter = RateLimiter(rate=rate)
+    limiter.pause(0.2)
+
+    started = time.perf_counter()
+    limiter.acquire()
+
+    assert time.perf_counter() - started >= 0.2
+
+
+def test_rate_limiter_spaces_requests():
+    limiter = RateLimiter(rate=50, burst=1)
+
+    started = time.perf_counter()
+    for _ in range(11):
+        limiter.acquire()
+
+    assert time.perf_counter() - started >= 0.2
+
+
+class FlakyClient:
+    """Client whose ``track`` fails with the given statuses before succeeding."""
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+
+    def track(self, track_id):
+        if self.statuses:
+            raise spotipy.SpotifyException(self.statuses.pop(0), -1, "Failed")
+        return {'id': track_id}
+
+
+@pytest.mark.parametrize('statuses, limit', [([], 4.25), ([500, 503], 4.25), ([429], 2.5)])
+def test_only_successful_calls_raise_the_concurrency_cap(statuses, limit):
+    concurrency = AdaptiveConcurrency(initial=4)
+    sp = SpotifyTransport(FlakyClient(statuses), concurrency=concurrency, backoff=0.01)
+
+    assert sp.track("a") == {'id': "a"}
+    assert concurrency.limit == limit and concurrency.in_flight == 0
+
+
+@pytest.mark.parametrize('status', [404, 500])
+def test_failed_calls_leave_the_concurrency_cap(status):
+    concurrency = AdaptiveConcurrency(initial=4)
+    sp = SpotifyTransport(FlakyClient([status] * 3), concurrency=concurrency, max_retries=2, backoff=0.01)
+
+    with pytest.raises(spotipy.SpotifyException):
+        sp.track("a")
+    assert concurrency.limit == 4 and concurrency.in_flight == 0
+
+
+def test_transport_retries_throttled_calls_after_retry_after(fake, client):
+    stats = StatsObserver()
+    sp = SpotifyTransport(client, observer=stats, backoff=0.01)
+    fake.throttle_next, fake.retry_after = 2, 0.2
+
+    started = time.perf_counter()
+    playlist = sp.playlist(fake.playlist_id(0), fields='name,snapshot_id')
+
+    assert playlist['name'] == "Playlist 0"
+    assert time.perf_counter() - started >= 0.4
+    assert fake.calls['playlists/{id}'] == 3
+    assert stats.requests == dict(stats.requests, calls=1, retries=2, throttled=2, failed=0)
+
+
+def test_transport_gives_up_after_max_retries(fake, client):
+    stats = StatsObserver()
+    sp = SpotifyTransport(client, observer=stats, max_retries=1, backoff=0.01)
+    fake.throttle_next = 5
+
+    with pytest.raises(spotipy.SpotifyException):
+        sp.playlist(fake.playlist_id(0))
+    assert fake.calls['playlists/{id}'] == 2
+    assert stats.requests['failed'] == 1
+
+
+
+def test_default_spotipy_session_is_replaced(fake, tmp_path):
+    # spotipy's own session retries 429s inside urllib3, where the transport never sees them.
+    client = spotipy.Spotify(auth='offline')
+    client.prefix = fake.prefix
+    stats = StatsObserver()
+    fake.throttle_next = 2
+
+    ti = TuneInsight(user='tester', sp=client, project_dir=str(tmp_path), observer=stats)
+    ti.sp.backoff = 0.01
+    ti.sp.playlist(fake.playlist_id(0))
+
+    assert all(adapter.max_retries.total == 0 for adapter in client._session.adapters.values())
+    assert fake.calls['playlists/{id}'] == 3
+    assert stats.requests['throttled'] == 2 and stats.requests['retries'] == 2
+
+
+def test_custom_session_is_kept(client):
+    session = client._session
+
+    SpotifyTransport(client)
+
+    assert client._session is session